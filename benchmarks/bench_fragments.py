@@ -0,0 +1,91 @@
+"""
+Benchmark: เวลา rerun ต่อการแก้ไข input หนึ่งครั้ง ก่อน/หลังแบ่งหน้าเป็น st.fragment
+
+ก่อน: แก้ st.number_input ใด ๆ → rerun ทั้งสคริปต์
+หลัง: แก้ input ใน fragment → rerun เฉพาะ fragment นั้น
+
+วัดโดยรันหน้าเว็บด้วย streamlit.testing (AppTest) แล้วจับเวลา (ไม่รวมเวลาของ AppTest เอง):
+- body ทั้งสคริปต์ ตั้งแต่ st.set_page_config จนจบ fragment สุดท้าย (= ต้นทุนต่อการแก้ไขก่อนแบ่ง fragment)
+- เฉพาะ body ของแต่ละ fragment (= ต้นทุนต่อการแก้ไขหลังแบ่ง fragment)
+
+เวลาเป็น CPU ต่อ rerun - ยิ่งน้อย server ก็รองรับผู้ใช้พร้อมกันได้มากขึ้นตามสัดส่วน
+
+วิธีใช้:
+    python benchmarks/bench_fragments.py [streamlit_app.py] [จำนวนรอบ]
+"""
+import functools
+import os
+import statistics
+import sys
+import time
+from collections import defaultdict
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+fragment_times = defaultdict(list)
+script_span = {}
+_original_fragment = st.fragment
+_original_set_page_config = st.set_page_config
+
+
+def _timed_set_page_config(*args, **kwargs):
+    """จุดเริ่มของ body สคริปต์"""
+    script_span['start'] = time.perf_counter()
+    return _original_set_page_config(*args, **kwargs)
+
+
+def _timed_fragment(func=None, **kwargs):
+    """แทน st.fragment ชั่วคราว เพื่อจับเวลา body ของแต่ละ fragment"""
+    if func is None:
+        return functools.partial(_timed_fragment, **kwargs)
+
+    @functools.wraps(func)
+    def timed(*args, **inner_kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **inner_kwargs)
+        finally:
+            end = time.perf_counter()
+            fragment_times[func.__name__].append(end - start)
+            script_span['end'] = end
+
+    return _original_fragment(timed, **kwargs)
+
+
+def main():
+    page = sys.argv[1] if len(sys.argv) > 1 else 'streamlit_app.py'
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    st.fragment = _timed_fragment
+    st.set_page_config = _timed_set_page_config
+    os.chdir(ROOT)
+
+    at = AppTest.from_file(os.path.join(ROOT, page), default_timeout=30).run()
+    at.button[-1].click().run()
+
+    full_times = []
+    for i in range(rounds):
+        fragment_times.clear()
+        # แก้ราคาน้ำยางสดแล้ววิเคราะห์ใหม่
+        at.number_input(key='price_today_fresh').set_value(45.0 + (i % 10) * 0.5)
+        at.run()
+        full_times.append(script_span['end'] - script_span['start'])
+        at.button[-1].click().run()
+
+    # รอบสุดท้ายเก็บเวลา fragment ของการ rerun ปกติ (ไม่กดปุ่ม)
+    fragment_times.clear()
+    for _ in range(rounds):
+        at.run()
+
+    full = statistics.median(full_times) * 1000
+    print(f"{page}: {rounds} รอบ")
+    print(f"  ก่อน (rerun ทั้งสคริปต์):        {full:8.2f} ms/การแก้ไข")
+    for name, times in sorted(fragment_times.items()):
+        fragment = statistics.median(times) * 1000
+        print(f"  หลัง (rerun เฉพาะ {name:<20}): {fragment:8.2f} ms/การแก้ไข  ({full / max(fragment, 1e-6):.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
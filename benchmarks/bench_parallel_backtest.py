@@ -0,0 +1,73 @@
+"""
+Benchmark: parallel_backtest เทียบกับ simulate() แบบ serial ที่จำนวนวันต่าง ๆ
+
+วัดค่าใช้จ่ายคงที่ของ pool ต่อ process (POOL_SECONDS_PER_WORKER ใน utils/parallel_backtest.py)
+และเวลาแบบบังคับขนาน (min_days=0) เทียบกับ serial - ผลที่วัดบนเครื่อง CPU เดียวบอกได้แค่ค่าใช้จ่าย
+ไม่ได้บอกจุดคุ้มทุน ต้องรันบนเครื่องหลาย core จึงจะเห็นว่าแบบขนานเร็วขึ้นเท่าไร
+
+วิธีใช้:
+    python benchmarks/bench_parallel_backtest.py [จำนวน process (ค่าเริ่มต้น 4)]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.parallel_backtest import parallel_backtest
+from utils.simulation import simulate
+
+SIZES = (1_000, 10_950, 36_500, 100_000, 365_000, 1_000_000)
+
+
+def best_of(function, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def _noop(values):
+    return values[:1]
+
+
+def pool_overhead(workers, days=10_000):
+    """เวลาสร้าง pool + ส่ง chunk ไป-กลับ + ปิด pool (ไม่มีงานจริง) ต่อ process"""
+    chunk = np.zeros((4, days // workers))
+
+    def run():
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for future in [pool.submit(_noop, chunk) for _ in range(workers)]:
+                future.result()
+    return best_of(run, repeat=5) / workers
+
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    engine = LatexDecisionEngine()
+    rng = np.random.default_rng(0)
+    print(f"{workers} process ({os.cpu_count()} CPU)")
+    print(f"ค่าใช้จ่ายของ pool: {pool_overhead(workers) * 1000:.1f} ms ต่อ process")
+    print(f"{'วัน':>10} {'serial ms':>10} {'parallel ms':>12} {'auto ms':>10} {'เร็วขึ้น':>8}")
+    for days in SIZES:
+        R_today = rng.integers(20000, 90000, days).astype(float)
+        price_fresh = rng.uniform(40, 50, days).round(2)
+        price_plus_5 = np.where(rng.random(days) < 0.3, np.nan, rng.uniform(45, 60, days).round(2))
+
+        serial = best_of(lambda: simulate(engine, R_today, price_fresh, price_plus_5=price_plus_5))
+        parallel = best_of(lambda: parallel_backtest(engine, R_today, price_fresh, price_plus_5=price_plus_5,
+                                                     workers=workers, min_days=0))
+        auto = best_of(lambda: parallel_backtest(engine, R_today, price_fresh, price_plus_5=price_plus_5,
+                                                 workers=workers))
+        print(f"{days:>10,} {serial * 1000:>10.1f} {parallel * 1000:>12.1f} {auto * 1000:>10.1f} "
+              f"{serial / parallel:>7.2f}x")
+
+
+if __name__ == '__main__':
+    main()
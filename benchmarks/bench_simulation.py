@@ -0,0 +1,49 @@
+"""
+Benchmark: จำลองต่อเนื่องหลายวันด้วย engine ปกติ เทียบกับ kernel ที่ compile ด้วย numba
+
+ตรวจผลว่าตรงกันทุกค่าก่อน แล้วจับเวลาทั้งสองแบบ (ถ้าไม่ได้ติดตั้ง numba จะวัดเฉพาะ engine ปกติ)
+
+วิธีใช้:
+    python benchmarks/bench_simulation.py [จำนวนวัน]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.simulation import jit_available, simulate, verify_kernel
+
+
+def main():
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    rng = np.random.default_rng(0)
+    R_today = rng.integers(20000, 90000, days).astype(float)
+    price_fresh = rng.uniform(40, 50, days).round(2)
+    price_plus_4 = rng.uniform(45, 60, days).round(2)
+    price_plus_5 = np.where(rng.random(days) < 0.3, np.nan, rng.uniform(45, 60, days).round(2))
+    engine = LatexDecisionEngine()
+
+    print(f"{days:,} วัน - kernel ตรงกับ engine: {verify_kernel(engine, R_today, price_fresh, price_plus_4, price_plus_5)}")
+
+    start = time.perf_counter()
+    simulate(engine, R_today, price_fresh, price_plus_4, price_plus_5, use_jit=False)
+    python_time = time.perf_counter() - start
+    print(f"  engine ปกติ: {python_time * 1000:10.1f} ms")
+
+    if not jit_available():
+        print("  ไม่ได้ติดตั้ง numba - ข้ามการวัด kernel")
+        return
+
+    simulate(engine, R_today[:10], price_fresh[:10], use_jit=True)  # compile ก่อนจับเวลา
+    start = time.perf_counter()
+    simulate(engine, R_today, price_fresh, price_plus_4, price_plus_5, use_jit=True)
+    jit_time = time.perf_counter() - start
+    print(f"  numba:       {jit_time * 1000:10.1f} ms  ({python_time / jit_time:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
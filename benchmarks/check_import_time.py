@@ -0,0 +1,105 @@
+"""
+ตรวจเวลา import ตอนเปิดหน้าเว็บครั้งแรก (cold start) ด้วย python -X importtime
+
+ดึงคำสั่ง import ระดับบนสุดของหน้า (ด้วย ast) แล้วรันใน process ใหม่พร้อม -X importtime
+รวมเวลา cumulative ของ module ระดับบนสุด แล้วแสดง module ที่ใช้เวลามากที่สุด
+และ module หนักที่ถูกโหลดตั้งแต่เปิดหน้า (ควรโหลดผ่าน utils.lazy เมื่อใช้จริง)
+
+ถ้าเวลารวมเกินงบ (ms) จะจบด้วย exit code 1 (ใช้ใน CI ได้)
+tests/test_import_time.py เรียก check_page กับทุกหน้าใน PAGES ให้ pytest ล้มเมื่อเกินงบ
+
+วิธีใช้:
+    python benchmarks/check_import_time.py [streamlit_app.py] [งบเวลา ms]
+"""
+import ast
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# module ที่ไม่ควรโหลดตั้งแต่เปิดหน้า
+HEAVY_MODULES = ('pandas', 'matplotlib', 'openpyxl', 'pyarrow', 'scipy')
+
+# หน้าของแอปและงบเวลา import เริ่มต้น
+PAGES = ('streamlit_app.py', 'latest.py', 'pages/history_chart.py', 'pages/what_if_heatmap.py')
+DEFAULT_BUDGET_MS = 600.0
+
+
+def top_level_imports(path):
+    """source ของคำสั่ง import (และ lazy_import) ระดับบนสุดของไฟล์"""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    statements = []
+    for node in ast.parse(source).body:
+        if isinstance(node, (ast.Import, ast.ImportFrom)):
+            statements.append(ast.get_source_segment(source, node))
+        elif (isinstance(node, ast.Assign) and isinstance(node.value, ast.Call)
+              and getattr(node.value.func, 'id', None) == 'lazy_import'):
+            statements.append(ast.get_source_segment(source, node))
+    return statements
+
+
+def measure(statements):
+    """
+    รัน statements ใน process ใหม่ด้วย -X importtime
+
+    Returns:
+    - list ของ (ชื่อ module, self µs, cumulative µs, ระดับ) ตามลำดับที่ import เสร็จ
+    """
+    proc = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', '\n'.join(statements)],
+        cwd=ROOT, capture_output=True, text=True,
+        env={**os.environ, 'PYTHONPATH': ROOT},
+    )
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+        raise RuntimeError('\n'.join(errors))
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def check_page(page):
+    """
+    วัดเวลา import ระดับบนสุดของหน้า
+
+    Returns:
+    - (เวลารวม ms, list ของ (ชื่อ module, cumulative µs) เรียงจากมากไปน้อย, module หนักที่ถูกโหลด)
+    """
+    rows = measure(top_level_imports(os.path.join(ROOT, page)))
+    # ไม่นับ module ที่ interpreter โหลดเองตอนเริ่ม (site, encodings, ...)
+    startup = {row[0] for row in measure([])}
+    # ระดับบนสุด = module ที่ import จากโค้ดของหน้าโดยตรง (เวลาของ module ย่อยรวมอยู่ใน cumulative แล้ว)
+    top = [row for row in rows if row[3] == 0 and row[0] not in startup]
+    total_ms = sum(row[2] for row in top) / 1000
+    loaded = {row[0] for row in rows}
+    heavy = [name for name in HEAVY_MODULES if name in loaded]
+    return total_ms, [(row[0], row[2]) for row in sorted(top, key=lambda row: -row[2])], heavy
+
+
+def main():
+    page = sys.argv[1] if len(sys.argv) > 1 else 'streamlit_app.py'
+    budget_ms = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_BUDGET_MS
+
+    total_ms, top, heavy = check_page(page)
+    print(f"หน้า: {page}  ({len(top_level_imports(os.path.join(ROOT, page)))} คำสั่ง import)")
+    print("module ที่ใช้เวลามากที่สุด:")
+    for name, cumulative_us in top[:10]:
+        print(f"  {cumulative_us / 1000:8.1f} ms  {name}")
+    print(f"module หนักที่โหลดตั้งแต่เปิดหน้า: {', '.join(heavy) if heavy else '-'}")
+    print(f"รวม {total_ms:.1f} ms (งบ {budget_ms:.0f} ms)")
+
+    if total_ms > budget_ms:
+        print("เกินงบเวลา")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,7 +1,15 @@
 import streamlit as st
-import pandas as pd
+import numpy as np
 from datetime import datetime, timedelta
-from utils.daily_decision import LatexDecisionEngine
+from utils.price_forecast import get_forecaster, append_price
+from utils.decision_regions import compile_regions
+from utils.decision_history import DecisionHistory
+from utils.reason_codes import reason_label
+from utils.lazy import lazy_import
+from utils.profiles import DEFAULT_PROFILE, profile_labels, load_profile, profile_version, engine_from_profile
+
+# pandas ใช้เฉพาะตอนสร้างตาราง - import เมื่อใช้ครั้งแรก (เปิดหน้าเว็บครั้งแรกเร็วขึ้น)
+pd = lazy_import('pandas')
 
 # ตั้งค่าหน้าเว็บ
 st.set_page_config(
@@ -160,8 +168,51 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# สร้าง instance ของ engine
-engine = LatexDecisionEngine()
+@st.cache_resource
+def get_engine(production_capacity, max_stock, production_cost, production_days,
+               profile=DEFAULT_PROFILE, profile_mtime=None):
+    """
+    สร้าง engine ครั้งเดียวต่อชุดพารามิเตอร์ (ใช้ร่วมกันทุก session - ห้ามแก้ค่าใน engine)
+    ค่าคงที่อื่นมาจากโปรไฟล์โรงงาน - profile_mtime อยู่ใน key เพื่อให้สร้างใหม่เมื่อแก้ไฟล์โปรไฟล์
+    """
+    return engine_from_profile(load_profile(profile),
+                               PRODUCTION_CAPACITY=production_capacity,
+                               MAX_STOCK=max_stock,
+                               PRODUCTION_COST=production_cost,
+                               PRODUCTION_DAYS=production_days)
+
+
+# widget ที่ตั้งค่าจากโปรไฟล์: key ใน session_state → (ชื่อค่าคงที่ของ engine, ชนิดของ widget)
+PROFILE_WIDGETS = {
+    'production_capacity': ('PRODUCTION_CAPACITY', int),
+    'max_stock': ('MAX_STOCK', int),
+    'production_cost': ('PRODUCTION_COST', float),
+    'production_days': ('PRODUCTION_DAYS', int),
+}
+
+
+def apply_profile():
+    """ตั้งค่า widget พารามิเตอร์โรงงานตามโปรไฟล์ที่เลือก"""
+    try:
+        constants = load_profile(st.session_state['profile'])['engine']
+    except (OSError, ValueError):
+        return  # โปรไฟล์อ่านไม่ได้ - คงค่าเดิม (ข้อผิดพลาดแสดงใต้ตัวเลือกโปรไฟล์)
+    for key, (name, kind) in PROFILE_WIDGETS.items():
+        st.session_state[key] = kind(constants[name])
+
+
+def page_inputs():
+    """ข้อมูลประจำวันที่กรอกไว้ (เก็บใน session_state เพื่อใช้ร่วมกันระหว่าง fragment)"""
+    state = st.session_state
+    return (state['R_today'], state['current_stock'], state['price_today_fresh'],
+            state['price_today_plus_4'], state['price_today_plus_5'])
+
+
+def inputs_fingerprint():
+    """ค่าทั้งหมดที่ผลการวิเคราะห์ขึ้นอยู่ (พารามิเตอร์โรงงาน + ข้อมูลประจำวัน)"""
+    return (st.session_state['engine_config'],) + page_inputs()
+
+
 
 # หัวข้อหลักพร้อมไอคอน
 st.title("🏭 ระบบตัดสินใจการผลิตยางแผ่นรมควัน")
@@ -183,274 +234,411 @@ st.markdown(f"""
 
 st.markdown("---")
 
-# ตั้งค่าโรงงาน (แก้ไขได้)
-st.markdown("""
-<div style='margin-bottom: 1rem;'>
-    <h2>⚙️ ตั้งค่าพารามิเตอร์โรงงาน</h2>
-</div>
-""", unsafe_allow_html=True)
-col1, col2, col3, col4 = st.columns(4)
-
-with col1:
-    production_capacity = st.number_input(
-        "กำลังการผลิต (กก./วัน)",
-        min_value=10000,
-        max_value=200000,
-        value=60000,
-        step=5000
-    )
-
-with col2:
-    max_stock = st.number_input(
-        "Stock สูงสุด (กก.)",
-        min_value=5000,
-        max_value=50000,
-        value=20000,
-        step=1000
-    )
 
-with col3:
-    production_cost = st.number_input(
-        "ต้นทุนการผลิต (บาท/กก.)",
-        min_value=0.0,
-        max_value=20.0,
-        value=5.0,
-        step=0.5,
-        format="%.2f"
-    )
+@st.fragment
+def parameters_panel():
+    """ตั้งค่าพารามิเตอร์โรงงาน"""
+    # ตั้งค่าโรงงาน (แก้ไขได้)
+    st.markdown("""
+    <div style='margin-bottom: 1rem;'>
+        <h2>⚙️ ตั้งค่าพารามิเตอร์โรงงาน</h2>
+    </div>
+    """, unsafe_allow_html=True)
 
-with col4:
-    production_days = st.number_input(
-        "ระยะเวลาผลิต (วัน)",
-        min_value=1,
-        max_value=10,
-        value=4,
-        step=1
+    # อ่านชื่อโปรไฟล์ครั้งเดียวต่อรอบ (load_profile cache ตาม mtime) - ไฟล์ที่เสียแสดงเป็นตัวเลือกที่มีเครื่องหมาย
+    labels, profile_errors = profile_labels()
+    if st.session_state.get('profile') not in labels:
+        st.session_state['profile'] = DEFAULT_PROFILE
+    if any(key not in st.session_state for key in PROFILE_WIDGETS):
+        apply_profile()
+    profile = st.selectbox(
+        "โปรไฟล์โรงงาน",
+        list(labels),
+        key="profile",
+        format_func=labels.get,
+        on_change=apply_profile,
     )
+    if profile in profile_errors:
+        st.error(f"⚠️ อ่านโปรไฟล์ '{profile}' ไม่ได้: {profile_errors[profile]} - ใช้โปรไฟล์ '{DEFAULT_PROFILE}' แทน")
+        profile = DEFAULT_PROFILE
 
-# อัพเดทค่าใน engine
-engine.PRODUCTION_CAPACITY = production_capacity
-engine.MAX_STOCK = max_stock
-engine.PRODUCTION_COST = production_cost
-engine.PRODUCTION_DAYS = production_days
-
-st.markdown("---")
+    col1, col2, col3, col4 = st.columns(4)
 
-# ส่วนกรอกข้อมูล
-st.markdown("""
-<div style='margin-bottom: 1rem;'>
-    <h2>📊 กรอกข้อมูลประจำวัน</h2>
-</div>
-""", unsafe_allow_html=True)
-
-col_left, col_right = st.columns([1, 1], gap="large")
+    with col1:
+        production_capacity = st.number_input(
+            "กำลังการผลิต (กก./วัน)",
+            key="production_capacity",
+            min_value=10000,
+            max_value=200000,
+            step=5000
+        )
 
-with col_left:
-    st.markdown("### 📦 ข้อมูลน้ำยาง")
-    
-    # น้ำยางที่เข้ามา
-    R_today = st.number_input(
-        "น้ำยางสดที่เข้ามาวันนี้ (กก.)",
-        min_value=0,
-        max_value=200000,
-        value=75000,
-        step=1000
-    )
-    
-    # Stock ปัจจุบัน
-    current_stock = st.number_input(
-        "น้ำยางใน Stock ปัจจุบัน (กก.)",
-        min_value=0,
-        max_value=max_stock,
-        value=0,
-        step=1000
-    )
-    
-    st.info(f"💡 น้ำยางรวมทั้งหมด: **{R_today + current_stock:,} กก.**")
+    with col2:
+        max_stock = st.number_input(
+            "Stock สูงสุด (กก.)",
+            key="max_stock",
+            min_value=5000,
+            max_value=50000,
+            step=1000
+        )
 
-with col_right:
-    st.markdown("### 💰 ราคา")
-    
-    # ราคาน้ำยางสด
-    price_today_fresh = st.number_input(
-        "ราคาน้ำยางสดวันนี้ (บาท/กก.)",
-        min_value=0.0,
-        value=45.0,
-        step=0.5,
-        format="%.2f"
-    )
-    
-    # ราคาแผ่นยางรมควัน (ถ้ามี)
-    know_future_price = st.checkbox("ทราบราคาแผ่นยางรมควันในอนาคต")
-    
-    price_today_plus_4 = None
-    price_today_plus_5 = None
-    
-    if know_future_price:
-        date_today = datetime.now()
-        price_today_plus_4 = st.number_input(
-            f"ราคาแผ่นยางรมควันวันที่ {(date_today + timedelta(days=production_days)).strftime('%d/%m/%Y')} (บาท/กก.)",
+    with col3:
+        production_cost = st.number_input(
+            "ต้นทุนการผลิต (บาท/กก.)",
+            key="production_cost",
             min_value=0.0,
-            value=52.0,
+            max_value=20.0,
             step=0.5,
             format="%.2f"
         )
-        
-        price_today_plus_5 = st.number_input(
-            f"ราคาแผ่นยางรมควันวันที่ {(date_today + timedelta(days=production_days+1)).strftime('%d/%m/%Y')} (บาท/กก.)",
-            min_value=0.0,
-            value=53.0,
-            step=0.5,
-            format="%.2f"
+
+    with col4:
+        production_days = st.number_input(
+            "ระยะเวลาผลิต (วัน)",
+            key="production_days",
+            min_value=1,
+            max_value=10,
+            step=1
         )
 
+    # ถ้าพารามิเตอร์เปลี่ยน ส่วนอื่นทั้งหน้าต้องใช้ค่าใหม่ → rerun ทั้งหน้า (ปกติ rerun เฉพาะ fragment นี้)
+    engine_config = (production_capacity, max_stock, production_cost, production_days, profile, profile_version(profile))
+    previous_config = st.session_state.get('engine_config')
+    st.session_state['engine_config'] = engine_config
+    if previous_config is not None and previous_config != engine_config:
+        st.rerun()
+
+
+parameters_panel()
+
 st.markdown("---")
 
-# คำนวณและแสดงผล
-if st.button("🔍 วิเคราะห์และแนะนำการตัดสินใจ", type="primary", use_container_width=True):
-    
-    # เรียกใช้ logic
-    decision = engine.daily_decision(
-        R_today=R_today,
-        current_stock=current_stock,
-        price_today_fresh=price_today_fresh,
-        price_today_plus_4=price_today_plus_4,
-        price_today_plus_5=price_today_plus_5
-    )
-    
-    # แสดงผลการตัดสินใจ
+
+@st.fragment
+def daily_inputs_panel():
+    """กรอกข้อมูลประจำวัน - แก้ไขแล้ว rerun เฉพาะส่วนนี้"""
+    production_capacity, max_stock, production_cost, production_days = st.session_state['engine_config'][:4]
+    engine = get_engine(*st.session_state['engine_config'])
+
+    # ส่วนกรอกข้อมูล
     st.markdown("""
-    <div style='margin: 2rem 0 1rem 0;'>
-        <h2>✅ ผลการวิเคราะห์</h2>
+    <div style='margin-bottom: 1rem;'>
+        <h2>📊 กรอกข้อมูลประจำวัน</h2>
     </div>
     """, unsafe_allow_html=True)
-    
-    # แสดงการตัดสินใจหลัก
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.metric(
-            "🏭 ผลิตทันที",
-            f"{decision['produce']:,.0f} กก.",
-            delta=f"{(decision['produce']/production_capacity)*100:.1f}% ของกำลังการผลิต"
+
+    col_left, col_right = st.columns([1, 1], gap="large")
+
+    with col_left:
+        st.markdown("### 📦 ข้อมูลน้ำยาง")
+
+        # น้ำยางที่เข้ามา
+        R_today = st.number_input(
+            "น้ำยางสดที่เข้ามาวันนี้ (กก.)",
+            key="R_today",
+            min_value=0,
+            max_value=200000,
+            value=75000,
+            step=1000
         )
-    
-    with col2:
-        st.metric(
-            "📦 เก็บใน Stock (รวม)",
-            f"{decision['stock_old'] + decision['stock_new']:,.0f} กก.",
-            delta=f"{((decision['stock_old'] + decision['stock_new'])/max_stock)*100:.1f}% ของ Stock สูงสุด"
+
+        # Stock ปัจจุบัน
+        current_stock = st.number_input(
+            "น้ำยางใน Stock ปัจจุบัน (กก.)",
+            key="current_stock",
+            min_value=0,
+            max_value=max_stock,
+            value=0,
+            step=1000
         )
-    
-    with col3:
-        st.metric(
-            "🚚 ขายน้ำยางสดทิ้ง",
-            f"{decision['dispose']:,.0f} กก.",
-            delta=f"-{decision['dispose']:,.0f} กก." if decision['dispose'] > 0 else "ไม่มี",
-            delta_color="inverse"
+
+        st.info(f"💡 น้ำยางรวมทั้งหมด: **{R_today + current_stock:,} กก.**")
+
+    with col_right:
+        st.markdown("### 💰 ราคา")
+
+        # ราคาน้ำยางสด
+        price_today_fresh = st.number_input(
+            "ราคาน้ำยางสดวันนี้ (บาท/กก.)",
+            key="price_today_fresh",
+            min_value=0.0,
+            value=45.0,
+            step=0.5,
+            format="%.2f"
         )
-    
-    # แสดงเหตุผล
-    st.info(f"**เหตุผล:** {decision['reason']}")
-    
-    # แสดง Stock Update (ถ้ามี stock)
-    if decision['stock_old'] > 0 or decision['stock_new'] > 0:
-        st.markdown("---")
+
+        # ราคาแผ่นยางรมควัน (ถ้ามี)
+        know_future_price = st.checkbox("ทราบราคาแผ่นยางรมควันในอนาคต", key="know_future_price")
+
+        price_today_plus_4 = None
+        price_today_plus_5 = None
+
+        if know_future_price:
+            date_today = datetime.now()
+            price_today_plus_4 = st.number_input(
+                f"ราคาแผ่นยางรมควันวันที่ {(date_today + timedelta(days=production_days)).strftime('%d/%m/%Y')} (บาท/กก.)",
+                key="price_today_plus_4_input",
+                min_value=0.0,
+                value=52.0,
+                step=0.5,
+                format="%.2f"
+            )
+
+            price_today_plus_5 = st.number_input(
+                f"ราคาแผ่นยางรมควันวันที่ {(date_today + timedelta(days=production_days+1)).strftime('%d/%m/%Y')} (บาท/กก.)",
+                key="price_today_plus_5_input",
+                min_value=0.0,
+                value=53.0,
+                step=0.5,
+                format="%.2f"
+            )
+        else:
+            # ไม่ทราบราคา → ใช้ราคาคาดการณ์จากประวัติราคาที่บันทึกไว้ (ถ้ามี)
+            forecaster = get_forecaster()
+            price_today_plus_4, price_today_plus_5 = forecaster.forecast_sheet_prices(production_days)
+            if price_today_plus_5 is not None:
+                st.caption(f"📈 ราคาคาดการณ์จากประวัติ {forecaster.n_obs:,} วัน: "
+                           f"วันที่ +{production_days} = {price_today_plus_4:.2f} บาท/กก., "
+                           f"วันที่ +{production_days + 1} = {price_today_plus_5:.2f} บาท/กก.")
+
+        # บันทึกราคาแผ่นยางรมควันวันนี้ลงประวัติราคา
+        with st.expander("📝 บันทึกราคาแผ่นยางรมควันวันนี้"):
+            price_sheet_today = st.number_input(
+                "ราคาแผ่นยางรมควันวันนี้ (บาท/กก.)",
+                key="price_sheet_today",
+                min_value=0.0,
+                value=52.0,
+                step=0.5,
+                format="%.2f"
+            )
+            if st.button("บันทึกราคา"):
+                append_price(price_sheet_today)
+                st.success("✅ บันทึกราคาแล้ว")
+
+    # ประเมินการตัดสินใจทันทีจากตารางช่วงการตัดสินใจ (ไม่ต้องกดปุ่ม)
+    regions = compile_regions(engine)
+    preview = regions.lookup(R_today, current_stock, price_today_fresh, price_today_plus_5)
+    st.caption(f"⚡ ประเมินเบื้องต้น: ผลิต {float(preview['produce']):,.0f} กก. | "
+               f"เก็บ Stock {float(preview['stock_old'] + preview['stock_new']):,.0f} กก. | "
+               f"ขายทิ้ง {float(preview['dispose']):,.0f} กก. "
+               f"(จุดแบ่งน้ำยางรวม: {', '.join(f'{b:,.0f}' for b in np.unique(np.round(regions.breakpoints)))} กก.)")
+
+    # ราคาแผ่นยางที่ใช้ (กรอกเอง / คาดการณ์) - ใช้ร่วมกับ fragment ผลลัพธ์
+    st.session_state['price_today_plus_4'] = price_today_plus_4
+    st.session_state['price_today_plus_5'] = price_today_plus_5
+
+    # ผลการวิเคราะห์ที่แสดงอยู่คำนวณจาก input ชุดก่อน → rerun ทั้งหน้าเพื่อล้างผลเก่า
+    # (fragment นี้ rerun เฉพาะตัวเอง fragment ผลลัพธ์จึงไม่รู้ว่า input เปลี่ยน)
+    shown = st.session_state.get('results_inputs')
+    if shown is not None and shown != inputs_fingerprint():
+        st.session_state['results_inputs'] = None
+        st.rerun(scope="app")
+
+
+daily_inputs_panel()
+
+st.markdown("---")
+
+
+@st.fragment
+def results_panel():
+    """ผลการวิเคราะห์ - คำนวณเมื่อกดปุ่ม (rerun เฉพาะส่วนนี้)"""
+    production_capacity, max_stock, production_cost, production_days = st.session_state['engine_config'][:4]
+    engine = get_engine(*st.session_state['engine_config'])
+    R_today, current_stock, price_today_fresh, price_today_plus_4, price_today_plus_5 = page_inputs()
+
+    # คำนวณและแสดงผล
+    analyze = st.button("🔍 วิเคราะห์และแนะนำการตัดสินใจ", type="primary", use_container_width=True)
+    # จำ input ของผลที่แสดงอยู่ - fragment กรอกข้อมูลใช้ตรวจว่าผลนี้ยังตรงกับ input หรือไม่
+    st.session_state['results_inputs'] = inputs_fingerprint() if analyze else None
+    if analyze:
+
+        # เรียกใช้ logic
+        decision = engine.daily_decision(
+            R_today=R_today,
+            current_stock=current_stock,
+            price_today_fresh=price_today_fresh,
+            price_today_plus_4=price_today_plus_4,
+            price_today_plus_5=price_today_plus_5
+        )
+
+        # บันทึกลงประวัติของ session (ring buffer ขนาดคงที่)
+        if 'decision_history' not in st.session_state:
+            st.session_state['decision_history'] = DecisionHistory(capacity=100)
+        profit = None
+        if price_today_plus_4:
+            profit = engine.calculate_costs_and_revenue(decision, price_today_fresh, price_today_plus_4)['profit']
+        st.session_state['decision_history'].append(R_today, current_stock, price_today_fresh,
+                                                    price_today_plus_4, price_today_plus_5, decision, profit)
+
+        # แสดงผลการตัดสินใจ
         st.markdown("""
-        <div style='margin-bottom: 1rem;'>
-            <h2>📊 Stock Update</h2>
+        <div style='margin: 2rem 0 1rem 0;'>
+            <h2>✅ ผลการวิเคราะห์</h2>
         </div>
         """, unsafe_allow_html=True)
-        
-        col_stock1, col_stock2, col_stock3 = st.columns(3)
-        
-        with col_stock1:
+
+        # แสดงการตัดสินใจหลัก
+        col1, col2, col3 = st.columns(3)
+
+        with col1:
             st.metric(
-                "📦 Stock เดิม (คงเหลือ)",
-                f"{decision['stock_old']:,.0f} กก.",
-                help="น้ำยางที่เก็บไว้จากวันก่อนหน้า"
+                "🏭 ผลิตทันที",
+                f"{decision['produce']:,.0f} กก.",
+                delta=f"{(decision['produce']/production_capacity)*100:.1f}% ของกำลังการผลิต"
             )
-        
-        with col_stock2:
+
+        with col2:
             st.metric(
-                "📦 Stock ใหม่ (เพิ่มวันนี้)",
-                f"{decision['stock_new']:,.0f} กก.",
-                delta=f"+{decision['stock_new']:,.0f} กก." if decision['stock_new'] > 0 else "ไม่มี",
-                help="น้ำยางที่เก็บเพิ่มจากวันนี้"
+                "📦 เก็บใน Stock (รวม)",
+                f"{decision['stock_old'] + decision['stock_new']:,.0f} กก.",
+                delta=f"{((decision['stock_old'] + decision['stock_new'])/max_stock)*100:.1f}% ของ Stock สูงสุด"
             )
-        
-        with col_stock3:
-            total_stock = decision['stock_old'] + decision['stock_new']
+
+        with col3:
             st.metric(
-                "📦 Stock รวมทั้งหมด",
-                f"{total_stock:,.0f} กก.",
-                delta=f"{(total_stock/max_stock)*100:.1f}% ของความจุ",
-                help="น้ำยางรวมที่เก็บไว้ทั้งหมด"
+                "🚚 ขายน้ำยางสดทิ้ง",
+                f"{decision['dispose']:,.0f} กก.",
+                delta=f"-{decision['dispose']:,.0f} กก." if decision['dispose'] > 0 else "ไม่มี",
+                delta_color="inverse"
             )
-        
-        # แสดงรายละเอียด Stock
-        st.markdown("**รายละเอียด Stock:**")
-        if decision['stock_old'] > 0:
-            st.write(f"- 🔹 Stock เดิม: {decision['stock_old']:,.0f} กก. (จากวันก่อนหน้า)")
-        if decision['stock_new'] > 0:
-            st.write(f"- 🔹 Stock ใหม่: {decision['stock_new']:,.0f} กก. (เก็บจากน้ำยางวันนี้)")
-        st.write(f"- 🔹 พื้นที่ว่างคงเหลือ: {max_stock - total_stock:,.0f} กก.")
-    
-    # คำนวณต้นทุนและรายได้
-    st.markdown("---")
-    st.markdown("""
-    <div style='margin-bottom: 1rem;'>
-        <h2>💰 การวิเคราะห์ทางการเงิน</h2>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # ตัวแปรเก็บค่ากำไร
-    profit_production = 0
-    profit_fresh_sale = 0
-    has_production = False
-    has_disposal = False
-    
-    # สำหรับการผลิตแผ่นยาง
-    if decision['produce'] > 0 and price_today_plus_4:
-        has_production = True
-        # คำนวณต้นทุนการผลิต
-        cost_latex = decision['produce'] * price_today_fresh  # ต้นทุนน้ำยางสด
-        cost_production = decision['produce'] * engine.PRODUCTION_COST  # ต้นทุนการผลิต
-        cost_storage = 0  # ค่าเก็บรักษา (ถ้าผลิตทันทีจะไม่มี)
-        
-        total_cost_production = cost_latex + cost_production + cost_storage
-        revenue_production = decision['produce'] * price_today_plus_4
-        profit_production = revenue_production - total_cost_production
-        
-        st.write("**📊 การผลิตแผ่นยางรมควัน:**")
-        col1, col2, col3, col4 = st.columns(4)
-        with col1:
-            st.metric("ต้นทุนน้ำยางสด", f"{cost_latex:,.2f} บาท")
-        with col2:
-            st.metric("ต้นทุนการผลิต", f"{cost_production:,.2f} บาท")
-        with col3:
-            st.metric("รายได้จากขาย", f"{revenue_production:,.2f} บาท")
-        with col4:
-            st.metric("กำไรสุทธิ", f"{profit_production:,.2f} บาท",
-                     delta=f"{profit_production:,.2f} บาท")
-    
-    # สำหรับการขายน้ำยางสด
-    if decision['dispose'] > 0:
-        has_disposal = True
-        transport_cost = engine.calculate_fresh_latex_sale_cost(decision['dispose'])
-        fresh_revenue = decision['dispose'] * price_today_fresh
-        profit_fresh_sale = fresh_revenue - transport_cost
-        
-        st.write("**🚚 การขายน้ำยางสดทิ้ง:**")
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("ค่าขนส่ง", f"{transport_cost:,.2f} บาท")
-        with col2:
-            st.metric("รายได้จากขาย", f"{fresh_revenue:,.2f} บาท")
-        with col3:
-            st.metric("กำไรสุทธิ", f"{profit_fresh_sale:,.2f} บาท",
-                     delta=f"{profit_fresh_sale:,.2f} บาท")
-    
+
+        # แสดงเหตุผล
+        st.info(f"**เหตุผล:** {decision['reason']}")
+
+        # แสดง Stock Update (ถ้ามี stock)
+        if decision['stock_old'] > 0 or decision['stock_new'] > 0:
+            st.markdown("---")
+            st.markdown("""
+            <div style='margin-bottom: 1rem;'>
+                <h2>📊 Stock Update</h2>
+            </div>
+            """, unsafe_allow_html=True)
+
+            col_stock1, col_stock2, col_stock3 = st.columns(3)
+
+            with col_stock1:
+                st.metric(
+                    "📦 Stock เดิม (คงเหลือ)",
+                    f"{decision['stock_old']:,.0f} กก.",
+                    help="น้ำยางที่เก็บไว้จากวันก่อนหน้า"
+                )
+
+            with col_stock2:
+                st.metric(
+                    "📦 Stock ใหม่ (เพิ่มวันนี้)",
+                    f"{decision['stock_new']:,.0f} กก.",
+                    delta=f"+{decision['stock_new']:,.0f} กก." if decision['stock_new'] > 0 else "ไม่มี",
+                    help="น้ำยางที่เก็บเพิ่มจากวันนี้"
+                )
+
+            with col_stock3:
+                total_stock = decision['stock_old'] + decision['stock_new']
+                st.metric(
+                    "📦 Stock รวมทั้งหมด",
+                    f"{total_stock:,.0f} กก.",
+                    delta=f"{(total_stock/max_stock)*100:.1f}% ของความจุ",
+                    help="น้ำยางรวมที่เก็บไว้ทั้งหมด"
+                )
+
+            # แสดงรายละเอียด Stock
+            st.markdown("**รายละเอียด Stock:**")
+            if decision['stock_old'] > 0:
+                st.write(f"- 🔹 Stock เดิม: {decision['stock_old']:,.0f} กก. (จากวันก่อนหน้า)")
+            if decision['stock_new'] > 0:
+                st.write(f"- 🔹 Stock ใหม่: {decision['stock_new']:,.0f} กก. (เก็บจากน้ำยางวันนี้)")
+            st.write(f"- 🔹 พื้นที่ว่างคงเหลือ: {max_stock - total_stock:,.0f} กก.")
+
+        # คำนวณต้นทุนและรายได้
+        st.markdown("---")
+        st.markdown("""
+        <div style='margin-bottom: 1rem;'>
+            <h2>💰 การวิเคราะห์ทางการเงิน</h2>
+        </div>
+        """, unsafe_allow_html=True)
+
+        # ตัวแปรเก็บค่ากำไร
+        profit_production = 0
+        profit_fresh_sale = 0
+        has_production = False
+        has_disposal = False
+
+        # สำหรับการผลิตแผ่นยาง
+        if decision['produce'] > 0 and price_today_plus_4:
+            has_production = True
+            # คำนวณต้นทุนการผลิต
+            cost_latex = decision['produce'] * price_today_fresh  # ต้นทุนน้ำยางสด
+            cost_production = decision['produce'] * engine.PRODUCTION_COST  # ต้นทุนการผลิต
+            cost_storage = 0  # ค่าเก็บรักษา (ถ้าผลิตทันทีจะไม่มี)
+
+            total_cost_production = cost_latex + cost_production + cost_storage
+            revenue_production = decision['produce'] * price_today_plus_4
+            profit_production = revenue_production - total_cost_production
+
+            st.write("**📊 การผลิตแผ่นยางรมควัน:**")
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("ต้นทุนน้ำยางสด", f"{cost_latex:,.2f} บาท")
+            with col2:
+                st.metric("ต้นทุนการผลิต", f"{cost_production:,.2f} บาท")
+            with col3:
+                st.metric("รายได้จากขาย", f"{revenue_production:,.2f} บาท")
+            with col4:
+                st.metric("กำไรสุทธิ", f"{profit_production:,.2f} บาท",
+                         delta=f"{profit_production:,.2f} บาท")
+
+        # สำหรับการขายน้ำยางสด
+        if decision['dispose'] > 0:
+            has_disposal = True
+            transport_cost = engine.calculate_fresh_latex_sale_cost(decision['dispose'])
+            fresh_revenue = decision['dispose'] * price_today_fresh
+            profit_fresh_sale = fresh_revenue - transport_cost
+
+            st.write("**🚚 การขายน้ำยางสดทิ้ง:**")
+            col1, col2, col3 = st.columns(3)
+            with col1:
+                st.metric("ค่าขนส่ง", f"{transport_cost:,.2f} บาท")
+            with col2:
+                st.metric("รายได้จากขาย", f"{fresh_revenue:,.2f} บาท")
+            with col3:
+                st.metric("กำไรสุทธิ", f"{profit_fresh_sale:,.2f} บาท",
+                         delta=f"{profit_fresh_sale:,.2f} บาท")
+
+        comparison_panel(decision, profit_production, profit_fresh_sale, has_disposal)
+
+        # ถ้ามีการเก็b stock
+        if decision['stock_old'] > 0 or decision['stock_new'] > 0:
+            st.write("**ค่าเก็บรักษา Stock:**")
+
+            # ค่าเก็บรักษา stock เดิม (นับต่อจากวันที่เคยเก็บ)
+            if decision['stock_old'] > 0:
+                st.write(f"- Stock เดิม {decision['stock_old']:,.0f} กก.: ต้องเพิ่มค่าเก็บรักษาต่อไปอีก {engine.STORAGE_COST_DAY2_10} บาท/กก./วัน")
+
+            # ค่าเก็บรักษา stock ใหม่
+            if decision['stock_new'] > 0:
+                storage_cost_day1 = decision['stock_new'] * engine.STORAGE_COST_DAY1
+                st.write(f"- Stock ใหม่ {decision['stock_new']:,.0f} กก.: ค่าเก็บรักษาวันแรก {storage_cost_day1:,.2f} บาท")
+                st.write(f"  - ค่าเก็บรักษาวันที่ 2-10: {engine.STORAGE_COST_DAY2_10} บาท/กก./วัน")
+
+            # คำนวณจุดคุ้มทุน
+            if price_today_plus_5:
+                breakeven = engine.calculate_breakeven_price(price_today_fresh, storage_days=1)
+                st.write(f"- 📊 ราคาคุ้มทุน (เก็บ 1 วัน): **{breakeven:.2f} บาท/กก.**")
+
+                if price_today_plus_5 >= breakeven:
+                    st.success(f"✅ ราคาวันที่ +5 ({price_today_plus_5:.2f} บาท) สูงกว่าจุดคุ้มทุน → คุ้มค่าที่จะเก็บ")
+                else:
+                    st.warning(f"⚠️ ราคาวันที่ +5 ({price_today_plus_5:.2f} บาท) ต่ำกว่าจุดคุ้มทุน → ไม่คุ้มค่าที่จะเก็บ")
+
+    history_panel()
+
+
+def comparison_panel(decision, profit_production, profit_fresh_sale, has_disposal):
+    """เปรียบเทียบทางเลือก (ส่วนหนึ่งของผลการวิเคราะห์ - ไม่มี widget ของตัวเอง จึงวาดใน fragment ของผลลัพธ์)"""
+    production_capacity, max_stock, production_cost, production_days = st.session_state['engine_config'][:4]
+    engine = get_engine(*st.session_state['engine_config'])
+    R_today, current_stock, price_today_fresh, price_today_plus_4, price_today_plus_5 = page_inputs()
+
     # เปรียบเทียบกำไร (แสดงเสมอถ้ามีการผลิต)
     if decision['produce'] > 0 and price_today_plus_4:
         st.markdown("---")
@@ -459,30 +647,30 @@ if st.button("🔍 วิเคราะห์และแนะนำการ
             <h2>📊 การเปรียบเทียบกำไร</h2>
         </div>
         """, unsafe_allow_html=True)
-        
+
         # คำนวณกำไรต่อกิโลกรัมจากการผลิต
         profit_per_kg_production = profit_production / decision['produce']
-        
+
         # คำนวณกำไรต่อกิโลกรัมจากการขายน้ำยางสดสมมติ
         transport_cost_per_kg = engine.TRANSPORT_COST_PER_20K / 20000
         profit_per_kg_fresh_hypothetical = price_today_fresh - transport_cost_per_kg
-        
+
         col1, col2, col3 = st.columns(3)
-        
+
         with col1:
             st.metric(
                 "🏭 กำไร/กก. (ผลิตแผ่นยาง)",
                 f"{profit_per_kg_production:.2f} บาท/กก.",
                 help=f"จากการผลิต {decision['produce']:,.0f} กก."
             )
-        
+
         with col2:
             st.metric(
                 "🚚 กำไร/กก. (ขายน้ำยางสด)",
                 f"{profit_per_kg_fresh_hypothetical:.2f} บาท/กก.",
                 help="กำไรหากขายน้ำยางสดแทน"
             )
-        
+
         with col3:
             diff = profit_per_kg_production - profit_per_kg_fresh_hypothetical
             st.metric(
@@ -491,7 +679,7 @@ if st.button("🔍 วิเคราะห์และแนะนำการ
                 delta=f"{diff:+.2f} บาท/กก." if diff >= 0 else f"{diff:.2f} บาท/กก.",
                 delta_color="normal" if diff >= 0 else "inverse"
             )
-        
+
         # แสดงข้อสรุป
         if profit_per_kg_production > profit_per_kg_fresh_hypothetical:
             saved_by_production = (profit_per_kg_production - profit_per_kg_fresh_hypothetical) * decision['produce']
@@ -503,10 +691,10 @@ if st.button("🔍 วิเคราะห์และแนะนำการ
                       f"(เสียโอกาสกำไร **{loss_by_production:,.2f} บาท** จากการผลิต {decision['produce']:,.0f} กก.)")
         else:
             st.info("ℹ️ กำไรต่อกิโลกรัมเท่ากันทั้ง 2 วิธี")
-        
+
         # แสดงตารางเปรียบเทียบรายละเอียด
         st.write("**รายละเอียดการเปรียบเทียบ:**")
-        
+
         comparison_data = {
             "หัวข้อ": [
                 "ปริมาณ (กก.)",
@@ -530,16 +718,16 @@ if st.button("🔍 วิเคราะห์และแนะนำการ
                 f"{profit_per_kg_fresh_hypothetical * decision['produce']:,.2f}"
             ]
         }
-        
+
         df_comparison = pd.DataFrame(comparison_data)
         st.table(df_comparison)
-        
+
         # ถ้ามีการขายน้ำยางสดจริง ให้แสดงกำไรรวม
         if has_disposal:
             st.write("**สรุปกำไรรวมทั้งหมด:**")
             total_profit = profit_production + profit_fresh_sale
             col1, col2, col3 = st.columns(3)
-            
+
             with col1:
                 st.metric("กำไรจากผลิต", f"{profit_production:,.2f} บาท")
             with col2:
@@ -547,28 +735,40 @@ if st.button("🔍 วิเคราะห์และแนะนำการ
             with col3:
                 st.metric("กำไรรวม", f"{total_profit:,.2f} บาท",
                          delta=f"{total_profit:,.2f} บาท")
-    
-    # ถ้ามีการเก็b stock
-    if decision['stock_old'] > 0 or decision['stock_new'] > 0:
-        st.write("**ค่าเก็บรักษา Stock:**")
-        
-        # ค่าเก็บรักษา stock เดิม (นับต่อจากวันที่เคยเก็บ)
-        if decision['stock_old'] > 0:
-            st.write(f"- Stock เดิม {decision['stock_old']:,.0f} กก.: ต้องเพิ่มค่าเก็บรักษาต่อไปอีก {engine.STORAGE_COST_DAY2_10} บาท/กก./วัน")
-        
-        # ค่าเก็บรักษา stock ใหม่
-        if decision['stock_new'] > 0:
-            storage_cost_day1 = decision['stock_new'] * engine.STORAGE_COST_DAY1
-            st.write(f"- Stock ใหม่ {decision['stock_new']:,.0f} กก.: ค่าเก็บรักษาวันแรก {storage_cost_day1:,.2f} บาท")
-            st.write(f"  - ค่าเก็บรักษาวันที่ 2-10: {engine.STORAGE_COST_DAY2_10} บาท/กก./วัน")
-        
-        # คำนวณจุดคุ้มทุน
-        if price_today_plus_5:
-            breakeven = engine.calculate_breakeven_price(price_today_fresh, storage_days=1)
-            st.write(f"- 📊 ราคาคุ้มทุน (เก็บ 1 วัน): **{breakeven:.2f} บาท/กก.**")
-            
-            if price_today_plus_5 >= breakeven:
-                st.success(f"✅ ราคาวันที่ +5 ({price_today_plus_5:.2f} บาท) สูงกว่าจุดคุ้มทุน → คุ้มค่าที่จะเก็บ")
-            else:
-                st.warning(f"⚠️ ราคาวันที่ +5 ({price_today_plus_5:.2f} บาท) ต่ำกว่าจุดคุ้มทุน → ไม่คุ้มค่าที่จะเก็บ")
 
+
+@st.fragment
+def history_panel():
+    """ประวัติการวิเคราะห์ของ session นี้ - แสดงจาก ring buffer โดยไม่คำนวณรายการเก่าใหม่"""
+    history = st.session_state.get('decision_history')
+    if history is None or len(history) == 0:
+        return
+
+    st.markdown("---")
+    st.markdown("""
+    <div style='margin-bottom: 1rem;'>
+        <h2>🕘 ประวัติการวิเคราะห์ (session นี้)</h2>
+    </div>
+    """, unsafe_allow_html=True)
+
+    records = history.records()
+    df_history = pd.DataFrame({
+        "เวลา": [datetime.fromtimestamp(t).strftime('%H:%M:%S') for t in records['timestamp']],
+        "น้ำยางเข้า (กก.)": records['R_today'],
+        "Stock เดิม (กก.)": records['current_stock'],
+        "ราคาน้ำยางสด": records['price_today_fresh'],
+        "ราคาวันที่ +4": records['price_today_plus_4'],
+        "ราคาวันที่ +5": records['price_today_plus_5'],
+        "ผลิต (กก.)": records['produce'],
+        "Stock คงเหลือ (กก.)": records['stock_old'] + records['stock_new'],
+        "ขายทิ้ง (กก.)": records['dispose'],
+        "กำไร (บาท)": records['profit'],
+        "เหตุผล": [reason_label(code) for code in records['reason_code']],
+    })
+    st.dataframe(df_history, use_container_width=True, hide_index=True,
+                 column_config={"กำไร (บาท)": st.column_config.NumberColumn(format="%,.2f")})
+
+    st.button("🗑️ ล้างประวัติ", on_click=history.clear)
+
+
+results_panel()
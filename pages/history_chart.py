@@ -0,0 +1,141 @@
+import streamlit as st
+import numpy as np
+from utils.profiles import engine_from_profile, load_profile, profile_version
+from utils.simulation import simulate
+from utils.scenario_runner import generate_paths
+from utils.chart_data import ChartPyramid
+from utils.decision_frame import DecisionFrame
+from utils.lazy import lazy_import
+from utils.result_cache import ResultCache, cache_key, data_fingerprint
+from utils.validation import split_valid, validate_inputs
+
+# pandas ใช้เฉพาะตอนอ่าน CSV และส่งข้อมูลให้กราฟ - import เมื่อใช้ครั้งแรก
+pd = lazy_import('pandas')
+
+# ตั้งค่าหน้าเว็บ
+st.set_page_config(
+    page_title="ประวัติย้อนหลัง",
+    page_icon="📉",
+    layout="wide"
+)
+
+# คอลัมน์ที่ไฟล์ต้องมี (ราคาวันที่ +4/+5 ไม่มีได้ = ไม่ทราบราคา)
+REQUIRED_COLUMNS = ('date', 'R_today', 'price_today_fresh')
+
+SERIES = {
+    "Stock รวม (กก.)": 'stock_total',
+    "ขายทิ้ง (กก.)": 'dispose',
+    "ผลิต (กก.)": 'produce',
+    "กำไร (บาท)": 'profit',
+    "กำไรสะสม (บาท)": 'cumulative_profit',
+}
+
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+
+@st.cache_data(show_spinner="กำลังจำลองการตัดสินใจ...")
+def load_history(file_bytes, demo_years, profile_mtime):
+    """
+    ข้อมูลรายวัน (จากไฟล์ที่อัปโหลด หรือข้อมูลตัวอย่าง) แล้วจำลองการตัดสินใจทั้งช่วงด้วยโปรไฟล์ default
+    (profile_mtime อยู่ใน key เพื่อจำลองใหม่เมื่อแก้ไฟล์โปรไฟล์ - ผลการจำลองเก็บใน cache บนดิสก์ด้วย
+    เปิดหน้าใหม่หรือ restart ด้วยข้อมูลและโปรไฟล์เดิมไม่ต้องจำลองซ้ำ)
+
+    ไฟล์ที่อัปโหลดถูกตรวจด้วย validate_inputs - แถวที่ไม่ถูกต้องหรือวันที่อ่านไม่ได้ถูกข้าม
+    แล้วเรียงตามวันที่ก่อนจำลอง (stock ต่อเนื่องตามลำดับวัน)
+
+    Returns:
+    - (วันที่, DecisionFrame, รายงานแถวที่ถูกข้าม)
+    """
+    engine = engine_from_profile(load_profile())
+    report = []
+    if file_bytes is not None:
+        import io
+        frame = pd.read_csv(io.BytesIO(file_bytes))
+        missing = [name for name in REQUIRED_COLUMNS if name not in frame.columns]
+        if missing:
+            raise ValueError(f"ไฟล์ไม่มีคอลัมน์ {', '.join(missing)}")
+        result = validate_inputs(engine, frame['R_today'].to_numpy(object),
+                                 frame['price_today_fresh'].to_numpy(object),
+                                 frame.get('price_today_plus_4'), frame.get('price_today_plus_5'))
+        rows = np.arange(len(frame)) + 2  # เลขบรรทัดในไฟล์ (บรรทัด 1 = หัวตาราง)
+        columns, report = split_valid(result, rows.tolist())
+
+        dates = pd.to_datetime(frame['date'], errors='coerce').to_numpy()
+        bad_date = np.isnat(dates[columns['index']])
+        report += [{'row': int(rows[i]), 'reasons': "วันที่ไม่ถูกต้อง"} for i in columns['index'][bad_date]]
+        keep = columns['index'][~bad_date]
+        keep = keep[np.argsort(dates[keep], kind='stable')]
+        dates = dates[keep]
+        inputs = tuple(result[name][keep] for name in ('R_today', 'price_today_fresh', 'price_plus_4', 'price_plus_5'))
+    else:
+        days = demo_years * 365
+        paths = generate_paths(1, days, seed=0)
+        dates = np.datetime64('2000-01-01') + np.arange(days).astype('timedelta64[D]')
+        inputs = tuple(paths[name][0] for name in ('R_today', 'price_fresh', 'price_plus_4', 'price_plus_5'))
+
+    key = cache_key({'page': 'history_chart', 'config': engine.get_config()}, data_fingerprint(*inputs))
+    frame = DecisionFrame.from_dict(get_result_cache().get_or_compute(key, lambda: simulate(engine, *inputs)))
+    frame = frame.with_columns(stock_total=frame['stock_old'] + frame['stock_new'],
+                               cumulative_profit=np.nancumsum(frame['profit']))
+    return dates, frame, sorted(report, key=lambda entry: entry['row'])
+
+
+@st.cache_resource(max_entries=8)
+def get_pyramids(file_bytes, demo_years, profile_mtime):
+    """pyramid หลายความละเอียดของทุก series (สร้างครั้งเดียวต่อชุดข้อมูล)"""
+    dates, frame, _ = load_history(file_bytes, demo_years, profile_mtime)
+    return dates, {name: ChartPyramid(dates, frame[name]) for name in SERIES.values()}
+
+
+st.title("📉 ประวัติย้อนหลังระยะยาว")
+
+col1, col2 = st.columns([2, 1])
+with col1:
+    uploaded = st.file_uploader("ไฟล์ข้อมูลรายวัน (CSV: date, R_today, price_today_fresh, price_today_plus_4, price_today_plus_5)",
+                                type="csv")
+with col2:
+    demo_years = st.number_input("ข้อมูลตัวอย่าง (ปี)", min_value=1, max_value=100, value=30, step=1,
+                                 disabled=uploaded is not None)
+
+file_bytes = uploaded.getvalue() if uploaded is not None else None
+try:
+    history_dates, _, skipped = load_history(file_bytes, demo_years, profile_version())
+except ValueError as error:
+    st.error(f"❌ อ่านไฟล์ไม่ได้: {error}")
+    st.stop()
+if skipped:
+    st.warning(f"⚠️ ข้าม {len(skipped):,} แถวที่ไม่ถูกต้อง")
+    with st.expander("แถวที่ถูกข้าม"):
+        st.dataframe(pd.DataFrame(skipped)[['row', 'reasons']], hide_index=True)
+if len(history_dates) == 0:
+    st.error("❌ ไม่มีแถวที่ถูกต้องในไฟล์")
+    st.stop()
+dates, pyramids = get_pyramids(file_bytes, demo_years, profile_version())
+
+st.markdown("---")
+
+
+@st.fragment
+def chart_panel():
+    """กราฟ - ซูม/เปลี่ยน series แล้ว rerun เฉพาะส่วนนี้"""
+    first, last = pd.Timestamp(dates[0]).date(), pd.Timestamp(dates[-1]).date()
+    col_series, col_width = st.columns([3, 1])
+    with col_series:
+        selected = st.multiselect("ข้อมูลที่แสดง", list(SERIES), default=["Stock รวม (กก.)", "ขายทิ้ง (กก.)"])
+    with col_width:
+        width = st.select_slider("ความละเอียด (จุด)", options=[200, 400, 800, 1600], value=800)
+    date_range = st.slider("ช่วงวันที่", min_value=first, max_value=last, value=(first, last), format="DD/MM/YYYY")
+
+    x_min, x_max = np.datetime64(date_range[0]), np.datetime64(date_range[1])
+    for label in selected:
+        x, y = pyramids[SERIES[label]].query(width, x_min, x_max)
+        st.markdown(f"**{label}**")
+        st.line_chart(pd.DataFrame({label: y}, index=pd.to_datetime(x)), height=220)
+    st.caption(f"ข้อมูลทั้งหมด {len(dates):,} วัน - ส่งไปวาดไม่เกิน {2 * width:,} จุดต่อกราฟ "
+               f"(ค่าต่ำสุด/สูงสุดของแต่ละช่วงยังอยู่ครบ)")
+
+
+chart_panel()
@@ -0,0 +1,147 @@
+import streamlit as st
+import numpy as np
+from utils.daily_decision import LatexDecisionEngine
+from utils.batch_decision import batch_daily_decision, batch_costs_and_revenue
+from utils.result_cache import ResultCache, cache_key, code_version
+from utils.lazy import lazy_import
+from utils.profiles import load_profile
+
+# matplotlib โหลดเมื่อวาดภาพจริงเท่านั้น (ภาพที่ cache ไว้แล้วไม่ต้องโหลด)
+heatmap = lazy_import('utils.heatmap')
+
+# ตั้งค่าหน้าเว็บ
+st.set_page_config(
+    page_title="What-if Heatmap",
+    page_icon="🗺️",
+    layout="wide"
+)
+
+MODE_INTAKE_PRICE = "น้ำยางเข้า × ราคาแผ่นยางวันที่ +5"
+MODE_STOCK_FRESH = "Stock ปัจจุบัน × ราคาน้ำยางสด"
+
+
+def build_engine(config):
+    """สร้าง engine จากค่าพารามิเตอร์ (tuple ของ (ชื่อ, ค่า))"""
+    engine = LatexDecisionEngine()
+    for name, value in config:
+        setattr(engine, name, value)
+    return engine
+
+
+@st.cache_resource
+def get_result_cache():
+    return ResultCache()
+
+
+def _compute_grid(config, mode, x_range, y_range, resolution, fixed):
+    engine = build_engine(config)
+    fixed = dict(fixed)
+    x = np.linspace(x_range[0], x_range[1], resolution)
+    y = np.linspace(y_range[0], y_range[1], resolution)
+    grid_x, grid_y = np.meshgrid(x, y)
+
+    if mode == MODE_INTAKE_PRICE:
+        decision = batch_daily_decision(engine, grid_x, fixed['current_stock'],
+                                        fixed['price_today_fresh'], grid_y)
+        price_fresh = np.full_like(grid_x, fixed['price_today_fresh'])
+    else:
+        decision = batch_daily_decision(engine, fixed['R_today'], grid_x,
+                                        grid_y, fixed['price_today_plus_5'])
+        price_fresh = grid_y
+    return {'x': x, 'y': y, 'price_fresh': price_fresh, **decision}
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def evaluate_grid(config, mode, x_range, y_range, resolution, fixed):
+    """คำนวณการตัดสินใจทั้ง grid ด้วย batch engine ครั้งเดียว (ผลเก็บใน cache บนดิสก์ด้วย - เปิดหน้าใหม่ไม่ต้องคำนวณซ้ำ)"""
+    key = cache_key({'page': 'what_if_heatmap', 'config': config, 'mode': mode, 'x_range': x_range,
+                     'y_range': y_range, 'resolution': resolution, 'fixed': fixed},
+                    version=code_version(_compute_grid, build_engine))
+    result = get_result_cache().get_or_compute(
+        key, lambda: _compute_grid(config, mode, x_range, y_range, resolution, fixed))
+    decision = {name: value for name, value in result.items() if name not in ('x', 'y', 'price_fresh')}
+    return result['x'], result['y'], decision, result['price_fresh']
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def branch_png(config, mode, x_range, y_range, resolution, fixed, xlabel, ylabel):
+    x, y, decision, _ = evaluate_grid(config, mode, x_range, y_range, resolution, fixed)
+    return heatmap.render_branch_heatmap(x, y, decision['branch'], xlabel, ylabel)
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def profit_png(config, mode, x_range, y_range, resolution, fixed, price_sale_sheet, xlabel, ylabel):
+    x, y, decision, price_fresh = evaluate_grid(config, mode, x_range, y_range, resolution, fixed)
+    finance = batch_costs_and_revenue(build_engine(config), decision, price_fresh, price_sale_sheet)
+    return heatmap.render_profit_heatmap(x, y, finance['profit'], decision['branch'], xlabel, ylabel)
+
+
+st.title("🗺️ What-if: การตัดสินใจและกำไร")
+
+# ตั้งค่าโรงงาน (ค่าเริ่มต้นจากโปรไฟล์ default)
+st.subheader("⚙️ ตั้งค่าพารามิเตอร์โรงงาน")
+profile = load_profile()
+col1, col2, col3 = st.columns(3)
+with col1:
+    production_capacity = st.number_input("กำลังการผลิต (กก./วัน)", min_value=10000, max_value=200000,
+                                          value=int(profile['engine']['PRODUCTION_CAPACITY']), step=5000)
+with col2:
+    max_stock = st.number_input("Stock สูงสุด (กก.)", min_value=5000, max_value=50000,
+                                value=int(profile['engine']['MAX_STOCK']), step=1000)
+with col3:
+    production_cost = st.number_input("ต้นทุนการผลิต (บาท/กก.)", min_value=0.0, max_value=20.0,
+                                      value=float(profile['engine']['PRODUCTION_COST']), step=0.5, format="%.2f")
+
+# ค่าคงที่อื่นมาจากโปรไฟล์โรงงาน (อยู่ใน config จึงเป็นส่วนหนึ่งของ cache key ด้วย)
+config = tuple({
+    **profile['engine'],
+    'PRODUCTION_CAPACITY': production_capacity,
+    'MAX_STOCK': max_stock,
+    'PRODUCTION_COST': production_cost,
+}.items())
+
+st.markdown("---")
+
+mode = st.radio("แกนของ heatmap", [MODE_INTAKE_PRICE, MODE_STOCK_FRESH], horizontal=True)
+resolution = st.slider("ความละเอียด grid (จุดต่อแกน)", min_value=20, max_value=200, value=80, step=10)
+
+col_left, col_right = st.columns(2, gap="large")
+
+if mode == MODE_INTAKE_PRICE:
+    with col_left:
+        x_range = st.slider("ช่วงน้ำยางสดที่เข้ามา (กก.)", 0, 200000, (20000, 120000), step=1000)
+        y_range = st.slider("ช่วงราคาแผ่นยางวันที่ +5 (บาท/กก.)", 0.0, 100.0, (40.0, 60.0), step=0.5)
+    with col_right:
+        current_stock = st.number_input("น้ำยางใน Stock ปัจจุบัน (กก.)", min_value=0, max_value=max_stock,
+                                        value=0, step=1000)
+        price_today_fresh = st.number_input("ราคาน้ำยางสดวันนี้ (บาท/กก.)", min_value=0.0, value=45.0,
+                                            step=0.5, format="%.2f")
+    fixed = (('current_stock', current_stock), ('price_today_fresh', price_today_fresh))
+    xlabel, ylabel = "R_today (kg)", "Sheet price day +5 (THB/kg)"
+else:
+    with col_left:
+        x_range = st.slider("ช่วง Stock ปัจจุบัน (กก.)", 0, int(max_stock), (0, int(max_stock)), step=500)
+        y_range = st.slider("ช่วงราคาน้ำยางสด (บาท/กก.)", 0.0, 100.0, (35.0, 55.0), step=0.5)
+    with col_right:
+        R_today = st.number_input("น้ำยางสดที่เข้ามาวันนี้ (กก.)", min_value=0, max_value=200000,
+                                  value=75000, step=1000)
+        price_today_plus_5 = st.number_input("ราคาแผ่นยางวันที่ +5 (บาท/กก.)", min_value=0.0, value=53.0,
+                                             step=0.5, format="%.2f")
+    fixed = (('R_today', R_today), ('price_today_plus_5', price_today_plus_5))
+    xlabel, ylabel = "current_stock (kg)", "Fresh latex price (THB/kg)"
+
+price_sale_sheet = st.number_input("ราคาขายแผ่นยาง (วันที่ +4) สำหรับคำนวณกำไร (บาท/กก.)", min_value=0.0,
+                                   value=52.0, step=0.5, format="%.2f")
+
+st.markdown("---")
+
+# รูปแต่ละรูป cache แยกกัน - เปลี่ยนราคาขายแผ่นยางจะวาดใหม่เฉพาะรูปกำไร
+col_branch, col_profit = st.columns(2)
+with col_branch:
+    st.subheader("การตัดสินใจ")
+    st.image(branch_png(config, mode, x_range, y_range, resolution, fixed, xlabel, ylabel))
+with col_profit:
+    st.subheader("กำไร (บาท)")
+    st.image(profit_png(config, mode, x_range, y_range, resolution, fixed, price_sale_sheet, xlabel, ylabel))
+
+st.caption("เส้นสีดำ = ขอบเขตระหว่างกรณีการตัดสินใจ (ผลิตหมด / เก็บส่วนเกิน / ขายส่วนเกิน / เกิน 80,000 กก.)")
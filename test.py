@@ -1,7 +1,10 @@
 import streamlit as st
-import pandas as pd
 from datetime import datetime, timedelta
-from utils.daily_decision import LatexDecisionEngine
+from utils.profiles import load_profile, engine_from_profile
+from utils.lazy import lazy_import
+
+# pandas ใช้เฉพาะตอนสร้างตาราง - import เมื่อใช้ครั้งแรก (เปิดหน้าเว็บครั้งแรกเร็วขึ้น)
+pd = lazy_import('pandas')
 
 # ตั้งค่าหน้าเว็บ
 st.set_page_config(
@@ -10,8 +13,9 @@ st.set_page_config(
     layout="wide"
 )
 
-# สร้าง instance ของ engine
-engine = LatexDecisionEngine()
+# สร้าง instance ของ engine (ค่าคงที่จากโปรไฟล์ default)
+profile = load_profile()
+engine = engine_from_profile(profile)
 
 # หัวข้อหลัก
 st.title("🏭 ระบบตัดสินใจการผลิตแผ่นยางรมควัน")
@@ -34,7 +38,7 @@ with col1:
         "กำลังการผลิต (กก./วัน)",
         min_value=10000,
         max_value=200000,
-        value=60000,
+        value=int(profile['engine']['PRODUCTION_CAPACITY']),
         step=5000
     )
 
@@ -43,7 +47,7 @@ with col2:
         "Stock สูงสุด (กก.)",
         min_value=5000,
         max_value=50000,
-        value=20000,
+        value=int(profile['engine']['MAX_STOCK']),
         step=1000
     )
 
@@ -52,7 +56,7 @@ with col3:
         "ต้นทุนการผลิต (บาท/กก.)",
         min_value=0.0,
         max_value=20.0,
-        value=5.0,
+        value=float(profile['engine']['PRODUCTION_COST']),
         step=0.5,
         format="%.2f"
     )
@@ -62,7 +66,7 @@ with col4:
         "ระยะเวลาผลิต (วัน)",
         min_value=1,
         max_value=10,
-        value=4,
+        value=int(profile['engine']['PRODUCTION_DAYS']),
         step=1
     )
 
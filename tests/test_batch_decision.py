@@ -0,0 +1,51 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from utils.batch_decision import batch_costs_and_revenue, batch_daily_decision
+from utils.daily_decision import LatexDecisionEngine
+
+OUTPUTS = ('produce', 'stock_old', 'stock_new', 'dispose', 'reason_code')
+
+
+def _engine(**constants):
+    engine = LatexDecisionEngine()
+    for name, value in constants.items():
+        setattr(engine, name, value)
+    return engine
+
+
+@pytest.mark.parametrize('constants', [{}, {'MAX_STOCK': 5000}, {'PRODUCTION_CAPACITY': 70000, 'MAX_STOCK': 8000}])
+def test_batch_matches_daily_decision(constants):
+    engine = _engine(**constants)
+    capacity = engine.PRODUCTION_CAPACITY
+    # รวมค่าที่ขอบของแต่ละกรณี (น้ำยางรวม = กำลังการผลิต, = 80,000, stock = กำลังการผลิต)
+    R_values = [0, 15000, capacity - 5000, capacity, capacity + 1, 65000, 72000, 80000 - capacity, 79999, 80000, 95000]
+    S_values = [0, 5000, 20000, capacity - 1, capacity, capacity + 3000]
+    fresh_values = [40.0, 52.5]
+    p5_values = [None, 35.0, 55.0, 90.0]
+    cases = list(itertools.product(R_values, S_values, fresh_values, p5_values))
+
+    R, S, fresh = (np.array(column, dtype=float) for column in list(zip(*cases))[:3])
+    p5 = np.array([np.nan if case[3] is None else case[3] for case in cases])
+    price_sheet = fresh + 12.0
+    batch = batch_daily_decision(engine, R, S, fresh, p5)
+    finance = batch_costs_and_revenue(engine, batch, fresh, price_sheet)
+
+    for i, (R_today, stock, price_fresh, price_plus_5) in enumerate(cases):
+        decision = engine.daily_decision(R_today, stock, price_fresh, None, price_plus_5)
+        for name in OUTPUTS:
+            assert batch[name][i] == pytest.approx(decision[name]), (name, cases[i])
+        expected = engine.calculate_costs_and_revenue(decision, price_fresh, price_sheet[i])
+        assert finance['profit'][i] == pytest.approx(expected['profit']), cases[i]
+
+
+def test_batch_broadcasts_scalars():
+    engine = LatexDecisionEngine()
+    R = np.array([30000.0, 70000.0, 90000.0])
+    batch = batch_daily_decision(engine, R, 0, 45.0, None)
+    for i, R_today in enumerate(R):
+        decision = engine.daily_decision(R_today, 0, 45.0, None, None)
+        assert batch['dispose'][i] == pytest.approx(decision['dispose'])
+        assert batch['reason_code'][i] == decision['reason_code']
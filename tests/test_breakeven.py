@@ -0,0 +1,28 @@
+import numpy as np
+import pytest
+
+from utils.breakeven import breakeven_frontier, storage_cost_curve
+from utils.daily_decision import LatexDecisionEngine
+
+
+@pytest.mark.parametrize('constants', [{}, {'MAX_STORAGE_DAYS': 14, 'STORAGE_COST_DAY2_10': 0.2, 'PRODUCTION_COST': 4.5}])
+def test_frontier_matches_scalar_engine(constants):
+    engine = LatexDecisionEngine()
+    for name, value in constants.items():
+        setattr(engine, name, value)
+    prices = np.array([[38.0, 45.0], [47.25, 60.5]])
+    frontier = breakeven_frontier(engine, prices)
+    curve = storage_cost_curve(engine)
+
+    assert frontier.shape == prices.shape + (engine.MAX_STORAGE_DAYS + 1,)
+    for days in range(1, engine.MAX_STORAGE_DAYS + 1):
+        assert curve[days] == engine.calculate_storage_cost(days)
+        for index in np.ndindex(prices.shape):
+            # สูตรและลำดับการคำนวณเดียวกัน จึงเท่ากันทุกบิต
+            assert frontier[index + (days,)] == engine.calculate_breakeven_price(prices[index], storage_days=days)
+
+
+def test_storage_cost_curve_is_read_only():
+    curve = storage_cost_curve(LatexDecisionEngine())
+    with pytest.raises(ValueError):
+        curve[1] = 0.0
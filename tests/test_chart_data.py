@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from utils.chart_data import lttb, minmax_downsample
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(0)
+    x = np.arange(10_000)
+    y = np.cumsum(rng.normal(size=x.size))
+    return x, y
+
+
+@pytest.mark.parametrize('threshold', [3, 10, 257, 1000])
+def test_lttb_keeps_endpoints_and_one_point_per_bucket(series, threshold):
+    x, y = series
+    out_x, out_y = lttb(x, y, threshold)
+    assert len(out_x) == threshold
+    assert out_x[0] == x[0] and out_x[-1] == x[-1]
+    assert out_y[0] == y[0] and out_y[-1] == y[-1]
+    # จุดกลางมาจากช่วงละหนึ่งจุด เรียงตามเวลา
+    edges = np.linspace(1, x.size - 1, threshold - 1).astype(np.intp)
+    buckets = np.searchsorted(edges, out_x[1:-1], side='right') - 1
+    np.testing.assert_array_equal(buckets, np.arange(threshold - 2))
+    np.testing.assert_array_equal(out_y, y[out_x])
+
+
+def test_lttb_short_series_unchanged(series):
+    x, y = series
+    out_x, out_y = lttb(x[:50], y[:50], 100)
+    np.testing.assert_array_equal(out_x, x[:50])
+
+
+def test_minmax_keeps_extremes(series):
+    x, y = series
+    out_x, out_y = minmax_downsample(x, y, 100)
+    assert len(out_x) <= 200
+    assert np.all(np.diff(out_x) > 0)
+    assert out_y.min() == y.min() and out_y.max() == y.max()
@@ -0,0 +1,72 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils.decision_frame import DecisionFrame
+
+
+@pytest.fixture
+def frame():
+    days = 1000
+    return DecisionFrame({
+        'produce': np.linspace(0, 60000, days),
+        'dispose': np.zeros(days),
+        'reason_code': np.arange(days, dtype='u1') % 10,
+    })
+
+
+def _mapped_ranges(path):
+    """ช่วง address ที่ไฟล์ถูก memory-map ใน process นี้ (Linux)"""
+    ranges = []
+    with open('/proc/self/maps') as maps:
+        for line in maps:
+            if line.rstrip().endswith(path):
+                start, end = line.split()[0].split('-')
+                ranges.append((int(start, 16), int(end, 16)))
+    return ranges
+
+
+def test_columns_are_not_copied():
+    produce = np.arange(10.0)
+    assert DecisionFrame({'produce': produce})['produce'] is produce
+
+
+def test_length_mismatch():
+    with pytest.raises(ValueError):
+        DecisionFrame({'produce': np.zeros(3), 'dispose': np.zeros(4)})
+
+
+def test_slice_is_view(frame):
+    part = frame[100:200]
+    assert len(part) == 100
+    for name in frame.columns:
+        assert np.shares_memory(part[name], frame[name])
+
+
+def test_to_pandas_zero_copy(frame):
+    df = frame.to_pandas()
+    for name in frame.columns:
+        assert np.shares_memory(df[name].to_numpy(), frame[name])
+
+
+def test_to_arrow_zero_copy(frame):
+    pytest.importorskip('pyarrow')
+    table = frame.to_arrow()
+    for name in frame.columns:
+        assert table.column(name).chunk(0).buffers()[1].address == frame[name].ctypes.data
+
+
+@pytest.mark.skipif(not os.path.exists('/proc/self/maps'), reason="ต้องใช้ /proc/self/maps")
+def test_feather_round_trip_is_memory_mapped(frame, tmp_path):
+    pytest.importorskip('pyarrow')
+    path = str(tmp_path / 'decisions.feather')
+    frame.write_feather(path)
+    loaded = DecisionFrame.read_feather(path)
+
+    ranges = _mapped_ranges(path)
+    for name in frame.columns:
+        np.testing.assert_array_equal(loaded[name], frame[name])
+        address = loaded[name].ctypes.data
+        # ข้อมูลอยู่ในช่วงที่ map ไฟล์ไว้ ไม่ใช่สำเนาในหน่วยความจำ
+        assert any(start <= address < end for start, end in ranges)
@@ -0,0 +1,10 @@
+from utils.decision_history import DecisionHistory
+
+
+def test_profit_keeps_satang():
+    history = DecisionHistory(capacity=2)
+    decision = {'produce': 1000, 'stock_old': 0, 'stock_new': 0, 'dispose': 0, 'reason_code': 0}
+    history.append(1000, 0, 52.37, 61.25, None, decision, profit=1_234_567.89)
+    record = history.records()[0]
+    assert record['profit'] == 1_234_567.89
+    assert record['price_today_fresh'] == 52.37
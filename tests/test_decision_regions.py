@@ -0,0 +1,41 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.decision_regions import DecisionRegionTable, compile_regions
+
+OUTPUTS = ('produce', 'stock_old', 'stock_new', 'dispose')
+
+
+@pytest.fixture
+def grid():
+    # รวมค่าที่ขอบของแต่ละช่วง (กำลังการผลิต, กำลังการผลิต + MAX_STOCK, 80,000)
+    R_values = [0, 20000, 59999, 60000, 60001, 79999, 80000, 80001, 95000]
+    S_values = [0, 10000, 20000, 59999, 60000, 65000]
+    fresh_values = [40.0, 52.5]
+    p5_values = [np.nan, 35.0, 49.43, 90.0]
+    cases = np.array(list(itertools.product(R_values, S_values, fresh_values, p5_values)), dtype=float)
+    return cases.T
+
+
+@pytest.mark.parametrize('constants', [{}, {'MAX_STOCK': 5000}])
+def test_json_round_trip_gives_same_lookup(grid, constants):
+    engine = LatexDecisionEngine()
+    for name, value in constants.items():
+        setattr(engine, name, value)
+    table = compile_regions(engine)
+    loaded = DecisionRegionTable.from_json(table.to_json())
+
+    expected = table.lookup(*grid)
+    actual = loaded.lookup(*grid)
+    for name, values in expected.items():
+        np.testing.assert_array_equal(actual[name], values, err_msg=name)
+    np.testing.assert_array_equal(loaded.breakpoints, table.breakpoints)
+
+    # และยังตรงกับ engine
+    for i, (R, S, fresh, p5) in enumerate(grid.T):
+        decision = engine.daily_decision(R, S, fresh, None, None if np.isnan(p5) else p5)
+        for name in OUTPUTS:
+            assert actual[name][i] == pytest.approx(decision[name]), (name, R, S, fresh, p5)
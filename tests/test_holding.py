@@ -0,0 +1,21 @@
+import numpy as np
+
+from utils.breakeven import storage_cost_curve
+from utils.daily_decision import LatexDecisionEngine
+from utils.holding import holding_daily_decision
+
+
+def test_reason_uses_real_plus_5_price():
+    engine = LatexDecisionEngine()
+    curve = np.full(len(storage_cost_curve(engine)), np.nan)
+    curve[1] = 50.0  # ราคาวันที่ +5 ต่ำกว่าจุดคุ้มทุน แต่วันที่ +7 คุ้ม
+    curve[3] = 200.0
+    result = holding_daily_decision(engine, 70000, 0, 50.0, curve)
+
+    assert result['stock_new'] > 0 and result['hold_days'] == 3
+    assert result['reason_params']['price_plus_5'] == 50.0
+    assert result['reason_params']['hold_days'] == 3
+    # ข้อความไม่อ้างราคาวันที่ +5 สมมติ (จุดคุ้มทุน + กำไรส่วนเพิ่ม)
+    fabricated = result['reason_params']['breakeven'] + result['hold_margin_per_kg']
+    assert f"{fabricated:.2f}" not in result['reason']
+    assert "ผลิตในอีก 3 วัน" in result['reason']
@@ -0,0 +1,14 @@
+import pytest
+
+from benchmarks.check_import_time import DEFAULT_BUDGET_MS, PAGES, check_page
+
+
+@pytest.mark.parametrize('page', PAGES)
+def test_page_import_within_budget(page):
+    total_ms, top, heavy = check_page(page)
+    # module หนักต้องโหลดผ่าน utils.lazy เมื่อใช้จริงเท่านั้น
+    assert heavy == []
+    if total_ms > DEFAULT_BUDGET_MS:
+        # วัดซ้ำครั้งเดียว - ครั้งแรกอาจช้าเพราะ cache ของดิสก์/ไฟล์ .pyc ยังไม่พร้อม
+        total_ms, top, _ = check_page(page)
+    assert total_ms <= DEFAULT_BUDGET_MS, f"{page}: {total_ms:.0f} ms, ช้าที่สุด: {top[:3]}"
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from utils.daily_decision import LatexDecisionEngine
+import utils.parallel_backtest as parallel_backtest_module
+from utils.parallel_backtest import parallel_backtest
+from utils.result_cache import ResultCache
+from utils.simulation import simulate
+
+
+@pytest.fixture
+def inputs():
+    rng = np.random.default_rng(0)
+    days = 3000
+    R_today = rng.integers(20000, 90000, days).astype(float)
+    price_fresh = rng.uniform(40, 50, days).round(2)
+    price_plus_5 = np.where(rng.random(days) < 0.3, np.nan, rng.uniform(45, 60, days).round(2))
+    return R_today, price_fresh, price_plus_5
+
+
+def _assert_same(result, expected):
+    for name in ('current_stock', 'produce', 'stock_old', 'stock_new', 'dispose', 'reason_code'):
+        np.testing.assert_array_equal(result[name], expected[name])
+
+
+def test_single_worker_runs_serial(inputs):
+    R_today, price_fresh, price_plus_5 = inputs
+    engine = LatexDecisionEngine()
+    result = parallel_backtest(engine, R_today, price_fresh, price_plus_5=price_plus_5, workers=1)
+    assert result['repaired_days'] == 0
+    _assert_same(result, simulate(engine, R_today, price_fresh, price_plus_5=price_plus_5))
+
+
+def test_probe_then_parallel_matches_serial(inputs, monkeypatch):
+    # ไม่มีค่าใช้จ่ายของ pool → ช่วง probe แบบ serial ต่อกับส่วนที่เหลือแบบขนาน ต้องได้ผลเหมือนรวดเดียว
+    monkeypatch.setattr(parallel_backtest_module, 'POOL_SECONDS_PER_WORKER', 0.0)
+    R_today, price_fresh, price_plus_5 = inputs
+    engine = LatexDecisionEngine()
+    result = parallel_backtest(engine, R_today, price_fresh, price_plus_5=price_plus_5,
+                               workers=2, initial_stock=5000)
+    _assert_same(result, simulate(engine, R_today, price_fresh, price_plus_5=price_plus_5, initial_stock=5000))
+
+
+def test_forced_parallel_matches_serial(inputs):
+    R_today, price_fresh, price_plus_5 = inputs
+    engine = LatexDecisionEngine()
+    result = parallel_backtest(engine, R_today, price_fresh, price_plus_5=price_plus_5,
+                               workers=3, chunk_days=700, min_days=0, initial_stock=12000)
+    _assert_same(result, simulate(engine, R_today, price_fresh, price_plus_5=price_plus_5, initial_stock=12000))
+
+
+def test_cached_result_is_reused(inputs, tmp_path, monkeypatch):
+    R_today, price_fresh, price_plus_5 = inputs
+    engine = LatexDecisionEngine()
+    cache = ResultCache(str(tmp_path))
+    first = parallel_backtest(engine, R_today, price_fresh, price_plus_5=price_plus_5, workers=1, cache=cache)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ไม่ควรจำลองซ้ำ")
+
+    monkeypatch.setattr(parallel_backtest_module, 'simulate', fail)
+    second = parallel_backtest(engine, R_today, price_fresh, price_plus_5=price_plus_5, workers=1, cache=cache)
+    _assert_same(second, first)
+    assert second['repaired_days'] == first['repaired_days']
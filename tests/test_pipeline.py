@@ -0,0 +1,42 @@
+import numpy as np
+import pytest
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.pipeline import decide, decide_chunked, validate
+
+
+def _records(n=400, seed=0):
+    rng = np.random.default_rng(seed)
+    for i in range(n):
+        yield {
+            'date': f"2024-{i // 28 % 12 + 1:02d}-{i % 28 + 1:02d}",
+            'R_today': float(rng.choice([20000, 45000, 58000, 66000, 72000, 85000])),
+            'price_today_fresh': float(rng.choice([45.0, 55.0])),
+            'price_today_plus_4': 60.0,
+            'price_today_plus_5': None if rng.random() < 0.2 else float(rng.choice([40.0, 60.0, 120.0])),
+        }
+
+
+@pytest.mark.parametrize('max_stock', [None, 5000])
+def test_decide_chunked_matches_decide(max_stock):
+    engine = LatexDecisionEngine()
+    if max_stock is not None:
+        engine.MAX_STOCK = max_stock
+    expected = list(decide(_records(), engine))
+    actual = list(decide_chunked(_records(), engine, chunk_size=64))
+
+    assert len(actual) == len(expected)
+    for got, want in zip(actual, expected):
+        assert got['current_stock'] == pytest.approx(want['current_stock'])
+        assert got['decision']['reason_code'] == want['decision']['reason_code']
+        assert got['decision']['reason'] == want['decision']['reason']
+        assert got['decision']['reason_params'] == pytest.approx(want['decision']['reason_params'])
+
+
+@pytest.mark.parametrize('fresh', ['nan', 'NaN', '', '-1', 'abc'])
+def test_validate_rejects_bad_fresh_price(fresh):
+    errors = []
+    record = {'line': 2, 'date': '2024-01-01', 'R_today': '50000', 'price_today_fresh': fresh,
+              'price_today_plus_4': '', 'price_today_plus_5': ''}
+    assert list(validate([record], on_invalid=lambda record, message: errors.append(message))) == []
+    assert len(errors) == 1
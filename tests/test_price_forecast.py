@@ -0,0 +1,70 @@
+import os
+
+import pytest
+
+from utils.price_forecast import PriceForecaster, _parse_rows, get_forecaster
+
+
+def _write(path, prices, mode='w', header=True):
+    with open(path, mode, encoding='utf-8') as f:
+        if header:
+            f.write('date,price\n')
+        for day, price in enumerate(prices, start=1):
+            f.write(f"2024-01-{day:02d},{price}\n")
+
+
+def _full_fit(path):
+    with open(path, encoding='utf-8') as f:
+        rows = _parse_rows(f.read().splitlines())
+    return PriceForecaster().fit([p for _, p in rows], last_date=rows[-1][0])
+
+
+def _assert_same(forecaster, expected):
+    assert forecaster.n_obs == expected.n_obs
+    assert forecaster.last_date == expected.last_date
+    assert forecaster.forecast([1, 5]) == pytest.approx(expected.forecast([1, 5]))
+
+
+def test_partial_last_line_is_read_once_complete(tmp_path):
+    path = str(tmp_path / 'history.csv')
+    _write(path, [60.0, 61.0, 62.5])
+    get_forecaster(path)
+
+    # บรรทัดที่กำลังถูกเขียน (ยังไม่มี '\n') ต้องไม่ถูกอ่านเป็นราคา 6
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('2024-01-04,6')
+    assert get_forecaster(path).n_obs == 3
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('3.5\n')
+    _assert_same(get_forecaster(path), _full_fit(path))
+
+
+def test_same_size_rewrite_is_refit(tmp_path):
+    path = str(tmp_path / 'history.csv')
+    _write(path, [60.0, 61.0, 62.0])
+    get_forecaster(path)
+    stat = os.stat(path)
+
+    _write(path, [70.0, 71.0, 72.0])
+    assert os.path.getsize(path) == stat.st_size
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    _assert_same(get_forecaster(path), _full_fit(path))
+
+
+def test_larger_rewrite_is_refit(tmp_path):
+    path = str(tmp_path / 'history.csv')
+    _write(path, [60.0, 61.0, 62.0])
+    get_forecaster(path)
+
+    _write(path, [50.0, 51.0, 52.0, 53.0, 54.0])
+    _assert_same(get_forecaster(path), _full_fit(path))
+
+
+def test_append_is_incremental(tmp_path):
+    path = str(tmp_path / 'history.csv')
+    _write(path, [60.0, 61.0, 62.0])
+    first = get_forecaster(path)
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('2024-01-04,63.0\n')
+    assert get_forecaster(path) is first
+    _assert_same(first, _full_fit(path))
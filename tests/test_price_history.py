@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from utils.price_history import TickHistory
+
+
+@pytest.fixture
+def history(tmp_path):
+    rng = np.random.default_rng(0)
+    n = 5000
+    times = 1_600_000_000 + np.cumsum(rng.integers(1, 120, n))
+    kinds = rng.choice(['fresh', 'sheet'], n)
+    prices = rng.uniform(40, 80, n).round(2)
+    csv_path = tmp_path / 'ticks.csv'
+    pd.DataFrame({
+        'timestamp': pd.to_datetime(times, unit='s').strftime('%Y-%m-%d %H:%M:%S'),
+        'kind': kinds,
+        'price': prices,
+    }).to_csv(csv_path, index=False)
+    return TickHistory.open(str(csv_path)), times, kinds, prices
+
+
+@pytest.mark.parametrize('how', ['mean', 'first', 'last', 'max', 'min'])
+@pytest.mark.parametrize('seconds', [600, 3600])
+def test_chunked_resample_matches_full(history, how, seconds):
+    ticks, times, kinds, prices = history
+    mask = kinds == 'fresh'
+    expected = pd.Series(prices[mask]).groupby(times[mask] // seconds).agg(how)
+
+    # chunk เล็กมากเพื่อให้มีช่วงที่คร่อม chunk หลายช่วง
+    starts, values = ticks.resample('fresh', seconds, how, chunksize=97)
+    np.testing.assert_array_equal(starts, expected.index.to_numpy() * seconds)
+    np.testing.assert_allclose(values, expected.to_numpy())
+
+
+def test_resample_unknown_how(history):
+    with pytest.raises(ValueError):
+        history[0].resample('fresh', 600, 'median')
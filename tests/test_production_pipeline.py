@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.production_pipeline import simulate_cash_flow
+
+
+@pytest.fixture
+def flow():
+    rng = np.random.default_rng(4)
+    days = 60
+    engine = LatexDecisionEngine()
+    R_today = rng.integers(20000, 90000, days).astype(float)
+    price_fresh = rng.uniform(40, 50, days).round(2)
+    sheet_price = rng.uniform(45, 60, days).round(2)
+    return engine, price_fresh, sheet_price, simulate_cash_flow(engine, R_today, price_fresh, sheet_price)
+
+
+def test_revenue_booked_on_completion_day(flow):
+    engine, _, sheet_price, result = flow
+    lag = engine.PRODUCTION_DAYS
+    produce = result['produce']
+
+    # ล็อตที่เริ่มวัน s ได้เงินวัน s + PRODUCTION_DAYS ตามราคาแผ่นยางของวันนั้น
+    np.testing.assert_array_equal(result['completed_kg'][:lag], 0.0)
+    np.testing.assert_array_equal(result['completed_kg'][lag:], produce[:-lag])
+    np.testing.assert_allclose(result['sheet_revenue'][lag:], produce[:-lag] * sheet_price[lag:])
+    np.testing.assert_array_equal(result['sheet_revenue'][:lag], 0.0)
+
+
+def test_wip_matches_naive_batch_loop(flow):
+    engine, price_fresh, _, result = flow
+    lag = engine.PRODUCTION_DAYS
+    produce = result['produce']
+
+    wip_kg = []
+    wip_cost = []
+    for t in range(len(produce)):
+        # ล็อตที่เริ่มแล้วแต่ยังไม่เสร็จ ณ สิ้นวัน t
+        batches = range(max(0, t - lag + 1), t + 1)
+        wip_kg.append(sum(produce[s] for s in batches))
+        wip_cost.append(sum(produce[s] * (price_fresh[s] + engine.PRODUCTION_COST) for s in batches))
+    np.testing.assert_allclose(result['wip_kg'], wip_kg)
+    np.testing.assert_allclose(result['wip_cost'], wip_cost)
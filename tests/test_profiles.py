@@ -0,0 +1,16 @@
+import json
+
+from utils.profiles import DEFAULT_PROFILE, profile_labels
+
+
+def test_profile_labels_marks_broken_files(tmp_path):
+    (tmp_path / f"{DEFAULT_PROFILE}.json").write_text(json.dumps({'name': 'โรงงานหลัก'}), encoding='utf-8')
+    (tmp_path / 'typo.json').write_text(json.dumps({'engine': {'MAX_STOKC': 1}}), encoding='utf-8')
+    (tmp_path / 'broken.json').write_text('{"name": ', encoding='utf-8')
+
+    labels, errors = profile_labels(str(tmp_path))
+    assert list(labels) == [DEFAULT_PROFILE, 'broken', 'typo']
+    assert labels[DEFAULT_PROFILE] == 'โรงงานหลัก'
+    assert set(errors) == {'broken', 'typo'}
+    assert 'MAX_STOKC' in errors['typo']
+    assert 'broken' in labels['broken']
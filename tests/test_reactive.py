@@ -0,0 +1,67 @@
+from collections import Counter
+
+from utils.reactive import ReactiveGraph
+
+
+def _graph(store, calls):
+    graph = ReactiveGraph(store)
+
+    @graph.node('price')
+    def breakeven(price):
+        calls['breakeven'] += 1
+        return price + 4
+
+    @graph.node('R', 'stock')
+    def total(R, stock):
+        calls['total'] += 1
+        return R + stock
+
+    @graph.node('total', 'breakeven')
+    def summary(total, breakeven):
+        calls['summary'] += 1
+        return (total, breakeven)
+
+    @graph.node('total')
+    def over_capacity(total):
+        calls['over_capacity'] += 1
+        return total > 60000
+
+    return graph
+
+
+def test_only_dependents_recompute():
+    store = {}
+    calls = Counter()
+    graph = _graph(store, calls)
+    graph.set_inputs(price=45.0, R=50000, stock=5000)
+    for name in ('summary', 'over_capacity'):
+        graph.get(name)
+    assert calls == {'breakeven': 1, 'total': 1, 'summary': 1, 'over_capacity': 1}
+
+    # เปลี่ยนราคา: คำนวณใหม่เฉพาะ breakeven และ summary - total/over_capacity ใช้ค่าเดิม
+    graph.set_inputs(price=46.0)
+    for name in ('summary', 'over_capacity'):
+        graph.get(name)
+    assert calls == {'breakeven': 2, 'total': 1, 'summary': 2, 'over_capacity': 1}
+    assert graph.get('summary') == (55000, 50.0)
+
+    # เปลี่ยน R แต่ผลรวมเท่าเดิม: total คำนวณใหม่ แต่ node ที่ขึ้นกับ total ไม่ต้องคำนวณ
+    graph.set_inputs(R=45000, stock=10000)
+    for name in ('summary', 'over_capacity'):
+        graph.get(name)
+    assert calls == {'breakeven': 2, 'total': 2, 'summary': 2, 'over_capacity': 1}
+
+
+def test_memo_survives_new_graph():
+    # store (เช่น st.session_state) อยู่ข้าม rerun - graph ที่สร้างใหม่ใช้ค่าที่ memo ไว้
+    store = {}
+    calls = Counter()
+    graph = _graph(store, calls)
+    graph.set_inputs(price=45.0, R=50000, stock=5000)
+    graph.get('summary')
+
+    rerun = _graph(store, calls)
+    rerun.set_inputs(price=45.0, R=50000, stock=5000)
+    rerun.get('summary')
+    assert calls == {'breakeven': 1, 'total': 1, 'summary': 1}
+    assert rerun.recomputed == set()
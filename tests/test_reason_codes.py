@@ -0,0 +1,44 @@
+import itertools
+
+import numpy as np
+import pytest
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.reason_codes import (
+    REASON_SELL_UNPROFITABLE, STOCK_FULL_REASONS, disposed_stock_full, reason_codes, render_reason,
+)
+
+
+def _grid(engine):
+    R = [0, 30000, 55000, 62000, 70000, 79000, 90000]
+    S = [0, 10000, 40000, 60000, 65000, 70000]
+    fresh = [45.0, 60.0]
+    p5 = [None, 50.0, 70.0, 200.0]
+    return [case for case in itertools.product(R, S, fresh, p5) if case[1] <= engine.MAX_STOCK + engine.PRODUCTION_CAPACITY]
+
+
+@pytest.mark.parametrize('max_stock', [None, 5000])
+def test_codes_and_stock_full_counts_match_engine(max_stock):
+    engine = LatexDecisionEngine()
+    if max_stock is not None:
+        engine.MAX_STOCK = max_stock
+    cases = _grid(engine)
+    decisions = [engine.daily_decision(R, S, fresh, None, p5) for R, S, fresh, p5 in cases]
+
+    R, S, fresh, p5 = (np.array([np.nan if v is None else v for v in column], dtype=float) for column in zip(*cases))
+    codes = reason_codes(engine, R, S, fresh, p5)
+    np.testing.assert_array_equal(codes, [d['reason_code'] for d in decisions])
+
+    # ขายทิ้งเพราะ stock เต็ม = มีการขายทิ้งที่ไม่ใช่เพราะราคาไม่คุ้มทุน
+    expected = np.array([d['dispose'] > 0 and d['reason_code'] != REASON_SELL_UNPROFITABLE for d in decisions])
+    np.testing.assert_array_equal(disposed_stock_full(codes), expected)
+    assert expected.any()
+    assert all(d['dispose'] > 0 for d in decisions if d['reason_code'] in STOCK_FULL_REASONS)
+
+
+def test_stock_full_text_unchanged():
+    engine = LatexDecisionEngine()
+    decision = engine.daily_decision(90000, 0, 50.0, None, None)
+    assert decision['reason_code'] in STOCK_FULL_REASONS
+    assert decision['reason'] == render_reason(decision['reason_code'], decision['reason_params'])
+    assert "ขายทิ้ง" in decision['reason']
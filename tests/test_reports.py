@@ -0,0 +1,57 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+from utils import reports
+
+
+def test_main_exits_when_no_valid_rows(tmp_path, monkeypatch, capsys):
+    input_path = tmp_path / 'daily.csv'
+    input_path.write_text('date,R_today,price_today_fresh,price_today_plus_4,price_today_plus_5\n'
+                          '2024-01-01,-5,50,60,61\n'
+                          '2024-01-02,abc,50,60,61\n', encoding='utf-8')
+    monkeypatch.setattr(sys, 'argv', ['reports', str(input_path), str(tmp_path / 'out')])
+
+    with pytest.raises(SystemExit) as exit_info:
+        reports.main()
+    assert exit_info.value.code == 1
+    assert "ไม่มีข้อมูลที่ถูกต้อง" in capsys.readouterr().out
+
+
+def test_main_writes_pdf_and_excel(tmp_path, monkeypatch, capsys):
+    input_path = tmp_path / 'daily.csv'
+    input_path.write_text('date,R_today,price_today_fresh,price_today_plus_4,price_today_plus_5\n'
+                          '2024-01-01,50000,45,52,53\n'
+                          '2024-01-02,abc,45,52,53\n'
+                          '2024-01-03,75000,46,53,54\n'
+                          '2024-01-04,85000,44,50,\n', encoding='utf-8')
+    output_dir = tmp_path / 'out'
+    monkeypatch.setattr(sys, 'argv', ['reports', str(input_path), str(output_dir), 'default', '1'])
+
+    reports.main()
+    assert "สร้างรายงาน 3 วัน" in capsys.readouterr().out
+
+    dates = ['2024-01-01', '2024-01-03', '2024-01-04']
+    assert sorted(os.listdir(output_dir)) == sorted(f"default_{date}.{ext}" for date in dates for ext in ('pdf', 'xlsx'))
+    for date in dates:
+        with open(output_dir / f"default_{date}.pdf", 'rb') as f:
+            assert f.read(5) == b'%PDF-'
+
+    # แผ่นข้อมูลย้อนหลังมีทุกวันจนถึงวันที่รายงาน (ข้ามแถวที่ไม่ถูกต้อง)
+    last = output_dir / 'default_2024-01-04.xlsx'
+    history = pd.read_excel(last, sheet_name='ย้อนหลัง')
+    assert history['วันที่'].astype(str).tolist() == dates
+    assert history['น้ำยางเข้า (กก.)'].tolist() == [50000, 75000, 85000]
+    summary = pd.read_excel(last, sheet_name='สรุปประจำวัน')
+    assert summary.columns.tolist() == ['รายการ', 'โรงงานหลัก']
+    assert len(summary) == len(history.columns)
+
+
+def test_chart_title_uses_profile_id_without_thai_font(monkeypatch):
+    monkeypatch.setattr(reports, 'thai_font', lambda: None)
+    assert reports.chart_title_name('default', 'โรงงานหลัก') == 'default'
+    monkeypatch.setattr(reports, 'thai_font', lambda: 'Sarabun')
+    assert reports.chart_title_name('default', 'โรงงานหลัก') == 'โรงงานหลัก (default)'
+    assert reports.chart_title_name('default') == 'default'
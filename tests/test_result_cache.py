@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils.result_cache import ResultCache, cache_key, code_version
+
+
+def _grid_v1(x):
+    return x + 1
+
+
+def _grid_v2(x):
+    return x + 2
+
+
+def test_code_version_includes_function_source():
+    assert code_version(_grid_v1) != code_version()
+    assert code_version(_grid_v1) != code_version(_grid_v2)
+    assert cache_key({'a': 1}, version=code_version(_grid_v1)) != cache_key({'a': 1}, version=code_version(_grid_v2))
+
+
+def test_get_returns_data_when_utime_fails(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    cache.put('key', {'values': np.arange(3)})
+
+    def failing_utime(*args, **kwargs):
+        raise PermissionError('read-only')
+
+    monkeypatch.setattr(os, 'utime', failing_utime)
+    result = cache.get('key')
+    np.testing.assert_array_equal(result['values'], np.arange(3))
+
+
+def _entry_size(tmp_path):
+    probe = ResultCache(str(tmp_path / 'probe'))
+    probe.put('probe', {'values': np.arange(1000.0)})
+    return probe.size_bytes
+
+
+def test_size_cap(tmp_path):
+    size = _entry_size(tmp_path)
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=3 * size)
+    for i in range(10):
+        cache.put(f'key{i}', {'values': np.arange(1000.0) + i})
+        assert cache.size_bytes <= cache.max_bytes
+    assert len(cache._entries()) == 3
+
+
+def test_evicts_least_recently_used(tmp_path):
+    size = _entry_size(tmp_path)
+    cache = ResultCache(str(tmp_path / 'cache'), max_bytes=3 * size)
+    for i, key in enumerate(['a', 'b', 'c']):
+        cache.put(key, {'values': np.arange(1000.0)})
+        os.utime(cache._path(key), (1_000_000 + i, 1_000_000 + i))  # a เก่าสุด, c ใหม่สุด
+
+    assert cache.get('a') is not None  # อ่าน a → กลายเป็นรายการที่เพิ่งใช้
+    cache.put('d', {'values': np.arange(1000.0)})
+    assert cache.get('b') is None
+    assert all(cache.get(key) is not None for key in ('a', 'c', 'd'))
+
+
+def test_put_is_atomic(tmp_path, monkeypatch):
+    cache = ResultCache(str(tmp_path))
+    cache.put('key', {'values': np.arange(3)})
+
+    def failing_save(f, **arrays):
+        f.write(b'partial')
+        raise OSError('disk full')
+
+    monkeypatch.setattr(np, 'savez_compressed', failing_save)
+    with pytest.raises(OSError):
+        cache.put('key', {'values': np.arange(5)})
+
+    # ไฟล์เดิมไม่ถูกแทนด้วยข้อมูลที่เขียนไม่ครบ และไม่มีไฟล์ชั่วคราวค้าง
+    np.testing.assert_array_equal(cache.get('key')['values'], np.arange(3))
+    assert os.listdir(tmp_path) == ['key.npz']
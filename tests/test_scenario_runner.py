@@ -0,0 +1,60 @@
+import os
+
+import numpy as np
+import pytest
+
+from utils.daily_decision import LatexDecisionEngine
+import utils.scenario_runner as scenario_runner
+from utils.result_cache import ResultCache
+from utils.scenario_runner import generate_paths, run_scenarios
+from utils.simulation import simulate
+
+
+def _shm_segments():
+    return {name for name in os.listdir('/dev/shm') if name.startswith('psm_')}
+
+
+def test_matches_serial_simulate():
+    engine = LatexDecisionEngine()
+    paths = generate_paths(9, 200, seed=1)
+    result = run_scenarios(engine, paths, initial_stock=3000, workers=2, chunk_size=2)
+
+    profits = []
+    for i in range(9):
+        expected = simulate(engine, paths['R_today'][i], paths['price_fresh'][i],
+                            paths['price_plus_4'][i], paths['price_plus_5'][i], 3000)
+        assert result['total_profit'][i] == pytest.approx(expected['profit'].sum())
+        assert result['total_dispose'][i] == pytest.approx(expected['dispose'].sum())
+        profits.append(expected['profit'])
+    summary = result['stats'].summary()['profit']
+    assert summary['count'] == 9 * 200
+    assert summary['mean'] == pytest.approx(np.mean(profits))
+
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="ต้องมี /dev/shm")
+def test_shared_memory_removed_when_worker_raises():
+    paths = generate_paths(4, 50, seed=2)
+    # ราคาสั้นกว่าจำนวนวัน → simulate ใน worker error
+    paths['price_fresh'] = paths['price_fresh'][:, :10]
+    before = _shm_segments()
+
+    with pytest.raises(ValueError):
+        run_scenarios(LatexDecisionEngine(), paths, workers=2, chunk_size=1)
+    assert _shm_segments() == before
+
+
+def test_cached_result_is_reused(tmp_path, monkeypatch):
+    engine = LatexDecisionEngine()
+    paths = generate_paths(4, 100, seed=5)
+    cache = ResultCache(str(tmp_path))
+    first = run_scenarios(engine, paths, workers=2, cache=cache)
+    assert len(cache._entries()) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("ไม่ควรจำลองซ้ำ")
+
+    monkeypatch.setattr(scenario_runner, '_run_scenarios', fail)
+    second = run_scenarios(engine, paths, workers=2, cache=cache)
+    np.testing.assert_array_equal(second['total_profit'], first['total_profit'])
+    assert second['stats'].summary() == first['stats'].summary()
+    assert len(cache._entries()) == 1
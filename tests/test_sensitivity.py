@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.sensitivity import PARAMETERS, cumulative_sensitivities, daily_sensitivities
+from utils.simulation import simulate
+
+# ขั้นของ finite difference (ภายในกรณีเดิม กำไรเป็นเชิงเส้น - central difference ได้ค่าตรง)
+STEPS = {name: 1e-3 for name in PARAMETERS}
+STEPS.update(TRANSPORT_COST_PER_20K=1.0, PRODUCTION_CAPACITY=1.0, MAX_STOCK=1.0)
+
+# (R_today, current_stock, ราคาวันที่ +5) - ห่างจากขอบของทุกกรณี
+DAILY_CASES = [
+    (40000, 5000, None),  # ผลิตหมด
+    (62000, 5000, 80.0),  # เก็บส่วนเกิน (ราคาคุ้มทุน)
+    (70000, 0, 30.0),  # ขายส่วนเกิน (ราคาไม่คุ้มทุน)
+    (70000, 0, None),  # ไม่ทราบราคา
+    (85000, 0, 70.0),  # เกิน 80,000
+    (10000, 65000, None),  # stock เดิมพอผลิต
+    (20000, 65000, None),  # stock เดิมพอผลิต และเกิน 80,000
+]
+
+
+def _engine(max_stock=None, **changes):
+    engine = LatexDecisionEngine()
+    if max_stock is not None:
+        engine.MAX_STOCK = max_stock
+    for name, delta in changes.items():
+        setattr(engine, name, getattr(engine, name) + delta)
+    return engine
+
+
+def _daily_profit(engine, R_today, current_stock, price_fresh, price_sheet, price_plus_5, storage_accrual):
+    decision = engine.daily_decision(R_today, current_stock, price_fresh, None, price_plus_5)
+    profit = engine.calculate_costs_and_revenue(decision, price_fresh, price_sheet)['profit']
+    if storage_accrual:
+        profit -= decision['stock_new'] * engine.STORAGE_COST_DAY1 + decision['stock_old'] * engine.STORAGE_COST_DAY2_10
+    return profit
+
+
+def _finite_difference(profit, max_stock, price_fresh, price_sheet, name):
+    step = STEPS[name]
+    values = []
+    for sign in (1, -1):
+        fresh, sheet, changes = price_fresh, price_sheet, {}
+        if name == 'price_today_fresh':
+            fresh = fresh + sign * step
+        elif name == 'price_sale_sheet':
+            sheet = sheet + sign * step
+        else:
+            changes[name] = sign * step
+        values.append(profit(_engine(max_stock, **changes), fresh, sheet))
+    return (values[0] - values[1]) / (2 * step)
+
+
+@pytest.mark.parametrize('max_stock', [None, 5000])
+@pytest.mark.parametrize('storage_accrual', [False, True])
+@pytest.mark.parametrize('R_today, current_stock, price_plus_5', DAILY_CASES)
+def test_daily_sensitivities_match_finite_differences(R_today, current_stock, price_plus_5, storage_accrual, max_stock):
+    price_fresh, price_sheet = 45.0, 60.0
+    analytic = daily_sensitivities(_engine(max_stock), R_today, current_stock, price_fresh, price_sheet,
+                                   price_plus_5, storage_accrual=storage_accrual)
+
+    def profit(engine, fresh, sheet):
+        return _daily_profit(engine, R_today, current_stock, fresh, sheet, price_plus_5, storage_accrual)
+
+    for name in PARAMETERS:
+        expected = _finite_difference(profit, max_stock, price_fresh, price_sheet, name)
+        assert float(analytic[name]) == pytest.approx(expected, rel=1e-6, abs=1e-6), name
+
+
+@pytest.mark.parametrize('max_stock', [None, 5000])
+def test_cumulative_sensitivities_match_finite_differences(max_stock):
+    rng = np.random.default_rng(1)
+    days = 200
+    R_today = rng.uniform(20000, 90000, days)
+    price_fresh = rng.uniform(40, 50, days)
+    price_plus_4 = rng.uniform(45, 60, days)
+    price_plus_5 = np.where(rng.random(days) < 0.3, np.nan, rng.uniform(45, 60, days))
+    analytic = cumulative_sensitivities(_engine(max_stock), R_today, price_fresh, price_plus_4, price_plus_5)
+
+    def profit(engine, fresh, sheet):
+        return simulate(engine, R_today, fresh, sheet, price_plus_5)['profit'].sum()
+
+    for name in PARAMETERS:
+        expected = _finite_difference(profit, max_stock, price_fresh, price_plus_4, name)
+        assert analytic[name] == pytest.approx(expected, rel=1e-6, abs=1e-4), name
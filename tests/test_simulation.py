@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.simulation import verify_kernel
+
+
+@pytest.fixture
+def inputs():
+    rng = np.random.default_rng(3)
+    days = 2000
+    R_today = rng.integers(10000, 100000, days).astype(float)
+    price_fresh = rng.uniform(40, 50, days).round(2)
+    price_plus_4 = rng.uniform(45, 60, days).round(2)
+    price_plus_5 = np.where(rng.random(days) < 0.3, np.nan, rng.uniform(45, 60, days).round(2))
+    return R_today, price_fresh, price_plus_4, price_plus_5
+
+
+def test_kernel_matches_engine_default_config(inputs):
+    assert verify_kernel(LatexDecisionEngine(), *inputs)
+
+
+def test_kernel_matches_engine_modified_config(inputs):
+    # stock ตั้งต้นเกินกำลังการผลิต → ผ่านกรณี stock ครอบคลุมกำลังการผลิตตั้งแต่วันแรก
+    engine = LatexDecisionEngine()
+    engine.PRODUCTION_CAPACITY = 50000
+    engine.MAX_STOCK = 30000
+    engine.PRODUCTION_COST = 4.5
+    assert verify_kernel(engine, *inputs, initial_stock=70000)
@@ -0,0 +1,38 @@
+import numpy as np
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.stock_ledger import StockLedger
+
+
+def _gapped_ledger(snapshot_interval, days=2000, seed=0):
+    """ledger จาก daily_decision ที่มีวันเว้นว่าง (บางวันไม่มี event)"""
+    engine = LatexDecisionEngine()
+    rng = np.random.default_rng(seed)
+    ledger = StockLedger(snapshot_interval=snapshot_interval)
+    event_days = np.flatnonzero(rng.random(days) < 0.6)
+    stock = 0.0
+    for day in event_days:
+        R = float(rng.uniform(20000, 90000))
+        decision = engine.daily_decision(R, stock, 30.0, None, float(rng.uniform(25, 40)))
+        ledger.record_decision(int(day), R, decision)
+        stock = decision['stock_old'] + decision['stock_new']
+    return ledger, event_days
+
+
+def test_gapped_stream_snapshots_every_bucket():
+    ledger, event_days = _gapped_ledger(snapshot_interval=30)
+    # ทุกช่วง 30 วันที่มี event (ยกเว้นวันที่ยังไม่ปิด) ต้องมี snapshot
+    closed = event_days[:-1]
+    expected_buckets = set((closed - event_days[0]) // 30)
+    assert len(ledger._snapshot_days) == len(expected_buckets)
+    gaps = np.diff(ledger._snapshot_days)
+    assert gaps.max() < 2 * 30
+
+
+def test_gapped_state_matches_full_replay():
+    ledger, event_days = _gapped_ledger(snapshot_interval=30)
+    reference, _ = _gapped_ledger(snapshot_interval=10 ** 9)  # snapshot เฉพาะวันแรก = replay เกือบทั้งหมด
+    assert len(reference._snapshot_days) == 1
+    for day in range(int(event_days[0]), int(event_days[-1]) + 5, 7):
+        assert ledger.state_at(day) == reference.state_at(day)
+        assert ledger.current_stock_for(day) == reference.current_stock_for(day)
@@ -0,0 +1,44 @@
+import numpy as np
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.validation import (
+    ERROR_FRESH_PRICE_MISSING, ERROR_FRESH_PRICE_NEGATIVE, ERROR_INFINITE, ERROR_INTAKE_MISSING,
+    ERROR_INTAKE_NEGATIVE, ERROR_NOT_A_NUMBER, ERROR_PLUS_5_PRICE_INVALID, ERROR_SHEET_PRICE_INVALID,
+    ERROR_STOCK_NEGATIVE, ERROR_STOCK_OVER_MAX, describe_errors, error_counts, split_valid, validate_inputs,
+)
+
+
+def test_error_codes_per_row():
+    engine = LatexDecisionEngine()
+    rows = [
+        # (R_today, ราคาน้ำยางสด, +4, +5, stock, รหัสที่คาด)
+        (50000, 45.0, 60.0, None, 0, 0),
+        (None, 45.0, 60.0, 61.0, 0, ERROR_INTAKE_MISSING),
+        (-1, 45.0, 60.0, 61.0, 0, ERROR_INTAKE_NEGATIVE),
+        ('abc', 45.0, 60.0, 61.0, 0, ERROR_NOT_A_NUMBER),
+        (50000, None, 60.0, 61.0, 0, ERROR_FRESH_PRICE_MISSING),
+        (50000, -3.0, -1.0, 61.0, 0, ERROR_FRESH_PRICE_NEGATIVE | ERROR_SHEET_PRICE_INVALID),
+        (50000, 45.0, 60.0, -2.0, 0, ERROR_PLUS_5_PRICE_INVALID),
+        (50000, 45.0, 60.0, 61.0, -5, ERROR_STOCK_NEGATIVE),
+        (50000, 45.0, 60.0, 61.0, engine.MAX_STOCK + 1, ERROR_STOCK_OVER_MAX),
+        (float('inf'), 45.0, 60.0, 61.0, 0, ERROR_INFINITE),
+    ]
+    R, fresh, p4, p5, stock, expected = zip(*rows)
+    result = validate_inputs(engine, list(R), list(fresh), list(p4), list(p5), list(stock))
+
+    np.testing.assert_array_equal(result['errors'], expected)
+    np.testing.assert_array_equal(result['valid'], np.array(expected) == 0)
+    assert np.isnan(result['price_plus_5'][0])  # ไม่ทราบราคา ไม่ใช่ข้อผิดพลาด
+    assert describe_errors(expected[5]) == ["ราคาน้ำยางสดติดลบ", "ราคาแผ่นยางวันที่ +4 ติดลบ"]
+    assert error_counts(result['errors'])["น้ำยางเข้าติดลบ"] == 1
+
+    valid, report = split_valid(result, rows=[f"line {i + 2}" for i in range(len(rows))])
+    np.testing.assert_array_equal(valid['index'], [0])
+    assert [entry['row'] for entry in report] == [f"line {i + 2}" for i in range(1, len(rows))]
+    assert [entry['error_code'] for entry in report] == list(expected[1:])
+
+
+def test_stock_not_checked_when_omitted():
+    engine = LatexDecisionEngine()
+    result = validate_inputs(engine, np.array([1000.0, 2000.0]), 45.0)
+    np.testing.assert_array_equal(result['errors'], [0, 0])
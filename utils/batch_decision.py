@@ -0,0 +1,61 @@
+"""
+ตัดสินใจรายวันแบบ batch (vectorized ด้วย NumPy)
+
+ให้ผลเหมือน LatexDecisionEngine.daily_decision ทีละแถว แต่คำนวณทั้ง array ในครั้งเดียว
+"""
+import numpy as np
+
+from utils.decision_regions import compile_regions
+from utils.reason_codes import reason_codes
+
+
+def batch_daily_decision(engine, R_today, current_stock, price_today_fresh, price_today_plus_5=None):
+    """
+    ตัดสินใจรายวันสำหรับหลายกรณีพร้อมกัน (ค้นหาจากตารางช่วงการตัดสินใจที่ compile ไว้)
+
+    Parameters:
+    - engine: LatexDecisionEngine (ใช้ค่าคงที่ของโรงงาน)
+    - R_today, current_stock, price_today_fresh: array (broadcast ได้)
+    - price_today_plus_5: array หรือ None (NaN = ไม่ทราบราคา)
+
+    Returns:
+    - dict ของ array: produce, hold, dispose, stock_old, stock_new, branch, region, reason_code
+    """
+    result = compile_regions(engine).lookup(R_today, current_stock, price_today_fresh, price_today_plus_5)
+    result['reason_code'] = reason_codes(engine, R_today, current_stock, price_today_fresh, price_today_plus_5)
+    return result
+
+
+def batch_costs_and_revenue(engine, decision, price_today_fresh, price_sale_sheet, storage_days=0):
+    """
+    คำนวณต้นทุน รายได้ และกำไรแบบ batch (สูตรเดียวกับ calculate_costs_and_revenue)
+
+    Returns:
+    - dict ของ array: total_cost, total_revenue, profit
+    """
+    produce = decision['produce']
+    dispose = decision['dispose']
+    hold = decision['hold']
+    price_today_fresh = np.asarray(price_today_fresh, dtype=float)
+    price_sale_sheet = np.asarray(price_sale_sheet, dtype=float)
+
+    # ต้นทุนการผลิตแผ่นยาง
+    storage_cost = engine.calculate_storage_cost(storage_days)
+    production_cost = np.where(produce > 0, produce * (price_today_fresh + storage_cost + engine.PRODUCTION_COST), 0.0)
+    sheet_sales = np.where(produce > 0, produce * price_sale_sheet, 0.0)
+
+    # รายได้จากการขายน้ำยางสด
+    disposal_cost = np.where(dispose > 0, engine.calculate_fresh_latex_sale_cost(dispose), 0.0)
+    fresh_sales = np.where(dispose > 0, dispose * price_today_fresh, 0.0)
+
+    # ต้นทุนการเก็บ stock
+    storage_day1 = np.where(hold > 0, hold * engine.STORAGE_COST_DAY1, 0.0)
+
+    total_cost = production_cost + disposal_cost + storage_day1
+    total_revenue = sheet_sales + fresh_sales
+
+    return {
+        'total_cost': total_cost,
+        'total_revenue': total_revenue,
+        'profit': total_revenue - total_cost,
+    }
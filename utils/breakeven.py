@@ -0,0 +1,45 @@
+"""
+ราคาคุ้มทุนของทุกระยะเวลาเก็บ (breakeven frontier)
+
+calculate_breakeven_price คำนวณทีละราคาทีละจำนวนวัน - ที่นี่คำนวณทั้ง array ของราคาน้ำยางสด
+กับทุกจำนวนวันเก็บ 0..MAX_STORAGE_DAYS ในครั้งเดียว (สูตรและลำดับการคำนวณเดียวกัน)
+เส้นค่าเก็บรักษาสะสมคำนวณครั้งเดียวต่อชุดค่าคงที่ของโรงงานแล้ว cache ไว้
+"""
+from functools import lru_cache
+
+import numpy as np
+
+from utils.daily_decision import LatexDecisionEngine
+
+
+@lru_cache(maxsize=64)
+def _storage_cost_curve(config_items):
+    engine = LatexDecisionEngine()
+    for name, value in config_items:
+        setattr(engine, name, value)
+    curve = np.array([engine.calculate_storage_cost(days) for days in range(engine.MAX_STORAGE_DAYS + 1)],
+                     dtype=float)
+    curve.setflags(write=False)
+    return curve
+
+
+def storage_cost_curve(engine):
+    """ค่าเก็บรักษาสะสม (บาท/กก.) ของการเก็บ 0..MAX_STORAGE_DAYS วัน (array อ่านอย่างเดียว)"""
+    return _storage_cost_curve(tuple(sorted(engine.get_config().items())))
+
+
+def breakeven_frontier(engine, price_today_fresh):
+    """
+    ราคาคุ้มทุนของทุกจำนวนวันเก็บ
+
+    Parameters:
+    - price_today_fresh: ราคาน้ำยางสด (ค่าเดียวหรือ array)
+
+    Returns:
+    - array ขนาด (*shape ของราคา, MAX_STORAGE_DAYS + 1) - ช่องสุดท้ายคือจำนวนวันที่เก็บ
+      ค่าเท่ากับ calculate_breakeven_price(ราคา, storage_days=วัน) ทุกช่อง
+    """
+    price_today_fresh = np.asarray(price_today_fresh, dtype=float)
+    fresh_sale_profit = price_today_fresh - engine.TRANSPORT_COST_PER_20K / 20000
+    additional_production_cost = storage_cost_curve(engine) + engine.PRODUCTION_COST
+    return fresh_sale_profit[..., None] + additional_production_cost
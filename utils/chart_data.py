@@ -0,0 +1,119 @@
+"""
+ลดจำนวนจุดของ time series ก่อนส่งไปวาดกราฟ
+
+ประวัติหลายปีมีหลายหมื่นจุด แต่กราฟกว้างแค่ไม่กี่ร้อย pixel - ส่งไปเท่าที่แสดงได้ก็พอ
+- minmax_downsample: เก็บค่าต่ำสุด/สูงสุดของแต่ละช่วง (ยอด/หุบไม่หาย) แบบ vectorized
+- lttb: Largest-Triangle-Three-Buckets (รูปร่างเส้นใกล้ของเดิมที่สุดต่อจำนวนจุด)
+- ChartPyramid: เก็บ series หลายความละเอียดไว้ (ช่วงละ 4, 8, 16, ... จุด) เมื่อซูมช่วงใด
+  จะตัดจากชั้นที่หยาบที่สุดที่ยังละเอียดพอ แล้วลดจุดเฉพาะช่วงนั้น - ไม่ต้องไล่ข้อมูลทั้งหมดทุกครั้ง
+"""
+import numpy as np
+
+
+def minmax_downsample(x, y, n_buckets):
+    """
+    แบ่งข้อมูลเป็น n_buckets ช่วงเท่า ๆ กัน แล้วเก็บจุดต่ำสุดและสูงสุดของแต่ละช่วง (เรียงตามลำดับเดิม)
+
+    Returns:
+    - (x, y) ไม่เกิน 2 × n_buckets จุด
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if n <= 2 * n_buckets:
+        return x, y
+
+    starts = np.linspace(0, n, n_buckets + 1).astype(np.intp)[:-1]
+    ends = np.r_[starts[1:], n]
+    # แทน NaN ด้วย ±inf เพื่อให้ argmin/argmax เลือกค่าจริงก่อน
+    low = np.minimum.reduceat(np.where(np.isnan(y), np.inf, y), starts)
+    high = np.maximum.reduceat(np.where(np.isnan(y), -np.inf, y), starts)
+    bucket = np.repeat(np.arange(n_buckets), ends - starts)
+    is_low = y == low[bucket]
+    is_high = y == high[bucket]
+    # ตำแหน่งแรกของค่าต่ำสุด/สูงสุดในแต่ละช่วง
+    first_low = np.minimum.reduceat(np.where(is_low, np.arange(n), n), starts)
+    first_high = np.minimum.reduceat(np.where(is_high, np.arange(n), n), starts)
+    # ช่วงที่เป็น NaN ทั้งหมดใช้จุดแรกของช่วง
+    first_low = np.where(first_low == n, starts, first_low)
+    first_high = np.where(first_high == n, starts, first_high)
+
+    index = np.unique(np.concatenate([first_low, first_high]))
+    return x[index], y[index]
+
+
+def lttb(x, y, threshold):
+    """
+    Largest-Triangle-Three-Buckets: เลือก threshold จุด (จุดแรกและจุดสุดท้ายเสมอ)
+
+    Returns:
+    - (x, y) จำนวน threshold จุด
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return x, y
+
+    xf = x.astype(float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    index = np.empty(threshold, dtype=np.intp)
+    index[0] = 0
+    index[-1] = n - 1
+    selected = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # จุดเฉลี่ยของช่วงถัดไป
+        next_start, next_end = end, (edges[i + 2] if i + 2 < len(edges) else n)
+        avg_x = xf[next_start:next_end].mean()
+        avg_y = np.nanmean(y[next_start:next_end]) if np.any(~np.isnan(y[next_start:next_end])) else 0.0
+        # พื้นที่สามเหลี่ยมระหว่างจุดที่เลือกล่าสุด, จุดในช่วงนี้ และจุดเฉลี่ยของช่วงถัดไป
+        area = np.abs((xf[selected] - avg_x) * (y[start:end] - y[selected])
+                      - (xf[selected] - xf[start:end]) * (avg_y - y[selected]))
+        area = np.where(np.isnan(area), -1.0, area)
+        selected = start + int(np.argmax(area))
+        index[i + 1] = selected
+    return x[index], y[index]
+
+
+class ChartPyramid:
+    def __init__(self, x, y, min_points=512):
+        """
+        Parameters:
+        - x: แกน x เรียงจากน้อยไปมาก (เช่น เลขวัน หรือ datetime64)
+        - y: ค่าของ series
+        - min_points: ชั้นที่หยาบที่สุดยังมีอย่างน้อยประมาณนี้
+        """
+        x = np.asarray(x)
+        y = np.asarray(y, dtype=float)
+        self.levels = [(x, y)]  # ชั้น 0 = ข้อมูลเดิม, ชั้นถัดไป = min/max ของช่วงละ 4, 8, 16, ... จุด
+        n = len(y)
+        bucket = 4
+        while n // bucket >= min_points:
+            self.levels.append(minmax_downsample(x, y, n // bucket))
+            bucket *= 2
+
+    @property
+    def nbytes(self):
+        return sum(x.nbytes + y.nbytes for x, y in self.levels)
+
+    def query(self, width, x_min=None, x_max=None, method='minmax'):
+        """
+        จุดสำหรับวาดช่วง x_min..x_max บนกราฟกว้าง width pixel
+
+        Parameters:
+        - method: 'minmax' (คงยอด/หุบ) หรือ 'lttb' (คงรูปร่าง)
+
+        Returns:
+        - (x, y) ประมาณ width ถึง 2 × width จุด
+        """
+        for x, y in reversed(self.levels):
+            lo = 0 if x_min is None else np.searchsorted(x, x_min, side='left')
+            hi = len(x) if x_max is None else np.searchsorted(x, x_max, side='right')
+            # ใช้ชั้นที่หยาบที่สุดที่ยังมีจุดในช่วงนี้พอสำหรับ width pixel
+            if hi - lo >= 2 * width or (x is self.levels[0][0]):
+                break
+        x, y = x[lo:hi], y[lo:hi]
+        if method == 'lttb':
+            return lttb(x, y, width)
+        return minmax_downsample(x, y, width)
@@ -1,6 +1,11 @@
 """
 Logic สำหรับการตัดสินใจผลิตยางรายวัน
 """
+from utils.reason_codes import (
+    REASON_PRODUCE_ALL, REASON_STOCK_COVERS, REASON_HOLD_STOCK_FULL, REASON_HOLD_PROFITABLE,
+    REASON_SELL_UNPROFITABLE, REASON_HOLD_PRICE_UNKNOWN, REASON_NO_EXCESS, REASON_OVER_LIMIT,
+    REASON_PRICE_UNKNOWN_STOCK_FULL, REASON_OVER_LIMIT_STOCK_FULL, render_reason,
+)
 
 class LatexDecisionEngine:
     def __init__(self):
@@ -13,7 +18,11 @@ class LatexDecisionEngine:
         self.STORAGE_COST_DAY1 = 0.28  # บาท/กก.
         self.STORAGE_COST_DAY2_10 = 0.14  # บาท/กก./วัน
         self.TRANSPORT_COST_PER_20K = 17000  # บาท
-        
+
+    def get_config(self):
+        """คืนค่าคงที่ทั้งหมดของโรงงาน (dict) - ใช้เป็น key สำหรับ cache"""
+        return {name: value for name, value in vars(self).items() if name.isupper()}
+
     def calculate_storage_cost(self, days):
         """คำนวณค่าเก็บรักษารวม (บาท/กก.)"""
         if days < 1:
@@ -72,8 +81,9 @@ class LatexDecisionEngine:
         - price_today_plus_5: ราคาแผ่นยางรมควันในวันที่ +5 (ถ้ารู้)
         
         Returns:
-        - dict ที่มี: produce (กก.), hold (กก.), dispose (กก.), reason (เหตุผล),
-                      stock_old (stock เดิม), stock_new (stock ใหม่ที่เก็บวันนี้)
+        - dict ที่มี: produce (กก.), hold (กก.), dispose (กก.), reason (เหตุผลภาษาไทย),
+                      stock_old (stock เดิม), stock_new (stock ใหม่ที่เก็บวันนี้),
+                      reason_code (รหัสเหตุผล ดู utils.reason_codes), reason_params (ตัวเลขของข้อความเหตุผล)
         """
         result = {
             'produce': 0,
@@ -81,7 +91,9 @@ class LatexDecisionEngine:
             'dispose': 0,
             'stock_old': current_stock,  # stock เดิมที่มีอยู่แล้ว
             'stock_new': 0,  # stock ใหม่ที่เก็บจากน้ำยางวันนี้
-            'reason': ''
+            'reason': '',
+            'reason_code': REASON_PRODUCE_ALL,
+            'reason_params': {},
         }
         
         # น้ำยางสดที่เข้ามาวันนี้
@@ -90,12 +102,16 @@ class LatexDecisionEngine:
         # คำนวณน้ำยางรวมทั้งหมด
         total_latex = available_fresh + current_stock
         
+        # ตัวเลขที่ใช้ในข้อความเหตุผล (เพิ่มตามกรณีด้านล่าง)
+        params = {'total': total_latex, 'current_stock': current_stock, 'R_today': available_fresh,
+                  'capacity': self.PRODUCTION_CAPACITY}
+        
         # กรณีที่ 1: น้ำยางรวม <= 60,000 กก. -> ผลิตหมดเลย
         if total_latex <= self.PRODUCTION_CAPACITY:
             result['produce'] = total_latex
             result['stock_old'] = 0  # ใช้ stock เดิมหมด
             result['stock_new'] = 0  # ไม่มี stock ใหม่
-            result['reason'] = f"น้ำยางรวม {total_latex:,.0f} กก. (Stock เดิม {current_stock:,.0f} + ใหม่ {available_fresh:,.0f}) น้อยกว่าหรือเท่ากับกำลังการผลิต → ผลิตหมด"
+            code = REASON_PRODUCE_ALL
             
         # กรณีที่ 2: 60,000 < น้ำยางรวม < 80,000 กก. -> ผลิต 60,000 (ใช้ stock เดิมก่อน)
         elif total_latex < 80000:
@@ -106,19 +122,19 @@ class LatexDecisionEngine:
                 # stock เดิมพอผลิต -> ใช้เฉพาะ stock เดิม
                 result['stock_old'] = current_stock - self.PRODUCTION_CAPACITY
                 result['stock_new'] = available_fresh  # น้ำยางใหม่ทั้งหมดกลายเป็น stock
-                result['reason'] = (f"น้ำยางรวม {total_latex:,.0f} กก. (Stock เดิม {current_stock:,.0f} + ใหม่ {available_fresh:,.0f}) → "
-                                  f"ผลิต {self.PRODUCTION_CAPACITY:,} กก. จาก Stock เดิม | "
-                                  f"Stock คงเหลือ: เดิม {result['stock_old']:,.0f} + ใหม่ {result['stock_new']:,.0f} = {result['stock_old'] + result['stock_new']:,.0f} กก.")
+                code = REASON_STOCK_COVERS
             else:
                 # stock เดิมไม่พอ -> ใช้ stock เดิมหมด + น้ำยางใหม่
                 result['stock_old'] = 0  # ใช้ stock เดิมหมด
                 used_fresh = self.PRODUCTION_CAPACITY - current_stock  # น้ำยางใหม่ที่ใช้ผลิต
                 remaining_fresh = available_fresh - used_fresh  # น้ำยางใหม่ที่เหลือ
+                params.update(used_fresh=used_fresh, remaining=remaining_fresh)
                 
                 # ตัดสินใจว่าจะเก็บหรือขายส่วนเกิน
                 if price_today_plus_5 is not None and remaining_fresh > 0:
                     # คำนวณจุดคุ้มทุนสำหรับการเก็บ 1 วัน
                     breakeven = self.calculate_breakeven_price(price_today_fresh, storage_days=1)
+                    params.update(price_plus_5=price_today_plus_5, breakeven=breakeven)
                     
                     if price_today_plus_5 >= breakeven:
                         # คุ้มค่าเก็บ - ตรวจสอบพื้นที่ว่าง
@@ -129,23 +145,14 @@ class LatexDecisionEngine:
                         
                         if remaining_fresh > space_available:
                             result['dispose'] = remaining_fresh - space_available
-                            result['reason'] = (f"น้ำยางรวม {total_latex:,.0f} กก. → ผลิต {self.PRODUCTION_CAPACITY:,} กก. "
-                                              f"(Stock เดิม {current_stock:,.0f} + ใหม่ {used_fresh:,.0f}) | "
-                                              f"ส่วนเกิน {remaining_fresh:,.0f} กก.: ราคาคุ้มทุน → เก็บใหม่ {can_hold:,.0f} กก., "
-                                              f"Stock เต็ม ขายทิ้ง {result['dispose']:,.0f} กก.")
+                            code = REASON_HOLD_STOCK_FULL
                         else:
-                            result['reason'] = (f"น้ำยางรวม {total_latex:,.0f} กก. → ผลิต {self.PRODUCTION_CAPACITY:,} กก. "
-                                              f"(Stock เดิม {current_stock:,.0f} + ใหม่ {used_fresh:,.0f}) | "
-                                              f"ส่วนเกิน {remaining_fresh:,.0f} กก.: ราคาคุ้มทุน ({price_today_plus_5:.2f} >= {breakeven:.2f} บาท) "
-                                              f"→ เก็บใหม่ {can_hold:,.0f} กก.")
+                            code = REASON_HOLD_PROFITABLE
                     else:
                         # ไม่คุ้มค่า ขายทิ้ง
                         result['dispose'] = remaining_fresh
                         result['stock_new'] = 0
-                        result['reason'] = (f"น้ำยางรวม {total_latex:,.0f} กก. → ผลิต {self.PRODUCTION_CAPACITY:,} กก. "
-                                          f"(Stock เดิม {current_stock:,.0f} + ใหม่ {used_fresh:,.0f}) | "
-                                          f"ส่วนเกิน {remaining_fresh:,.0f} กก.: ราคาไม่คุ้มทุน ({price_today_plus_5:.2f} < {breakeven:.2f} บาท) "
-                                          f"→ ขายทิ้ง {result['dispose']:,.0f} กก.")
+                        code = REASON_SELL_UNPROFITABLE
                 else:
                     # ไม่รู้ราคาอนาคต หรือไม่มีส่วนเกิน
                     if remaining_fresh > 0:
@@ -156,15 +163,11 @@ class LatexDecisionEngine:
                         
                         if remaining_fresh > space_available:
                             result['dispose'] = remaining_fresh - space_available
-                        
-                        result['reason'] = (f"น้ำยางรวม {total_latex:,.0f} กก. → ผลิต {self.PRODUCTION_CAPACITY:,} กก. "
-                                          f"(Stock เดิม {current_stock:,.0f} + ใหม่ {used_fresh:,.0f}) | "
-                                          f"ส่วนเกิน {remaining_fresh:,.0f} กก.: ไม่ทราบราคา → เก็บใหม่ {can_hold:,.0f} กก.")
-                        if result['dispose'] > 0:
-                            result['reason'] += f", ขายส่วนเกิน {result['dispose']:,.0f} กก."
+                            code = REASON_PRICE_UNKNOWN_STOCK_FULL
+                        else:
+                            code = REASON_HOLD_PRICE_UNKNOWN
                     else:
-                        result['reason'] = (f"น้ำยางรวม {total_latex:,.0f} กก. (Stock เดิม {current_stock:,.0f} + ใหม่ {available_fresh:,.0f}) → "
-                                          f"ผลิต {self.PRODUCTION_CAPACITY:,} กก. (ใช้หมด)")
+                        code = REASON_NO_EXCESS
         
         # กรณีที่ 3: น้ำยางรวม >= 80,000 กก. -> ผลิต 60,000 ขายส่วนเกินทิ้ง
         else:
@@ -193,13 +196,13 @@ class LatexDecisionEngine:
                 
                 result['stock_new'] = can_hold
                 result['dispose'] = remaining_fresh - can_hold
-            
-            result['reason'] = (f"น้ำยางรวม {total_latex:,.0f} กก. เกิน 80,000 → "
-                              f"ผลิต {self.PRODUCTION_CAPACITY:,} กก.")
-            if result['stock_new'] > 0:
-                result['reason'] += f", เก็บใหม่ {result['stock_new']:,.0f} กก."
-            if result['dispose'] > 0:
-                result['reason'] += f", ขายทิ้ง {result['dispose']:,.0f} กก."
+            code = REASON_OVER_LIMIT_STOCK_FULL if result['dispose'] > 0 else REASON_OVER_LIMIT
+        
+        params.update(stock_old=result['stock_old'], stock_new=result['stock_new'], dispose=result['dispose'],
+                      end_stock=result['stock_old'] + result['stock_new'])
+        result['reason_code'] = code
+        result['reason_params'] = params
+        result['reason'] = render_reason(code, params)
         
         return result
     
@@ -0,0 +1,137 @@
+"""
+DecisionFrame - ผลการตัดสินใจหลายวัน/หลายกรณีแบบ struct-of-arrays
+
+แต่ละคอลัมน์เป็น array ต่อเนื่องชนิดเดียว (float64 สำหรับปริมาณ/เงิน, uint8 สำหรับ reason_code)
+แทน list ของ dict ที่ใช้หน่วยความจำมากและ vectorize ไม่ได้
+
+- ใช้กับผลของ simulate, parallel_backtest และ batch_daily_decision (+ batch_costs_and_revenue) ได้เหมือนกัน
+- ตัดช่วงด้วย slice (frame[100:200]) ได้ view ไม่ copy ข้อมูล
+- to_pandas / to_arrow ใช้ buffer เดิม (ไม่ copy) และเขียนไฟล์ Arrow IPC/Feather สำหรับ notebook วิเคราะห์
+  (pyarrow เป็น optional - ต้องติดตั้งเฉพาะเมื่อใช้ Arrow)
+"""
+import numpy as np
+
+from utils.lazy import lazy_import
+from utils.reason_codes import REASON_DTYPE
+
+pd = lazy_import('pandas')
+
+# ชนิดของคอลัมน์ที่ไม่ใช่ float64
+COLUMN_DTYPES = {
+    'reason_code': REASON_DTYPE,
+    'branch': 'i1',
+    'region': 'u1',
+}
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.feather
+    except ImportError:
+        raise RuntimeError("ไม่ได้ติดตั้ง pyarrow - ติดตั้งด้วย pip install pyarrow เพื่อใช้ Arrow/Feather") from None
+    return pyarrow
+
+
+class DecisionFrame:
+    def __init__(self, columns):
+        """
+        Parameters:
+        - columns: dict ชื่อคอลัมน์ → array 1 มิติ ยาวเท่ากันทุกคอลัมน์
+          (แปลงเป็นชนิดตาม COLUMN_DTYPES / float64 - array ที่ชนิดและการเรียงถูกอยู่แล้วไม่ถูก copy)
+        """
+        self._columns = {}
+        length = None
+        for name, values in columns.items():
+            array = np.ascontiguousarray(values, dtype=COLUMN_DTYPES.get(name, 'f8'))
+            if array.ndim != 1:
+                raise ValueError(f"คอลัมน์ '{name}' ต้องเป็น array 1 มิติ")
+            if length is not None and len(array) != length:
+                raise ValueError(f"คอลัมน์ '{name}' ยาว {len(array)} แถว แต่คอลัมน์อื่นยาว {length} แถว")
+            length = len(array)
+            self._columns[name] = array
+        self._length = length or 0
+
+    @classmethod
+    def from_dict(cls, result, *extra):
+        """
+        สร้างจาก dict ผลลัพธ์ (simulate, parallel_backtest, batch_daily_decision, ...)
+        ค่าที่ไม่ใช่ array (เช่น repaired_days) ถูกข้าม, array หลายมิติ (grid) ถูกทำเป็น 1 มิติ
+
+        Parameters:
+        - extra: dict ผลลัพธ์อื่นที่มีจำนวนแถวเท่ากัน เช่น ผลของ batch_costs_and_revenue
+        """
+        columns = {}
+        for part in (result, *extra):
+            for name, values in part.items():
+                if isinstance(values, np.ndarray):
+                    columns[name] = values.ravel()
+        return cls(columns)
+
+    @classmethod
+    def concat(cls, frames):
+        """ต่อหลาย frame ที่มีคอลัมน์เดียวกัน (copy ข้อมูลครั้งเดียว)"""
+        frames = list(frames)
+        names = frames[0].columns
+        return cls({name: np.concatenate([frame[name] for frame in frames]) for name in names})
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    @property
+    def nbytes(self):
+        return sum(array.nbytes for array in self._columns.values())
+
+    def __len__(self):
+        return self._length
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def __getitem__(self, key):
+        """
+        - ชื่อคอลัมน์ → array ของคอลัมน์นั้น
+        - slice → DecisionFrame ที่เป็น view ของข้อมูลเดิม (step ≠ 1 ยังเป็น view แต่ไม่ต่อเนื่อง)
+        - bool mask / array ของตำแหน่ง → DecisionFrame ใหม่ (copy)
+        """
+        if isinstance(key, str):
+            return self._columns[key]
+        if isinstance(key, slice):
+            frame = DecisionFrame.__new__(DecisionFrame)
+            frame._columns = {name: array[key] for name, array in self._columns.items()}
+            frame._length = len(range(*key.indices(self._length)))
+            return frame
+        return DecisionFrame({name: array[key] for name, array in self._columns.items()})
+
+    def with_columns(self, **columns):
+        """frame ใหม่ที่เพิ่ม/แทนคอลัมน์ (คอลัมน์เดิมใช้ array เดิม ไม่ copy)"""
+        return DecisionFrame({**self._columns, **columns})
+
+    def __repr__(self):
+        return f"DecisionFrame({self._length:,} แถว, คอลัมน์: {', '.join(self._columns)})"
+
+    def to_pandas(self):
+        """DataFrame ที่ใช้ array เดิม (ไม่ copy ตอนสร้าง)"""
+        return pd.DataFrame(self._columns, copy=False)
+
+    def to_arrow(self):
+        """pyarrow.Table ที่ใช้ buffer เดิม (ไม่ copy)"""
+        pa = _pyarrow()
+        return pa.Table.from_arrays([pa.array(array) for array in self._columns.values()],
+                                    names=list(self._columns))
+
+    def write_feather(self, path, compression='uncompressed'):
+        """
+        เขียนไฟล์ Arrow IPC (Feather v2)
+        ค่าเริ่มต้นไม่บีบอัด - เปิดด้วย read_feather / pyarrow แบบ memory-map ได้โดยไม่ copy
+        """
+        pa = _pyarrow()
+        pa.feather.write_feather(self.to_arrow(), path, compression=compression)
+
+    @classmethod
+    def read_feather(cls, path):
+        """อ่านไฟล์ Feather แบบ memory-map (ไฟล์ที่ไม่บีบอัดจะไม่ถูก copy เข้าหน่วยความจำ)"""
+        pa = _pyarrow()
+        table = pa.feather.read_table(path, memory_map=True)
+        return cls({name: table.column(name).to_numpy() for name in table.column_names})
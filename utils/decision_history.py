@@ -0,0 +1,71 @@
+"""
+ประวัติการตัดสินใจของ session (ring buffer ขนาดคงที่)
+
+เก็บเป็น structured array ของ NumPy แถวละไม่กี่สิบไบต์ - เมื่อเต็มจะเขียนทับรายการเก่าสุด
+หน่วยความจำต่อ session จึงคงที่ไม่ว่าจะกดวิเคราะห์กี่ครั้ง
+"""
+import time
+
+import numpy as np
+
+# ราคาที่ไม่ทราบเก็บเป็น NaN
+# ปริมาณ (กก.) เก็บเป็น f4 ได้ แต่จำนวนเงิน (ราคา/กำไร) ต้องเป็น f8 - f4 ละเอียดแค่ ~7 หลัก
+# กำไรหลักล้านบาทจะเสียหลักสตางค์
+HISTORY_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('R_today', 'f4'),
+    ('current_stock', 'f4'),
+    ('price_today_fresh', 'f8'),
+    ('price_today_plus_4', 'f8'),
+    ('price_today_plus_5', 'f8'),
+    ('produce', 'f4'),
+    ('stock_old', 'f4'),
+    ('stock_new', 'f4'),
+    ('dispose', 'f4'),
+    ('profit', 'f8'),
+    ('reason_code', 'u1'),  # utils.reason_codes
+])
+
+
+class DecisionHistory:
+    def __init__(self, capacity=100):
+        self.capacity = capacity
+        self._records = np.zeros(capacity, dtype=HISTORY_DTYPE)
+        self._next = 0  # ตำแหน่งที่จะเขียนถัดไป
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def nbytes(self):
+        return self._records.nbytes
+
+    def append(self, R_today, current_stock, price_today_fresh, price_today_plus_4,
+               price_today_plus_5, decision, profit=None):
+        """บันทึกการตัดสินใจ 1 รายการ (O(1) - เขียนทับรายการเก่าสุดเมื่อเต็ม)"""
+        record = self._records[self._next]
+        record['timestamp'] = time.time()
+        record['R_today'] = R_today
+        record['current_stock'] = current_stock
+        record['price_today_fresh'] = price_today_fresh
+        record['price_today_plus_4'] = np.nan if price_today_plus_4 is None else price_today_plus_4
+        record['price_today_plus_5'] = np.nan if price_today_plus_5 is None else price_today_plus_5
+        record['produce'] = decision['produce']
+        record['stock_old'] = decision['stock_old']
+        record['stock_new'] = decision['stock_new']
+        record['dispose'] = decision['dispose']
+        record['profit'] = np.nan if profit is None else profit
+        record['reason_code'] = decision['reason_code']
+
+        self._next = (self._next + 1) % self.capacity
+        self._count = min(self._count + 1, self.capacity)
+
+    def records(self):
+        """คืนรายการทั้งหมดเรียงจากใหม่ไปเก่า"""
+        order = (self._next - 1 - np.arange(self._count)) % self.capacity
+        return self._records[order]
+
+    def clear(self):
+        self._next = 0
+        self._count = 0
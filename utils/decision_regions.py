@@ -0,0 +1,204 @@
+"""
+ตารางช่วงการตัดสินใจ (decision region table) ที่ compile ไว้ล่วงหน้า
+
+การตัดสินใจของ daily_decision เป็นฟังก์ชันเชิงเส้นเป็นช่วง ๆ ของน้ำยางรวม (R_today + current_stock)
+โดยมีจุดแบ่งที่ PRODUCTION_CAPACITY, PRODUCTION_CAPACITY + MAX_STOCK และ 80,000 กก.
+และมีเงื่อนไขย่อย 2 ข้อ: stock เดิมพอผลิตเต็มกำลังหรือไม่ และราคาวันที่ +5 ผ่านจุดคุ้มทุนหรือไม่
+
+compile_regions() แปลงค่าคงที่ของ engine เป็นตาราง:
+- breakpoints: จุดแบ่งของน้ำยางรวม (เรียงจากน้อยไปมาก, เงื่อนไข "น้ำยางรวม > จุดแบ่ง")
+- coefficients[ช่วง, stock พอ, ราคาผ่าน, ผลลัพธ์] = (ค่าคงที่, สัมประสิทธิ์ R_today, สัมประสิทธิ์ current_stock)
+
+การค้นหาจึงเหลือแค่ np.searchsorted + การคูณบวก แทน if ซ้อนกันหลายชั้น
+(ผลตรงกับ daily_decision ทุกหลักเมื่อปริมาณน้ำยางเป็นจำนวนเต็ม กก.)
+"""
+import json
+from functools import lru_cache
+
+import numpy as np
+
+from utils.daily_decision import LatexDecisionEngine
+
+# กรณีการตัดสินใจ (ใช้ทำ heatmap / สรุปผล)
+BRANCH_PRODUCE_ALL = 0  # น้ำยางรวม <= กำลังการผลิต → ผลิตหมด
+BRANCH_HOLD = 1  # ผลิตเต็มกำลัง ส่วนเกินเก็บเข้า stock (ราคาคุ้มทุนหรือไม่ทราบราคา)
+BRANCH_SELL_EXCESS = 2  # ผลิตเต็มกำลัง ส่วนเกินขายทิ้ง (ราคาไม่คุ้มทุน)
+BRANCH_OVER_LIMIT = 3  # น้ำยางรวม >= 80,000 → ผลิตเต็มกำลัง เก็บเต็ม stock ขายที่เหลือ
+
+BRANCH_LABELS = {
+    BRANCH_PRODUCE_ALL: 'produce all',
+    BRANCH_HOLD: 'produce + hold excess',
+    BRANCH_SELL_EXCESS: 'produce + sell excess',
+    BRANCH_OVER_LIMIT: 'over 80,000: hold + sell',
+}
+
+# ลำดับผลลัพธ์ในตาราง
+OUTPUTS = ('produce', 'stock_old', 'stock_new', 'dispose')
+
+# เกณฑ์น้ำยางรวมที่ต้องขายส่วนเกิน (ค่าเดียวกับใน daily_decision)
+OVER_LIMIT_TOTAL = 80000
+
+
+def _region_formulas(case, covers, hold_ok, overflow, capacity, max_stock):
+    """
+    สูตรเชิงเส้นของแต่ละช่วง (ตาม logic ของ daily_decision)
+
+    Returns:
+    - (branch, [(c, a_R, a_S) สำหรับ produce, stock_old, stock_new, dispose])
+    """
+    zero = (0.0, 0.0, 0.0)
+    remaining = (-capacity, 1.0, 1.0)  # น้ำยางใหม่ที่เหลือหลังผลิต = R + S - CAP
+
+    # กรณีที่ 1: ผลิตหมด
+    if case == 1:
+        return BRANCH_PRODUCE_ALL, [(0.0, 1.0, 1.0), zero, zero, zero]
+
+    produce = (float(capacity), 0.0, 0.0)
+
+    # กรณีที่ 2: 60,000 < น้ำยางรวม < 80,000
+    if case == 2:
+        if covers:
+            # stock เดิมพอผลิต - น้ำยางใหม่ทั้งหมดกลายเป็น stock
+            return BRANCH_HOLD, [produce, (-capacity, 0.0, 1.0), (0.0, 1.0, 0.0), zero]
+        if not hold_ok:
+            # ราคาไม่คุ้มทุน - ขายส่วนเกินทิ้ง
+            return BRANCH_SELL_EXCESS, [produce, zero, zero, remaining]
+        if overflow:
+            return BRANCH_HOLD, [produce, zero, (float(max_stock), 0.0, 0.0),
+                                 (-capacity - max_stock, 1.0, 1.0)]
+        return BRANCH_HOLD, [produce, zero, remaining, zero]
+
+    # กรณีที่ 3: น้ำยางรวม >= 80,000
+    if covers:
+        stock_old = (-capacity, 0.0, 1.0)
+        if overflow:
+            # เก็บได้เท่าที่เหลือที่ว่าง = MAX_STOCK - (S - CAP)
+            return BRANCH_OVER_LIMIT, [produce, stock_old, (capacity + max_stock, 0.0, -1.0),
+                                       (-capacity - max_stock, 1.0, 1.0)]
+        return BRANCH_OVER_LIMIT, [produce, stock_old, (0.0, 1.0, 0.0), zero]
+    if overflow:
+        return BRANCH_OVER_LIMIT, [produce, zero, (float(max_stock), 0.0, 0.0),
+                                   (-capacity - max_stock, 1.0, 1.0)]
+    return BRANCH_OVER_LIMIT, [produce, zero, remaining, zero]
+
+
+class DecisionRegionTable:
+    """ตารางช่วงการตัดสินใจที่ compile แล้ว (ใช้ค้นหาได้ทั้งค่าเดียวและทั้ง array)"""
+
+    def __init__(self, config, breakpoints, coefficients, branches,
+                 transport_cost_per_kg, hold_cost_per_kg):
+        self.config = dict(config)
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.coefficients = np.asarray(coefficients, dtype=float)
+        self.branches = np.asarray(branches, dtype=np.int8)
+        self.transport_cost_per_kg = transport_cost_per_kg
+        self.hold_cost_per_kg = hold_cost_per_kg
+
+    @property
+    def capacity(self):
+        return self.config['PRODUCTION_CAPACITY']
+
+    def breakeven_price(self, price_today_fresh):
+        """ราคาคุ้มทุนสำหรับเก็บ 1 วัน (สูตรเดียวกับ calculate_breakeven_price)"""
+        return (price_today_fresh - self.transport_cost_per_kg) + self.hold_cost_per_kg
+
+    def lookup(self, R_today, current_stock, price_today_fresh, price_today_plus_5=None):
+        """
+        ค้นหาการตัดสินใจจากตาราง
+
+        Parameters:
+        - R_today, current_stock, price_today_fresh: ค่าเดียวหรือ array (broadcast ได้)
+        - price_today_plus_5: ค่าเดียว, array หรือ None (NaN = ไม่ทราบราคา)
+
+        Returns:
+        - dict ของ array: produce, hold, dispose, stock_old, stock_new, branch, region
+        """
+        R_today = np.asarray(R_today, dtype=float)
+        current_stock = np.asarray(current_stock, dtype=float)
+        price_today_fresh = np.asarray(price_today_fresh, dtype=float)
+        price_today_plus_5 = np.asarray(np.nan if price_today_plus_5 is None else price_today_plus_5,
+                                        dtype=float)
+        R_today, current_stock, price_today_fresh, price_today_plus_5 = np.broadcast_arrays(
+            R_today, current_stock, price_today_fresh, price_today_plus_5)
+
+        segment = np.searchsorted(self.breakpoints, R_today + current_stock, side='left')
+        covers = (current_stock >= self.capacity).astype(np.intp)
+        with np.errstate(invalid='ignore'):
+            hold_ok = (np.isnan(price_today_plus_5)
+                       | (price_today_plus_5 >= self.breakeven_price(price_today_fresh))).astype(np.intp)
+
+        coef = self.coefficients[segment, covers, hold_ok]
+        values = coef[..., 0] + coef[..., 1] * R_today[..., None] + coef[..., 2] * current_stock[..., None]
+
+        result = {name: values[..., i] for i, name in enumerate(OUTPUTS)}
+        result['hold'] = np.zeros_like(result['produce'])
+        result['branch'] = self.branches[segment, covers, hold_ok]
+        result['region'] = (segment * 4 + covers * 2 + hold_ok).astype(np.uint8)
+        return result
+
+    def to_dict(self):
+        """แปลงเป็น dict ที่ serialize เป็น JSON ได้"""
+        return {
+            'config': self.config,
+            'breakpoints': self.breakpoints.tolist(),
+            'coefficients': self.coefficients.tolist(),
+            'branches': self.branches.tolist(),
+            'transport_cost_per_kg': self.transport_cost_per_kg,
+            'hold_cost_per_kg': self.hold_cost_per_kg,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['config'], data['breakpoints'], data['coefficients'], data['branches'],
+                   data['transport_cost_per_kg'], data['hold_cost_per_kg'])
+
+    def to_json(self):
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text):
+        return cls.from_dict(json.loads(text))
+
+
+@lru_cache(maxsize=64)
+def _compile(config_items):
+    engine = LatexDecisionEngine()
+    for name, value in config_items:
+        setattr(engine, name, value)
+    capacity = engine.PRODUCTION_CAPACITY
+    max_stock = engine.MAX_STOCK
+
+    # จุดแบ่ง (เงื่อนไข total > b): "total >= 80,000" เขียนเป็น total > ค่าก่อนหน้า 80,000
+    limit = np.nextafter(float(OVER_LIMIT_TOTAL), -np.inf)
+    breakpoints = np.sort(np.array([capacity, capacity + max_stock, max(limit, capacity)], dtype=float))
+
+    n_segments = len(breakpoints) + 1
+    coefficients = np.zeros((n_segments, 2, 2, len(OUTPUTS), 3))
+    branches = np.zeros((n_segments, 2, 2), dtype=np.int8)
+
+    for segment in range(n_segments):
+        # ค่าตัวแทนของช่วง (ขอบบนของช่วง, ช่วงสุดท้ายใช้ค่าที่มากกว่าจุดแบ่งสุดท้าย)
+        total = breakpoints[segment] if segment < len(breakpoints) else breakpoints[-1] + 1
+        if total <= capacity:
+            case = 1
+        elif total < OVER_LIMIT_TOTAL:
+            case = 2
+        else:
+            case = 3
+        overflow = total > capacity + max_stock
+        for covers in (0, 1):
+            for hold_ok in (0, 1):
+                branch, formulas = _region_formulas(case, covers, hold_ok, overflow, capacity, max_stock)
+                branches[segment, covers, hold_ok] = branch
+                coefficients[segment, covers, hold_ok] = formulas
+
+    return DecisionRegionTable(
+        dict(config_items), breakpoints, coefficients, branches,
+        transport_cost_per_kg=engine.TRANSPORT_COST_PER_20K / 20000,
+        hold_cost_per_kg=engine.calculate_storage_cost(1) + engine.PRODUCTION_COST,
+    )
+
+
+def compile_regions(engine):
+    """compile ตารางช่วงการตัดสินใจของ engine (cache ไว้ต่อชุดค่าคงที่)"""
+    return _compile(tuple(sorted(engine.get_config().items())))
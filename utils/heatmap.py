@@ -0,0 +1,74 @@
+"""
+วาด heatmap ผลการตัดสินใจและกำไร (What-if) เป็นไฟล์ PNG
+
+ใช้ backend Agg และ Figure โดยตรง (ไม่ใช้ pyplot) เพื่อให้วาดพร้อมกันหลาย session ได้
+"""
+import io
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib.colors import BoundaryNorm, ListedColormap
+from matplotlib.figure import Figure
+import numpy as np
+
+from utils.decision_regions import BRANCH_LABELS
+
+BRANCH_COLORS = ['#22c55e', '#3b82f6', '#f59e0b', '#dc2626']
+
+
+def _draw_boundaries(ax, x, y, branch):
+    """ลากเส้นแบ่งระหว่างกรณีการตัดสินใจ"""
+    if np.unique(branch).size > 1:
+        ax.contour(x, y, branch, levels=np.arange(len(BRANCH_LABELS) - 1) + 0.5,
+                   colors='black', linewidths=1.2)
+
+
+def _to_png(fig):
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=110, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+def render_branch_heatmap(x, y, branch, xlabel, ylabel):
+    """
+    วาด heatmap กรณีการตัดสินใจ
+
+    Parameters:
+    - x, y: ค่าแกน (1-D)
+    - branch: array (len(y), len(x)) ของรหัสกรณีจาก batch_daily_decision
+
+    Returns:
+    - PNG bytes
+    """
+    fig = Figure(figsize=(7, 5))
+    ax = fig.add_subplot()
+    cmap = ListedColormap(BRANCH_COLORS)
+    norm = BoundaryNorm(np.arange(len(BRANCH_COLORS) + 1) - 0.5, cmap.N)
+    mesh = ax.pcolormesh(x, y, branch, cmap=cmap, norm=norm, shading='nearest')
+    _draw_boundaries(ax, x, y, branch)
+    colorbar = fig.colorbar(mesh, ax=ax, ticks=list(BRANCH_LABELS))
+    colorbar.ax.set_yticklabels(list(BRANCH_LABELS.values()))
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title('Decision')
+    return _to_png(fig)
+
+
+def render_profit_heatmap(x, y, profit, branch, xlabel, ylabel):
+    """
+    วาด heatmap กำไร (บาท) พร้อมเส้นแบ่งกรณีการตัดสินใจ
+
+    Returns:
+    - PNG bytes
+    """
+    fig = Figure(figsize=(7, 5))
+    ax = fig.add_subplot()
+    limit = np.nanmax(np.abs(profit)) if np.isfinite(profit).any() else 0.0
+    limit = limit or 1.0
+    mesh = ax.pcolormesh(x, y, profit, cmap='RdYlGn', vmin=-limit, vmax=limit, shading='nearest')
+    _draw_boundaries(ax, x, y, branch)
+    fig.colorbar(mesh, ax=ax, label='Profit (THB)')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title('Profit')
+    return _to_png(fig)
@@ -0,0 +1,102 @@
+"""
+เลือกจำนวนวันเก็บที่ดีที่สุดของน้ำยางแต่ละล็อต จากเส้นราคาแผ่นยางหลายวันข้างหน้า
+
+daily_decision เทียบเฉพาะราคาวันที่ +5 กับราคาคุ้มทุนของการเก็บ 1 วัน - ที่นี่พิจารณาทุกวันผลิต
+ตั้งแต่วันนี้จนครบ MAX_STORAGE_DAYS แล้วเลือกวันที่ได้กำไรส่วนเพิ่ม (เทียบกับขายน้ำยางสดวันนี้) สูงสุด
+
+เส้นราคา price_curve[j] = ราคาแผ่นยางของน้ำยางที่นำไปผลิตในอีก j วัน (j = 0..MAX_STORAGE_DAYS)
+เช่น price_curve[1] คือราคาวันที่ +5 เมื่อ PRODUCTION_DAYS = 4 (NaN = ไม่ทราบราคา ไม่นำมาพิจารณา)
+
+กำไรส่วนเพิ่มต่อ กก. ของการผลิตในอีก j วัน สำหรับล็อตที่เก็บมาแล้ว age วัน
+    = price_curve[j] - (ค่าเก็บสะสม[age + j] - ค่าเก็บสะสม[age]) - PRODUCTION_COST
+      - (ราคาน้ำยางสด - ค่าขนส่งต่อ กก.)
+ค่าเก็บสะสมใช้เส้นที่คำนวณไว้แล้ว (storage_cost_curve) และเลือกด้วย argmax ทีละหลายล็อตพร้อมกัน
+"""
+import numpy as np
+
+from utils.breakeven import storage_cost_curve
+from utils.reason_codes import HOLDING_REASONS, render_holding_reason
+
+# ผลการเลือก
+ACTION_SELL = 0  # ขายน้ำยางสดวันนี้ (ไม่มีวันผลิตไหนคุ้ม)
+ACTION_PRODUCE = 1  # ผลิตในวันที่เลือก
+
+
+def plan_holding(engine, price_curve, price_today_fresh, lot_ages=0, min_days=0):
+    """
+    เลือกวันผลิตของแต่ละล็อต
+
+    Parameters:
+    - price_curve: array ขนาด (MAX_STORAGE_DAYS + 1,) ใช้ร่วมกันทุกล็อต หรือ (จำนวนล็อต, MAX_STORAGE_DAYS + 1)
+    - price_today_fresh: ราคาน้ำยางสดวันนี้ (ค่าเสียโอกาสของการไม่ขายสด) ค่าเดียวหรือต่อล็อต
+    - lot_ages: จำนวนวันที่แต่ละล็อตเก็บมาแล้ว (ค่าเดียวหรือต่อล็อต)
+    - min_days: จำนวนวันรอขั้นต่ำ (เช่น 1 สำหรับส่วนเกินที่ผลิตวันนี้ไม่ได้แล้ว)
+
+    Returns:
+    - dict ของ array ต่อล็อต: action, wait_days (วันที่รอก่อนผลิต, -1 ถ้าขายสด), margin_per_kg
+      (กำไรส่วนเพิ่มของวันที่เลือก, ติดลบได้ถ้าขายสดคุ้มกว่า)
+    """
+    storage = storage_cost_curve(engine)
+    horizon = len(storage)
+    price_curve = np.asarray(price_curve, dtype=float)
+    if price_curve.shape[-1] != horizon:
+        raise ValueError(f"เส้นราคาต้องมี {horizon} วัน (0..MAX_STORAGE_DAYS) แต่ได้ {price_curve.shape[-1]} วัน")
+
+    lot_ages = np.asarray(lot_ages, dtype=np.intp)
+    price_today_fresh = np.asarray(price_today_fresh, dtype=float)
+    shape = np.broadcast_shapes(price_curve.shape[:-1], lot_ages.shape, price_today_fresh.shape)
+    lot_ages = np.broadcast_to(lot_ages, shape)
+    price_today_fresh = np.broadcast_to(price_today_fresh, shape)
+
+    # ค่าเก็บส่วนเพิ่มของการรอ j วัน (ตัดวันที่เกิน MAX_STORAGE_DAYS ออก)
+    wait = np.arange(horizon)
+    total_days = lot_ages[..., None] + wait
+    allowed = (total_days < horizon) & (wait >= min_days)
+    extra_storage = storage[np.minimum(total_days, horizon - 1)] - storage[np.minimum(lot_ages, horizon - 1)][..., None]
+
+    opportunity = price_today_fresh - engine.TRANSPORT_COST_PER_20K / 20000
+    margin = price_curve - extra_storage - engine.PRODUCTION_COST - opportunity[..., None]
+    margin = np.where(allowed & ~np.isnan(margin), margin, -np.inf)
+
+    best = np.argmax(margin, axis=-1)
+    best_margin = np.take_along_axis(margin, best[..., None], axis=-1)[..., 0]
+    produce = best_margin >= 0
+    return {
+        'action': np.where(produce, ACTION_PRODUCE, ACTION_SELL).astype(np.uint8),
+        'wait_days': np.where(np.isfinite(best_margin), best, -1),
+        'margin_per_kg': np.where(np.isfinite(best_margin), best_margin, np.nan),
+    }
+
+
+def holding_daily_decision(engine, R_today, current_stock, price_today_fresh, price_curve, price_today_plus_4=None):
+    """
+    daily_decision แบบใช้เส้นราคา: ส่วนเกินที่ต้องรอผลิต (รออย่างน้อย 1 วัน) จะเก็บถ้ามีวันผลิตที่คุ้มกว่าขายสด
+
+    Returns:
+    - dict เหมือน daily_decision และเพิ่ม hold_days (วันที่ควรรอก่อนผลิต, -1 ถ้าควรขายสด)
+      และ hold_margin_per_kg (กำไรส่วนเพิ่มต่อ กก. ของการเก็บตามแผน)
+      reason_params['price_plus_5'] เป็นราคาจริงของวันที่ +5 (price_curve[1], NaN ถ้าไม่ทราบ)
+    """
+    plan = plan_holding(engine, price_curve, price_today_fresh, lot_ages=0, min_days=1)
+    margin = float(plan['margin_per_kg'])
+    if np.isnan(margin):
+        # ไม่ทราบราคาวันใดเลย - ใช้กติกาเดิมของกรณีไม่ทราบราคา
+        price_equivalent = None
+    else:
+        # ราคาวันที่ +5 ที่ให้ผลการตัดสินใจเดียวกับแผน (ผ่านจุดคุ้มทุนเมื่อกำไรส่วนเพิ่ม >= 0)
+        price_equivalent = engine.calculate_breakeven_price(price_today_fresh, storage_days=1) + margin
+
+    result = engine.daily_decision(R_today, current_stock, price_today_fresh, price_today_plus_4, price_equivalent)
+    result['hold_days'] = int(plan['wait_days']) if plan['action'] == ACTION_PRODUCE else -1
+    result['hold_margin_per_kg'] = margin
+
+    # price_equivalent เป็นราคาสมมติสำหรับเลือกกรณี - ข้อความ/params ต้องใช้ราคาจริงและผลของแผน
+    params = result['reason_params']
+    if 'price_plus_5' in params:
+        params['price_plus_5'] = float(np.asarray(price_curve, dtype=float)[1])
+    params.update(hold_days=result['hold_days'], hold_margin_per_kg=margin)
+    result['reason'] = render_holding_reason(result['reason_code'], params)
+    if result['reason_code'] not in HOLDING_REASONS and result['stock_new'] > 0 and result['hold_days'] > 0:
+        result['reason'] += (f" | แผนการเก็บ: ผลิตในอีก {result['hold_days']} วัน "
+                             f"(กำไรส่วนเพิ่ม {margin:.2f} บาท/กก. เทียบกับขายสด)")
+    return result
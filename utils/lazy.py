@@ -0,0 +1,50 @@
+"""
+import แบบ lazy - module จะถูก import จริงเมื่อมีการใช้งานครั้งแรก
+
+ใช้กับ module ที่หนัก (pandas, matplotlib, openpyxl) ที่ใช้เฉพาะบางส่วนของหน้า
+เพื่อให้หน้าเว็บเปิดครั้งแรก (cold start) ได้เร็วขึ้น
+
+ตัวอย่าง:
+    pd = lazy_import('pandas')
+    ...
+    df = pd.DataFrame(...)  # import pandas ตรงนี้
+"""
+import importlib
+import sys
+
+
+class LazyModule:
+    def __init__(self, name):
+        self.__dict__['_name'] = name
+        self.__dict__['_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_module']
+        if module is None:
+            module = importlib.import_module(self.__dict__['_name'])
+            self.__dict__['_module'] = module
+        return module
+
+    @property
+    def is_loaded(self):
+        return self.__dict__['_module'] is not None or self.__dict__['_name'] in sys.modules
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __setattr__(self, attr, value):
+        setattr(self._load(), attr, value)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.is_loaded else 'not loaded'
+        return f"<lazy module '{self.__dict__['_name']}' ({state})>"
+
+
+def lazy_import(name):
+    """คืน module ที่ import ไว้แล้ว หรือ proxy ที่จะ import เมื่อใช้ครั้งแรก"""
+    if name in sys.modules:
+        return sys.modules[name]
+    return LazyModule(name)
@@ -0,0 +1,168 @@
+"""
+backtest ยาวหลายปีแบบขนาน โดยเดา stock ตั้งต้นของแต่ละช่วงล่วงหน้า (speculative)
+
+stock ของวันถัดไปขึ้นกับวันก่อนหน้า แต่เส้นทางของ stock ที่เริ่มต่างกันจะมาบรรจบกันเร็ว
+(เช่น วันที่น้ำยางรวมไม่เกินกำลังการผลิต stock จะเหลือ 0 ไม่ว่าเริ่มจากเท่าไร
+หรือวันที่ส่วนเกินเกิน MAX_STOCK จะเก็บเต็ม MAX_STOCK) จึงทำได้ดังนี้:
+
+1. แบ่งช่วงเวลาเป็น chunk แล้วให้ worker จำลองทุก chunk พร้อมกันจาก stock ตั้งต้นที่เดาไว้ค่าเดียว
+   (ค่าเริ่มต้น 0) - chunk แรกใช้ stock จริง งานรวมจึงใกล้เคียง serial บวกช่วงที่ต้องซ่อม
+2. ต่อผลทีละ chunk (scan): เมื่อรู้ stock จริงตอนต้น chunk ให้จำลองต่อจาก stock จริงเฉพาะช่วงต้น
+   จนกว่า stock จะตรงกับเส้นทางที่เดาไว้ - หลังจากนั้นผลเหมือนกันทุกค่า จึงใช้ผลที่เดาไว้ได้เลย
+
+ผลลัพธ์จึงตรงกับการรัน simulate() ทีละวันทุกค่า
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.reason_codes import reason_codes
+from utils.result_cache import cache_key, data_fingerprint
+from utils.simulation import OUTPUTS, _as_days, simulate
+
+
+# ค่าใช้จ่ายคงที่ของ pool ต่อ process (สร้าง + ส่งงาน + ปิด) วัดด้วย benchmarks/bench_parallel_backtest.py
+# บนเครื่อง 1 CPU ได้ ~5 ms - ค่านี้ไม่ได้เป็นจุดคุ้มทุน ใช้ร่วมกับเวลาต่อวันที่วัดจากช่วง probe
+# เพื่อประมาณว่าแบบขนานจะประหยัดเวลาได้มากกว่าค่าใช้จ่ายนี้หรือไม่ (ดู _worth_parallel)
+POOL_SECONDS_PER_WORKER = 0.005
+
+# จำนวนวันแรกที่จำลองแบบ serial เพื่อวัดเวลาต่อวัน (ผลใช้ต่อได้ จึงไม่เสียงานเปล่า)
+PROBE_DAYS = 1000
+
+
+def _worth_parallel(seconds_per_day, days, workers):
+    """เวลาที่คาดว่าจะประหยัดได้จากการแบ่ง days วันให้ workers process มากกว่าค่าใช้จ่ายของ pool หรือไม่"""
+    saved = seconds_per_day * days * (1 - 1 / workers)
+    return saved > POOL_SECONDS_PER_WORKER * workers
+
+
+def _run_speculative(config, R_today, price_fresh, price_plus_4, price_plus_5, starts):
+    """worker: จำลอง chunk หนึ่งจาก stock ตั้งต้นแต่ละค่าใน starts"""
+    engine = LatexDecisionEngine()
+    for name, value in config.items():
+        setattr(engine, name, value)
+    return [simulate(engine, R_today, price_fresh, price_plus_4, price_plus_5, start) for start in starts]
+
+
+def _end_stock(result):
+    return result['stock_old'][-1] + result['stock_new'][-1]
+
+
+def _concat(parts):
+    """ต่อผลของหลายช่วงเวลาที่อยู่ติดกัน"""
+    return {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+
+
+def _repair(engine, inputs, stock, speculative, window=16):
+    """
+    จำลองจาก stock จริงจนบรรจบกับเส้นทางที่เดาไว้
+
+    Returns:
+    - (ผลของ chunk, จำนวนวันที่ต้องจำลองใหม่)
+    """
+    days = len(inputs[0])
+    result = {name: np.empty(days) for name in OUTPUTS}
+    position = 0
+    while position < days:
+        end = min(position + window, days)
+        part = simulate(engine, *[values[position:end] for values in inputs], initial_stock=stock)
+        for guess in speculative:
+            match = np.flatnonzero(part['current_stock'] == guess['current_stock'][position:end])
+            if match.size:
+                # stock ตรงกันที่วัน position + k - ตั้งแต่วันนั้นผลเหมือนที่เดาไว้
+                k = match[0]
+                for name in OUTPUTS:
+                    result[name][position:position + k] = part[name][:k]
+                    result[name][position + k:] = guess[name][position + k:]
+                return result, position + k
+        for name in OUTPUTS:
+            result[name][position:end] = part[name]
+        stock = _end_stock(part)
+        position = end
+        window *= 2
+    return result, days
+
+
+def parallel_backtest(engine, R_today, price_today_fresh, price_plus_4=None, price_plus_5=None,
+                      initial_stock=0, workers=None, chunk_days=None, candidates=None, min_days=None, cache=None):
+    """
+    backtest แบบขนาน (ผลเหมือน simulate() ทุกค่า)
+
+    Parameters:
+    - engine, R_today, price_today_fresh, price_plus_4, price_plus_5, initial_stock: เหมือน simulate()
+    - workers: จำนวน process (None = จำนวน CPU, 1 = serial)
+    - chunk_days: จำนวนวันต่อ chunk (None = แบ่งเท่า ๆ กันตาม workers)
+    - candidates: stock ตั้งต้นที่เดาไว้ของแต่ละ chunk (None = 0 ค่าเดียว)
+    - min_days: None = จำลอง PROBE_DAYS วันแรกแบบ serial เพื่อวัดเวลาต่อวัน แล้วรันส่วนที่เหลือแบบขนาน
+      เฉพาะเมื่อคาดว่าจะเร็วกว่า, ตัวเลข = ใช้แบบขนานเมื่อมีอย่างน้อยเท่านี้วัน (0 = บังคับขนาน)
+    - cache: ResultCache (None = ไม่ใช้) - key มาจากค่าคงที่ของ engine, initial_stock และข้อมูลรายวัน
+      (วิธีแบ่งงานไม่อยู่ใน key เพราะไม่ทำให้ผลต่าง)
+
+    Returns:
+    - dict ของ array รายวันเหมือน simulate() และ repaired_days (จำนวนวันที่ต้องจำลองใหม่ตอนต่อผล)
+    """
+    R_today = np.asarray(R_today, dtype=float)
+    days = len(R_today)
+    inputs = (R_today, _as_days(price_today_fresh, days), _as_days(price_plus_4, days),
+              _as_days(price_plus_5, days))
+    if cache is not None:
+        key = cache_key({'function': 'parallel_backtest', 'engine': engine.get_config(),
+                         'initial_stock': initial_stock}, data_fingerprint(*inputs))
+        result = cache.get_or_compute(key, lambda: parallel_backtest(
+            engine, *inputs, initial_stock, workers, chunk_days, candidates, min_days))
+        result['repaired_days'] = int(result['repaired_days'])
+        return result
+
+    workers = workers or os.cpu_count() or 1
+    candidates = tuple(candidates) if candidates is not None else (0.0,)
+
+    parts = []
+    offset = 0
+    if min_days is None:
+        offset = min(days, PROBE_DAYS)
+        started = time.perf_counter()
+        parts.append(simulate(engine, *[values[:offset] for values in inputs], initial_stock=initial_stock))
+        seconds_per_day = (time.perf_counter() - started) / max(offset, 1)
+        parallel = _worth_parallel(seconds_per_day, days - offset, workers)
+    else:
+        parallel = days >= min_days
+    stock = _end_stock(parts[0]) if parts else initial_stock
+
+    chunk_days = chunk_days or max(1, -(-(days - offset) // workers))
+    bounds = [(start, min(start + chunk_days, days)) for start in range(offset, days, chunk_days)]
+
+    if not parallel or workers == 1 or len(bounds) <= 1:
+        if offset < days:
+            parts.append(simulate(engine, *[values[offset:] for values in inputs], initial_stock=stock))
+        result = _concat(parts)
+        result['repaired_days'] = 0
+        return result
+
+    config = engine.get_config()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_speculative, config, *[values[start:end] for values in inputs],
+                               (stock,) if i == 0 else candidates)
+                   for i, (start, end) in enumerate(bounds)]
+
+        result = {name: np.empty(days) for name in OUTPUTS}
+        if parts:
+            for name in OUTPUTS:
+                result[name][:offset] = parts[0][name]
+        repaired_days = 0
+        for i, ((start, end), future) in enumerate(zip(bounds, futures)):
+            speculative = future.result()
+            if i == 0:
+                chunk = speculative[0]
+            else:
+                chunk, repaired = _repair(engine, [values[start:end] for values in inputs], stock, speculative)
+                repaired_days += repaired
+            for name in OUTPUTS:
+                result[name][start:end] = chunk[name]
+            stock = _end_stock(chunk)
+
+    result['reason_code'] = reason_codes(engine, inputs[0], result['current_stock'], inputs[1], inputs[3])
+    result['repaired_days'] = repaired_days
+    return result
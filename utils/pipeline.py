@@ -0,0 +1,229 @@
+"""
+pipeline แบบ generator: อ่านข้อมูลรายวัน → ตรวจสอบ → ตัดสินใจ → คำนวณต้นทุน/รายได้ → สรุป → เขียนไฟล์
+
+แต่ละ stage รับ iterator ของ record (dict) แล้ว yield record ออกทีละรายการ
+stage ถัดไปดึงข้อมูลเมื่อพร้อมเท่านั้น (pull-based) จึงมี backpressure ในตัว
+และใช้หน่วยความจำคงที่ไม่ว่าข้อมูลจะยาวแค่ไหน
+
+ตัวอย่าง:
+    engine = LatexDecisionEngine()
+    rows = run_pipeline(
+        read_records('data/daily_intake.csv'),
+        validate,
+        partial(decide, engine=engine),
+        partial(add_costs, engine=engine),
+        aggregate,
+        partial(write_csv, path='monthly_report.csv'),
+    )
+
+เปลี่ยน stage ได้ตามต้องการ เช่น ใช้ decide_chunked (ตัดสินใจทีละ chunk ด้วย simulate) แทน decide
+และ validate_chunked (ตรวจทีละ chunk แบบ vectorized ด้วย utils.validation) แทน validate
+"""
+import csv
+import math
+from itertools import islice
+
+import numpy as np
+
+from utils.reason_codes import build_reason_params, render_reason
+from utils.simulation import simulate
+from utils.validation import describe_errors, validate_inputs
+
+# คอลัมน์ของไฟล์ข้อมูลรายวัน (ราคาว่าง = ไม่ทราบ)
+INPUT_COLUMNS = ('date', 'R_today', 'price_today_fresh', 'price_today_plus_4', 'price_today_plus_5')
+PRICE_COLUMNS = ('price_today_fresh', 'price_today_plus_4', 'price_today_plus_5')
+
+
+def run_pipeline(source, *stages):
+    """ต่อ stage เข้าด้วยกัน - ถ้า stage สุดท้ายเป็น sink จะคืนผลของ sink"""
+    stream = source
+    for stage in stages:
+        stream = stage(stream)
+    return stream
+
+
+def _to_number(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        if value == '':
+            return None
+    return float(value)
+
+
+def read_records(path):
+    """อ่านไฟล์ CSV รายวันทีละแถว (คอลัมน์ตาม INPUT_COLUMNS)"""
+    with open(path, newline='', encoding='utf-8') as f:
+        for line_number, row in enumerate(csv.DictReader(f), start=2):
+            yield {'line': line_number, **{name: row.get(name) for name in INPUT_COLUMNS}}
+
+
+def validate(records, on_invalid=None):
+    """
+    แปลงค่าเป็นตัวเลขและตัดแถวที่ไม่ถูกต้องออก
+
+    Parameters:
+    - on_invalid: ฟังก์ชัน (record, ข้อความ) ที่เรียกเมื่อเจอแถวไม่ถูกต้อง (None = ข้ามเงียบ ๆ)
+    """
+    for record in records:
+        try:
+            R_today = _to_number(record['R_today'])
+            prices = {name: _to_number(record.get(name)) for name in PRICE_COLUMNS}
+        except (TypeError, ValueError):
+            message = "ค่าไม่ใช่ตัวเลข"
+        else:
+            if R_today is None or math.isnan(R_today) or R_today < 0:
+                message = "น้ำยางเข้าต้องเป็นตัวเลขไม่ติดลบ"
+            elif (prices['price_today_fresh'] is None or math.isnan(prices['price_today_fresh'])
+                  or prices['price_today_fresh'] < 0):
+                message = "ต้องมีราคาน้ำยางสดที่ไม่ติดลบ"
+            else:
+                yield {**record, 'R_today': R_today, **prices}
+                continue
+        if on_invalid is not None:
+            on_invalid(record, message)
+
+
+def validate_chunked(records, engine, on_invalid=None, chunk_size=4096):
+    """
+    เหมือน validate แต่ตรวจทีละ chunk ด้วย validate_inputs (vectorized)
+    แถวที่ถูกต้องไปต่อ ส่วนแถวที่ผิดส่งให้ on_invalid(record, ข้อความ) - ไม่หยุดทั้ง pipeline
+
+    ใช้ engine.MAX_STOCK ตรวจ stock เมื่อ record มีคอลัมน์ current_stock
+    """
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        has_stock = 'current_stock' in chunk[0]
+        result = validate_inputs(
+            engine,
+            [record['R_today'] for record in chunk],
+            [record['price_today_fresh'] for record in chunk],
+            [record.get('price_today_plus_4') for record in chunk],
+            [record.get('price_today_plus_5') for record in chunk],
+            [record['current_stock'] for record in chunk] if has_stock else None,
+        )
+        for i, record in enumerate(chunk):
+            if not result['valid'][i]:
+                if on_invalid is not None:
+                    on_invalid(record, '; '.join(describe_errors(result['errors'][i])))
+                continue
+            values = {
+                'R_today': float(result['R_today'][i]),
+                'price_today_fresh': float(result['price_today_fresh'][i]),
+                # NaN = ไม่ทราบราคา → None เหมือน validate
+                'price_today_plus_4': None if np.isnan(result['price_plus_4'][i]) else float(result['price_plus_4'][i]),
+                'price_today_plus_5': None if np.isnan(result['price_plus_5'][i]) else float(result['price_plus_5'][i]),
+            }
+            if has_stock:
+                values['current_stock'] = float(result['current_stock'][i])
+            yield {**record, **values}
+
+
+def decide(records, engine, initial_stock=0):
+    """ตัดสินใจทีละวันด้วย daily_decision (stock วันถัดไป = stock_old + stock_new)"""
+    stock = initial_stock
+    for record in records:
+        decision = engine.daily_decision(record['R_today'], stock, record['price_today_fresh'],
+                                         record['price_today_plus_4'], record['price_today_plus_5'])
+        yield {**record, 'current_stock': stock, 'decision': decision}
+        stock = decision['stock_old'] + decision['stock_new']
+
+
+def decide_chunked(records, engine, initial_stock=0, chunk_size=4096):
+    """
+    ตัดสินใจทีละ chunk ด้วย simulate() (ใช้ kernel ของ numba ถ้ามี) - ผลเหมือน decide
+    ใช้หน่วยความจำตามขนาด chunk
+    """
+    stock = initial_stock
+    records = iter(records)
+    while True:
+        chunk = list(islice(records, chunk_size))
+        if not chunk:
+            return
+        result = simulate(
+            engine,
+            [record['R_today'] for record in chunk],
+            [record['price_today_fresh'] for record in chunk],
+            price_plus_5=[np.nan if record['price_today_plus_5'] is None else record['price_today_plus_5']
+                          for record in chunk],
+            initial_stock=stock,
+        )
+        for i, record in enumerate(chunk):
+            code = int(result['reason_code'][i])
+            current_stock = float(result['current_stock'][i])
+            decision = {
+                'produce': float(result['produce'][i]),
+                'hold': 0,
+                'dispose': float(result['dispose'][i]),
+                'stock_old': float(result['stock_old'][i]),
+                'stock_new': float(result['stock_new'][i]),
+                'reason_code': code,
+            }
+            params = build_reason_params(engine, code, record['R_today'], current_stock,
+                                         record['price_today_fresh'], record['price_today_plus_5'],
+                                         decision['stock_old'], decision['stock_new'], decision['dispose'])
+            decision['reason_params'] = params
+            decision['reason'] = render_reason(code, params)
+            yield {**record, 'current_stock': current_stock, 'decision': decision}
+        stock = result['stock_old'][-1] + result['stock_new'][-1]
+
+
+def add_costs(records, engine):
+    """คำนวณต้นทุน/รายได้ด้วย calculate_costs_and_revenue (ไม่ทราบราคาวันที่ +4 → finance เป็น None)"""
+    for record in records:
+        finance = None
+        if record['price_today_plus_4'] is not None:
+            finance = engine.calculate_costs_and_revenue(record['decision'], record['price_today_fresh'],
+                                                         record['price_today_plus_4'])
+        yield {**record, 'finance': finance}
+
+
+def aggregate(records, period_length=7):
+    """
+    สรุปผลเป็นช่วง (วันที่ 'YYYY-MM-DD' ใช้ 7 ตัวแรก = รายเดือน, 4 = รายปี, 10 = รายวัน)
+    ข้อมูลต้องเรียงตามวันที่ - เก็บสรุปของช่วงปัจจุบันช่วงเดียว
+    """
+    summary = None
+    for record in records:
+        period = str(record['date'])[:period_length]
+        if summary is not None and summary['period'] != period:
+            yield summary
+            summary = None
+        if summary is None:
+            summary = {'period': period, 'days': 0, 'R_today': 0.0, 'produce': 0.0, 'dispose': 0.0,
+                       'end_stock': 0.0, 'total_cost': 0.0, 'total_revenue': 0.0, 'profit': 0.0,
+                       'days_without_price': 0}
+
+        decision = record['decision']
+        summary['days'] += 1
+        summary['R_today'] += record['R_today']
+        summary['produce'] += decision['produce']
+        summary['dispose'] += decision['dispose']
+        summary['end_stock'] = float(decision['stock_old'] + decision['stock_new'])
+        if record['finance'] is None:
+            summary['days_without_price'] += 1
+        else:
+            summary['total_cost'] += record['finance']['total_cost']
+            summary['total_revenue'] += record['finance']['total_revenue']
+            summary['profit'] += record['finance']['profit']
+    if summary is not None:
+        yield summary
+
+
+def write_csv(records, path):
+    """sink: เขียน record ลง CSV ทีละแถว (คอลัมน์ตาม record แรก, ค่าที่เป็น dict ถูกข้าม) - คืนจำนวนแถว"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        writer = None
+        for record in records:
+            row = {name: value for name, value in record.items() if not isinstance(value, dict)}
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(row), extrasaction='ignore')
+                writer.writeheader()
+            writer.writerow(row)
+            count += 1
+    return count
@@ -0,0 +1,228 @@
+"""
+คาดการณ์ราคาแผ่นยางรมควันในอนาคตจากประวัติราคาที่บันทึกไว้
+
+ใช้ EWMA สองชั้น (ระดับราคา + แนวโน้มแบบหน่วง) ที่ fit ด้วย NumPy
+และอัพเดทแบบ incremental ทีละราคาเมื่อมีราคาใหม่เข้ามา (ไม่ต้อง fit ใหม่ทั้งหมด)
+"""
+import os
+import threading
+from datetime import date, datetime
+
+import numpy as np
+
+# ไฟล์ประวัติราคาแผ่นยางรมควัน (คอลัมน์: date,price)
+DEFAULT_HISTORY_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                    'data', 'sheet_price_history.csv')
+
+
+def ewma_last(values, alpha):
+    """
+    คำนวณค่า EWMA ตัวสุดท้ายแบบ vectorized
+
+    level_0 = x_0, level_i = alpha * x_i + (1 - alpha) * level_(i-1)
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n == 0:
+        return None
+    if n == 1:
+        return float(values[0])
+    decay = 1.0 - alpha
+    # น้ำหนักของ x_1..x_(n-1) และ x_0
+    weights = alpha * decay ** np.arange(n - 2, -1, -1, dtype=float)
+    return float(decay ** (n - 1) * values[0] + np.dot(weights, values[1:]))
+
+
+class PriceForecaster:
+    """
+    โมเดลคาดการณ์ราคาแบบ EWMA ระดับราคา + EWMA แนวโน้ม (damped trend)
+
+    ราคาที่ +h วัน = level + trend * (phi + phi^2 + ... + phi^h)
+    """
+
+    def __init__(self, alpha=0.3, beta=0.1, phi=0.9):
+        self.alpha = alpha  # น้ำหนักระดับราคา
+        self.beta = beta  # น้ำหนักแนวโน้ม
+        self.phi = phi  # ตัวหน่วงแนวโน้ม
+        self.level = None
+        self.trend = 0.0
+        self.last_price = None
+        self.last_date = None
+        self.n_obs = 0
+
+    def fit(self, prices, last_date=None):
+        """Fit โมเดลจากราคาทั้งชุด (vectorized) - ใช้ครั้งแรกเท่านั้น"""
+        prices = np.asarray(prices, dtype=float)
+        prices = prices[~np.isnan(prices)]
+        self.n_obs = len(prices)
+        self.last_date = last_date
+        if self.n_obs == 0:
+            self.level = None
+            self.trend = 0.0
+            self.last_price = None
+            return self
+
+        self.level = ewma_last(prices, self.alpha)
+        self.trend = ewma_last(np.diff(prices), self.beta) if self.n_obs > 1 else 0.0
+        self.last_price = float(prices[-1])
+        return self
+
+    def update(self, price, price_date=None):
+        """อัพเดทโมเดลด้วยราคาใหม่ 1 ค่า (O(1))"""
+        if price is None or np.isnan(price):
+            return self
+        price = float(price)
+        if self.level is None:
+            self.level = price
+            self.trend = 0.0
+        else:
+            diff = price - self.last_price
+            if self.n_obs == 1:
+                self.trend = diff
+            else:
+                self.trend = self.beta * diff + (1 - self.beta) * self.trend
+            self.level = self.alpha * price + (1 - self.alpha) * self.level
+        self.last_price = price
+        self.n_obs += 1
+        if price_date is not None:
+            self.last_date = price_date
+        return self
+
+    def forecast(self, horizons):
+        """
+        คาดการณ์ราคาล่วงหน้า
+
+        Parameters:
+        - horizons: จำนวนวันล่วงหน้า (int หรือ array)
+
+        Returns:
+        - ราคาคาดการณ์ (float หรือ np.ndarray) / None ถ้ายังไม่มีประวัติราคา
+        """
+        if self.level is None:
+            return None
+        h = np.asarray(horizons, dtype=float)
+        if self.phi == 1:
+            damped = h
+        else:
+            damped = self.phi * (1 - self.phi ** h) / (1 - self.phi)
+        result = self.level + self.trend * damped
+        return float(result) if result.ndim == 0 else result
+
+    def forecast_sheet_prices(self, production_days, today=None):
+        """
+        คาดการณ์ราคาแผ่นยางรมควันวันที่ +PRODUCTION_DAYS และ +PRODUCTION_DAYS+1
+
+        Returns:
+        - (price_today_plus_4, price_today_plus_5) หรือ (None, None) ถ้าไม่มีประวัติ
+        """
+        if self.level is None:
+            return None, None
+        # ถ้าราคาล่าสุดเก่ากว่าวันนี้ ให้นับระยะคาดการณ์จากวันที่ของราคาล่าสุด
+        gap = 0
+        if self.last_date is not None:
+            today = today or date.today()
+            gap = max((today - self.last_date).days, 0)
+        p4, p5 = self.forecast([production_days + gap, production_days + 1 + gap])
+        return float(p4), float(p5)
+
+
+def _parse_rows(lines):
+    """แปลงบรรทัด CSV (date,price) เป็น list ของ (date, price) - ข้ามบรรทัดที่อ่านไม่ได้"""
+    rows = []
+    for line in lines:
+        parts = line.strip().split(',')
+        if len(parts) < 2:
+            continue
+        try:
+            rows.append((datetime.strptime(parts[0].strip(), '%Y-%m-%d').date(), float(parts[1])))
+        except ValueError:
+            continue  # header หรือข้อมูลผิดรูปแบบ
+    return rows
+
+
+# cache ของโมเดลที่ fit แล้ว: key -> _CacheEntry
+_FORECASTER_CACHE = {}
+_CACHE_LOCK = threading.Lock()
+# จำนวนไบต์ต้น/ท้ายของข้อมูลที่อ่านแล้ว ที่ใช้ตรวจว่าไฟล์ถูกเขียนใหม่หรือแค่ต่อท้าย
+_CHECK_BYTES = 256
+
+
+class _CacheEntry:
+    def __init__(self, forecaster, offset, mtime_ns, head, tail):
+        self.forecaster = forecaster
+        self.offset = offset  # byte offset ที่อ่านไปแล้ว (จบที่ '\n' เสมอ)
+        self.mtime_ns = mtime_ns
+        self.head = head
+        self.tail = tail
+
+
+def _complete_lines(data):
+    """แยกส่วนที่เป็นบรรทัดครบ (จบด้วย '\\n') - บรรทัดสุดท้ายที่ยังเขียนไม่เสร็จรออ่านครั้งถัดไป"""
+    end = data.rfind(b'\n') + 1
+    return data[:end]
+
+
+def _same_prefix(f, entry):
+    """ไฟล์ยังมีข้อมูลส่วนที่อ่านแล้วเหมือนเดิม (เทียบไบต์ต้นและท้ายของส่วนนั้น)"""
+    if f.read(len(entry.head)) != entry.head:
+        return False
+    f.seek(entry.offset - len(entry.tail))
+    return f.read(len(entry.tail)) == entry.tail
+
+
+def get_forecaster(path=DEFAULT_HISTORY_PATH, alpha=0.3, beta=0.1, phi=0.9):
+    """
+    คืนโมเดลที่ fit จากไฟล์ประวัติราคา (cache ไว้ต่อไฟล์/พารามิเตอร์)
+
+    ถ้าไฟล์มีราคาใหม่ต่อท้าย จะอ่านเฉพาะส่วนที่เพิ่มและอัพเดทโมเดลแบบ incremental
+    (อ่านเฉพาะบรรทัดที่จบด้วย '\\n' - บรรทัดที่กำลังถูกเขียนอยู่รออ่านครั้งถัดไป)
+    ถ้าไฟล์ถูกเขียนใหม่ (ขนาดเท่าเดิมแต่ mtime เปลี่ยน หรือข้อมูลส่วนที่อ่านแล้วไม่เหมือนเดิม) จะ fit ใหม่ทั้งหมด
+    """
+    key = (os.path.abspath(path), alpha, beta, phi)
+    with _CACHE_LOCK:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            _FORECASTER_CACHE.pop(key, None)
+            return PriceForecaster(alpha, beta, phi)
+
+        entry = _FORECASTER_CACHE.get(key)
+        if entry is not None and entry.mtime_ns == stat.st_mtime_ns and entry.offset == stat.st_size:
+            return entry.forecaster
+
+        with open(path, 'rb') as f:
+            # ขนาดเท่าเดิมแต่ mtime เปลี่ยน = เขียนใหม่ทั้งไฟล์ (การต่อท้ายทำให้ไฟล์ยาวขึ้นเสมอ)
+            if entry is not None and entry.offset < stat.st_size and _same_prefix(f, entry):
+                # ต่อท้าย - อ่านเฉพาะส่วนที่เพิ่ม
+                f.seek(entry.offset)
+                data = _complete_lines(f.read())
+                for price_date, price in _parse_rows(data.decode('utf-8').splitlines()):
+                    entry.forecaster.update(price, price_date)
+                entry.offset += len(data)
+                entry.tail = (entry.tail + data)[-_CHECK_BYTES:]
+                if len(entry.head) < _CHECK_BYTES:
+                    f.seek(0)
+                    entry.head = f.read(min(entry.offset, _CHECK_BYTES))
+            else:
+                f.seek(0)
+                data = _complete_lines(f.read())
+                rows = _parse_rows(data.decode('utf-8').splitlines())
+                forecaster = PriceForecaster(alpha, beta, phi)
+                if rows:
+                    forecaster.fit([p for _, p in rows], last_date=rows[-1][0])
+                entry = _CacheEntry(forecaster, len(data), None, data[:_CHECK_BYTES], data[-_CHECK_BYTES:])
+
+        entry.mtime_ns = stat.st_mtime_ns
+        _FORECASTER_CACHE[key] = entry
+        return entry.forecaster
+
+
+def append_price(price, price_date=None, path=DEFAULT_HISTORY_PATH):
+    """บันทึกราคาแผ่นยางรมควันใหม่ต่อท้ายไฟล์ประวัติ (โมเดลใน cache จะอัพเดทเองในครั้งถัดไป)"""
+    price_date = price_date or date.today()
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    new_file = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a', encoding='utf-8') as f:
+        if new_file:
+            f.write('date,price\n')
+        f.write(f"{price_date.strftime('%Y-%m-%d')},{float(price)}\n")
@@ -0,0 +1,227 @@
+"""
+โหลดประวัติราคาระดับ tick (น้ำยางสด / แผ่นยางรมควัน) แบบ memory-mapped
+
+แปลงไฟล์ CSV (คอลัมน์: timestamp,kind,price โดย kind เป็น 'fresh' หรือ 'sheet') เป็นไฟล์ binary
+ครั้งเดียว - อ่านทีละ chunk ไม่โหลดทั้งไฟล์เข้า RAM:
+- <ชื่อ kind>.bin: tick ของแต่ละชนิด (เวลาเป็นวินาที epoch + ราคา) เรียงตามเวลา เปิดด้วย np.memmap
+- daily.npz: สรุปรายวัน (open/high/low/close/mean/count) คำนวณไว้ระหว่างแปลง
+- meta.json: ขนาดและเวลาแก้ไขของ CSV ต้นทาง - ถ้า CSV ไม่เปลี่ยน การเปิดครั้งต่อไปไม่ต้องแปลงใหม่
+
+เวลาใน CSV ถือเป็นเวลาท้องถิ่นแบบไม่มี timezone (วันที่ = timestamp // 86400)
+"""
+import json
+import os
+import shutil
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+KINDS = ('fresh', 'sheet')
+TICK_DTYPE = np.dtype([('time', '<i8'), ('price', '<f8')])
+DAILY_FIELDS = ('day', 'open', 'high', 'low', 'close', 'mean', 'count')
+SECONDS_PER_DAY = 86400
+EPOCH = date(1970, 1, 1)
+
+
+def to_day(value):
+    """แปลง date เป็นเลขวัน (นับจาก 1970-01-01) - ถ้าเป็นเลขอยู่แล้วคืนค่าเดิม"""
+    if isinstance(value, date):
+        return (value - EPOCH).days
+    return int(value)
+
+
+def _source_meta(csv_path):
+    stat = os.stat(csv_path)
+    return {'source': os.path.abspath(csv_path), 'size': stat.st_size, 'mtime': stat.st_mtime}
+
+
+def _daily_aggregate(times, prices, seconds=SECONDS_PER_DAY):
+    """สรุปรายวัน (หรือช่วงละ seconds วินาที - 'day' เป็นเลขช่วง) ของ tick ชุดหนึ่ง (เรียงตามเวลาแล้ว)"""
+    days = times // seconds
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    ends = np.r_[starts[1:], len(days)]
+    prices = prices.astype(float)
+    total = np.add.reduceat(prices, starts)
+    count = ends - starts
+    return {
+        'day': days[starts],
+        'open': prices[starts],
+        'high': np.maximum.reduceat(prices, starts),
+        'low': np.minimum.reduceat(prices, starts),
+        'close': prices[ends - 1],
+        'sum': total,
+        'count': count,
+    }
+
+
+def _merge_daily(parts):
+    """รวมสรุปรายวัน/รายช่วงของหลาย chunk (ช่วงที่คร่อม chunk รวมเป็นแถวเดียว)"""
+    if not parts:
+        return {name: np.empty(0) for name in DAILY_FIELDS}
+    merged = {name: np.concatenate([part[name] for part in parts]) for name in parts[0]}
+    days = merged['day']
+    starts = np.flatnonzero(np.r_[True, days[1:] != days[:-1]])
+    ends = np.r_[starts[1:], len(days)]
+    total = np.add.reduceat(merged['sum'], starts)
+    count = np.add.reduceat(merged['count'], starts)
+    return {
+        'day': days[starts].astype(np.int64),
+        'open': merged['open'][starts],
+        'high': np.maximum.reduceat(merged['high'], starts),
+        'low': np.minimum.reduceat(merged['low'], starts),
+        'close': merged['close'][ends - 1],
+        'mean': total / count,
+        'count': count.astype(np.int64),
+    }
+
+
+def convert_csv(csv_path, directory, chunksize=1_000_000):
+    """แปลง CSV เป็นไฟล์ binary ใน directory (อ่านทีละ chunk)"""
+    temp_directory = directory + '.tmp'
+    shutil.rmtree(temp_directory, ignore_errors=True)
+    os.makedirs(temp_directory)
+
+    files = {kind: open(os.path.join(temp_directory, f"{kind}.bin"), 'wb') for kind in KINDS}
+    last_time = {kind: np.iinfo(np.int64).min for kind in KINDS}
+    daily_parts = {kind: [] for kind in KINDS}
+    try:
+        for chunk in pd.read_csv(csv_path, usecols=['timestamp', 'kind', 'price'], chunksize=chunksize):
+            times = pd.to_datetime(chunk['timestamp']).to_numpy('datetime64[s]').astype(np.int64)
+            kinds = chunk['kind'].str.strip().str.lower().to_numpy()
+            prices = chunk['price'].to_numpy(dtype=float)
+
+            for kind in KINDS:
+                mask = (kinds == kind) & ~np.isnan(prices)
+                if not mask.any():
+                    continue
+                kind_times = times[mask]
+                if kind_times[0] < last_time[kind] or np.any(np.diff(kind_times) < 0):
+                    raise ValueError(f"tick ของ '{kind}' ใน {csv_path} ไม่เรียงตามเวลา")
+                last_time[kind] = kind_times[-1]
+
+                ticks = np.empty(len(kind_times), dtype=TICK_DTYPE)
+                ticks['time'] = kind_times
+                ticks['price'] = prices[mask]
+                files[kind].write(ticks.tobytes())
+                daily_parts[kind].append(_daily_aggregate(kind_times, ticks['price']))
+    finally:
+        for f in files.values():
+            f.close()
+
+    np.savez(os.path.join(temp_directory, 'daily.npz'),
+             **{f"{kind}_{name}": values for kind in KINDS
+                for name, values in _merge_daily(daily_parts[kind]).items()})
+    with open(os.path.join(temp_directory, 'meta.json'), 'w') as f:
+        json.dump(_source_meta(csv_path), f)
+
+    # สลับเข้าที่เมื่อแปลงเสร็จครบ
+    shutil.rmtree(directory, ignore_errors=True)
+    os.replace(temp_directory, directory)
+
+
+class TickHistory:
+    def __init__(self, directory):
+        """เปิดไฟล์ที่แปลงแล้ว (ใช้ TickHistory.open() เพื่อแปลงจาก CSV อัตโนมัติ)"""
+        self.directory = directory
+        self._ticks = {}
+        for kind in KINDS:
+            path = os.path.join(directory, f"{kind}.bin")
+            if os.path.getsize(path) == 0:
+                self._ticks[kind] = np.empty(0, dtype=TICK_DTYPE)
+            else:
+                self._ticks[kind] = np.memmap(path, dtype=TICK_DTYPE, mode='r')
+        with np.load(os.path.join(directory, 'daily.npz')) as data:
+            self._daily = {kind: {name: data[f"{kind}_{name}"] for name in DAILY_FIELDS} for kind in KINDS}
+
+    @classmethod
+    def open(cls, csv_path, directory=None):
+        """เปิดประวัติราคาจาก CSV - แปลงใหม่เฉพาะครั้งแรกหรือเมื่อ CSV เปลี่ยน"""
+        directory = directory or csv_path + '.mmap'
+        meta_path = os.path.join(directory, 'meta.json')
+        try:
+            with open(meta_path) as f:
+                up_to_date = json.load(f) == _source_meta(csv_path)
+        except (FileNotFoundError, ValueError):
+            up_to_date = False
+        if not up_to_date:
+            convert_csv(csv_path, directory)
+        return cls(directory)
+
+    def ticks(self, kind):
+        """tick ทั้งหมดของชนิด kind (memmap - อ่านจากดิสก์เมื่อใช้จริง)"""
+        return self._ticks[kind]
+
+    def daily(self, kind):
+        """สรุปรายวัน: dict ของ array day, open, high, low, close, mean, count"""
+        return self._daily[kind]
+
+    def resample(self, kind, seconds, how='mean', chunksize=1_000_000):
+        """
+        สรุปราคาเป็นช่วงละ seconds วินาที
+        อ่าน memmap ทีละ chunksize tick แล้วรวมผลแบบเดียวกับตอนแปลง (ไม่โหลด tick ทั้งหมดเข้า RAM)
+
+        Returns:
+        - (เวลาเริ่มของแต่ละช่วง, ราคา) โดย how เป็น 'mean', 'last', 'first', 'max' หรือ 'min'
+        """
+        field = {'mean': 'mean', 'first': 'open', 'last': 'close', 'max': 'high', 'min': 'low'}.get(how)
+        if field is None:
+            raise ValueError(f"ไม่รู้จักวิธีสรุป '{how}'")
+        if seconds == SECONDS_PER_DAY:
+            # สรุปรายวันคำนวณไว้แล้วตอนแปลง
+            daily = self._daily[kind]
+            return daily['day'] * SECONDS_PER_DAY, daily[field]
+
+        ticks = self._ticks[kind]
+        if len(ticks) == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        parts = []
+        for start in range(0, len(ticks), chunksize):
+            chunk = ticks[start:start + chunksize]
+            parts.append(_daily_aggregate(np.asarray(chunk['time']), np.asarray(chunk['price']), seconds))
+        merged = _merge_daily(parts)
+        return merged['day'] * seconds, merged[field]
+
+    def price_on(self, kind, day, field='close'):
+        """ราคาสรุปของวัน day (date หรือเลขวัน) - None ถ้าไม่มี tick วันนั้น"""
+        daily = self._daily[kind]
+        day = to_day(day)
+        i = np.searchsorted(daily['day'], day)
+        if i < len(daily['day']) and daily['day'][i] == day:
+            return float(daily[field][i])
+        return None
+
+    def sheet_prices_for(self, day, production_days=4, field='close'):
+        """
+        ราคาแผ่นยางที่ daily_decision ต้องใช้ของวัน day
+
+        Returns:
+        - (ราคาวันที่ +production_days, ราคาวันที่ +production_days+1) ค่าที่ไม่มีข้อมูลเป็น None
+        """
+        day = to_day(day)
+        return (self.price_on('sheet', day + production_days, field),
+                self.price_on('sheet', day + production_days + 1, field))
+
+    def daily_inputs(self, first_day, last_day, production_days=4, field='close'):
+        """
+        ราคารายวันสำหรับ simulate() ช่วง first_day..last_day
+
+        Returns:
+        - dict ของ array: day, price_fresh, price_plus_4, price_plus_5 (วันที่ไม่มีข้อมูลเป็น NaN)
+        """
+        days = np.arange(to_day(first_day), to_day(last_day) + 1)
+
+        def lookup(kind, offset):
+            daily = self._daily[kind]
+            index = np.clip(np.searchsorted(daily['day'], days + offset), 0, max(len(daily['day']) - 1, 0))
+            if len(daily['day']) == 0:
+                return np.full(len(days), np.nan)
+            found = daily['day'][index] == days + offset
+            return np.where(found, daily[field][index], np.nan)
+
+        return {
+            'day': days,
+            'price_fresh': lookup('fresh', 0),
+            'price_plus_4': lookup('sheet', production_days),
+            'price_plus_5': lookup('sheet', production_days + 1),
+        }
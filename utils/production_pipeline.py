@@ -0,0 +1,95 @@
+"""
+แบบจำลองระยะเวลาผลิต (PRODUCTION_DAYS) - งานระหว่างผลิตและกระแสเงินสดรายวัน
+
+น้ำยางที่ผลิตแต่ละวันเข้าคิวการผลิตยาว PRODUCTION_DAYS วัน แล้วได้รายได้เมื่อผลิตเสร็จ
+ตามราคาแผ่นยางของวันที่เสร็จ (ไม่ใช่นับรายได้ทันทีด้วยราคาวันที่ +4)
+
+คิวเป็น ring buffer ขนาดคงที่ - แต่ละวันเลื่อนคิว 1 ช่อง O(1) และยอดงานระหว่างผลิตปรับแบบสะสม
+ไม่ต้องไล่ทุกล็อตในคิวทุกวัน
+"""
+import numpy as np
+
+from utils.simulation import _as_days, simulate
+
+
+class ProductionPipeline:
+    def __init__(self, production_days):
+        """
+        Parameters:
+        - production_days: จำนวนวันตั้งแต่เริ่มผลิตจนได้แผ่นยางพร้อมขาย (0 = เสร็จในวันเดียว)
+        """
+        self.production_days = production_days
+        self._kg = np.zeros(production_days)
+        self._cost = np.zeros(production_days)
+        self._head = 0  # ช่องของล็อตที่เริ่มผลิตเมื่อ production_days วันก่อน
+        self.wip_kg = 0.0  # น้ำยางระหว่างผลิต (กก.)
+        self.wip_cost = 0.0  # ต้นทุนของงานระหว่างผลิต (บาท)
+
+    def step(self, produce_kg, batch_cost):
+        """
+        เริ่มผลิตล็อตของวันนี้ และคืนล็อตที่ผลิตเสร็จวันนี้
+
+        Returns:
+        - (กก. ที่ผลิตเสร็จ, ต้นทุนของล็อตที่เสร็จ)
+        """
+        if self.production_days == 0:
+            return produce_kg, batch_cost
+
+        head = self._head
+        done_kg = self._kg[head]
+        done_cost = self._cost[head]
+        self._kg[head] = produce_kg
+        self._cost[head] = batch_cost
+        self._head = (head + 1) % self.production_days
+        self.wip_kg += produce_kg - done_kg
+        self.wip_cost += batch_cost - done_cost
+        return done_kg, done_cost
+
+
+def simulate_cash_flow(engine, R_today, price_today_fresh, sheet_price, price_plus_5=None, initial_stock=0):
+    """
+    จำลองหลายวันพร้อมระยะเวลาผลิต
+
+    Parameters:
+    - engine: LatexDecisionEngine (ใช้ PRODUCTION_DAYS เป็นความยาวคิว)
+    - R_today, price_today_fresh: น้ำยางเข้าและราคาน้ำยางสดรายวัน
+    - sheet_price: ราคาแผ่นยางของแต่ละวันตามปฏิทิน (ใช้ราคาของวันที่ล็อตผลิตเสร็จ)
+    - price_plus_5: ราคาวันที่ +5 ที่ใช้ตัดสินใจเก็บ/ขาย (None/NaN = ไม่ทราบ)
+    - initial_stock: stock ก่อนวันแรก (กก.)
+
+    Returns:
+    - dict ของ array รายวัน: produce, dispose, completed_kg, sheet_revenue, fresh_revenue, cash_out, cash_in,
+      net_cash_flow, cumulative_cash, wip_kg, wip_cost
+      (ล็อตที่ยังผลิตไม่เสร็จเมื่อจบช่วงยังอยู่ใน wip ของวันสุดท้าย)
+    """
+    R_today = np.asarray(R_today, dtype=float)
+    days = len(R_today)
+    price_fresh = _as_days(price_today_fresh, days)
+    sheet_price = _as_days(sheet_price, days)
+    decisions = simulate(engine, R_today, price_fresh, None, price_plus_5, initial_stock)
+
+    names = ('completed_kg', 'sheet_revenue', 'fresh_revenue', 'cash_out', 'cash_in', 'wip_kg', 'wip_cost')
+    result = {name: np.zeros(days) for name in names}
+    pipeline = ProductionPipeline(engine.PRODUCTION_DAYS)
+    transport_per_kg = engine.TRANSPORT_COST_PER_20K / 20000
+
+    for t in range(days):
+        produce = decisions['produce'][t]
+        dispose = decisions['dispose'][t]
+        # จ่ายวันนี้: ค่าน้ำยาง + ต้นทุนการผลิตของล็อตที่เริ่ม, ค่าขนส่งน้ำยางสด, ค่าเก็บ stock
+        batch_cost = produce * (price_fresh[t] + engine.PRODUCTION_COST)
+        completed_kg, _ = pipeline.step(produce, batch_cost)
+
+        result['completed_kg'][t] = completed_kg
+        result['sheet_revenue'][t] = completed_kg * sheet_price[t] if completed_kg > 0 else 0.0
+        result['fresh_revenue'][t] = dispose * price_fresh[t]
+        result['cash_out'][t] = batch_cost + dispose * transport_per_kg + decisions['storage_cost'][t]
+        result['cash_in'][t] = result['sheet_revenue'][t] + result['fresh_revenue'][t]
+        result['wip_kg'][t] = pipeline.wip_kg
+        result['wip_cost'][t] = pipeline.wip_cost
+
+    result['produce'] = decisions['produce']
+    result['dispose'] = decisions['dispose']
+    result['net_cash_flow'] = result['cash_in'] - result['cash_out']
+    result['cumulative_cash'] = np.cumsum(result['net_cash_flow'])
+    return result
@@ -0,0 +1,108 @@
+"""
+โปรไฟล์ค่าคงที่ของแต่ละโรงงาน (ไฟล์ JSON หรือ TOML ในโฟลเดอร์ profiles/)
+
+หน้าเว็บและเครื่องมือ batch อ่านค่าจากไฟล์ชุดเดียวกัน:
+- แต่ละไฟล์ถูก parse ครั้งเดียวแล้ว cache ไว้ (key รวม mtime ของไฟล์)
+  การเรียก load_profile ซ้ำมีต้นทุนแค่ os.stat - แก้ไฟล์แล้วจะอ่านใหม่เองในการเรียกครั้งถัดไป
+- ชื่อโปรไฟล์ = ชื่อไฟล์ไม่รวมนามสกุล (profiles/default.json → 'default')
+
+รูปแบบไฟล์:
+    {
+        "name": "โรงงานหลัก",
+        "engine": {"PRODUCTION_CAPACITY": 60000, "MAX_STOCK": 20000, ...}
+    }
+ค่าใน "engine" ที่ไม่ระบุใช้ค่าเริ่มต้นของ LatexDecisionEngine
+"""
+import json
+import os
+from functools import lru_cache
+from types import MappingProxyType
+
+from utils.daily_decision import LatexDecisionEngine
+
+try:
+    import tomllib
+except ImportError:  # Python < 3.11 - ใช้ได้เฉพาะไฟล์ JSON
+    tomllib = None
+
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profiles')
+DEFAULT_PROFILE = 'default'
+PROFILE_SUFFIXES = ('.json', '.toml') if tomllib is not None else ('.json',)
+
+
+def list_profiles(directory=PROFILE_DIR):
+    """ชื่อโปรไฟล์ทั้งหมดในโฟลเดอร์ (เรียงตามชื่อ, default ก่อน)"""
+    names = {os.path.splitext(entry)[0] for entry in os.listdir(directory)
+             if entry.endswith(PROFILE_SUFFIXES)}
+    return sorted(names, key=lambda name: (name != DEFAULT_PROFILE, name))
+
+
+def _profile_path(name, directory):
+    for suffix in PROFILE_SUFFIXES:
+        path = os.path.join(directory, name + suffix)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"ไม่พบโปรไฟล์ '{name}' ใน {directory}")
+
+
+@lru_cache(maxsize=32)
+def _parse(path, mtime_ns, size):
+    """parse ไฟล์โปรไฟล์ (mtime_ns, size เป็นส่วนหนึ่งของ key - ไฟล์เปลี่ยนแล้วจะ parse ใหม่)"""
+    with open(path, 'rb') as f:
+        data = tomllib.load(f) if path.endswith('.toml') else json.load(f)
+
+    constants = LatexDecisionEngine().get_config()
+    engine = data.get('engine', {})
+    unknown = sorted(set(engine) - set(constants))
+    if unknown:
+        raise ValueError(f"ค่าคงที่ไม่ถูกต้องในโปรไฟล์ {path}: {', '.join(unknown)}")
+
+    name = os.path.splitext(os.path.basename(path))[0]
+    return MappingProxyType({
+        'id': name,
+        'name': data.get('name', name),
+        'engine': MappingProxyType({**constants, **engine}),
+    })
+
+
+def profile_version(name=DEFAULT_PROFILE, directory=PROFILE_DIR):
+    """mtime ของไฟล์โปรไฟล์ (ใช้เป็นส่วนหนึ่งของ cache key ภายนอก)"""
+    return os.stat(_profile_path(name, directory)).st_mtime_ns
+
+
+def load_profile(name=DEFAULT_PROFILE, directory=PROFILE_DIR):
+    """
+    โหลดโปรไฟล์ (cache ตาม mtime - ห้ามแก้ค่าที่ได้)
+
+    Returns:
+    - mapping: id, name (ชื่อที่แสดง), engine (ค่าคงที่ของ engine ครบทุกตัว)
+    """
+    path = _profile_path(name, directory)
+    stat = os.stat(path)
+    return _parse(path, stat.st_mtime_ns, stat.st_size)
+
+
+def profile_labels(directory=PROFILE_DIR):
+    """
+    ชื่อที่แสดงของทุกโปรไฟล์ (สำหรับตัวเลือกในหน้าเว็บ) - ไฟล์ที่อ่านไม่ได้ถูกทำเครื่องหมายแทนที่จะทำให้ทั้งรายการล้ม
+
+    Returns:
+    - (dict ชื่อโปรไฟล์ → ชื่อที่แสดง, dict ชื่อโปรไฟล์ที่อ่านไม่ได้ → ข้อความข้อผิดพลาด)
+    """
+    labels = {}
+    errors = {}
+    for name in list_profiles(directory):
+        try:
+            labels[name] = load_profile(name, directory)['name']
+        except (OSError, ValueError) as error:  # JSON/TOML ผิดรูปแบบ, ค่าคงที่ไม่ถูกต้อง, ไฟล์ถูกลบ
+            labels[name] = f"⚠️ {name} (อ่านไม่ได้)"
+            errors[name] = str(error)
+    return labels, errors
+
+
+def engine_from_profile(profile, **overrides):
+    """สร้าง engine จากโปรไฟล์ (overrides = ค่าที่ผู้ใช้แก้ เช่น PRODUCTION_CAPACITY=70000)"""
+    engine = LatexDecisionEngine()
+    for name, value in {**profile['engine'], **overrides}.items():
+        setattr(engine, name, value)
+    return engine
@@ -0,0 +1,87 @@
+"""
+ชั้น reactive สำหรับคำนวณค่าที่ได้จาก input แบบ incremental
+
+ประกาศค่าที่คำนวณได้ (node) พร้อม dependency แล้วเรียก get() - node จะคำนวณใหม่
+เฉพาะเมื่อ input หรือ node ที่มันขึ้นอยู่เปลี่ยนไปจากรอบก่อน ผลลัพธ์ถูก memo ไว้ใน store
+(เช่น st.session_state) จึงอยู่ข้าม rerun ของ Streamlit ได้
+
+ตัวอย่าง:
+    graph = ReactiveGraph(st.session_state)
+
+    @graph.node('price_today_fresh')
+    def breakeven(price_today_fresh):
+        ...
+
+    graph.set_inputs(price_today_fresh=45.0)
+    graph.get('breakeven')
+"""
+
+
+def _same_value(old, new):
+    """เทียบค่าเดิมกับค่าใหม่ (ค่าที่เทียบด้วย == ไม่ได้ เช่น DataFrame ถือว่าเปลี่ยน)"""
+    if type(old) is not type(new):
+        return False
+    try:
+        return bool(old == new)
+    except (TypeError, ValueError):
+        return False
+
+
+class ReactiveGraph:
+    def __init__(self, store, key='reactive_memo'):
+        """
+        Parameters:
+        - store: mapping ที่เก็บ memo (เช่น st.session_state หรือ dict)
+        - key: ชื่อ key ใน store
+        """
+        self._store = store
+        self._key = key
+        self._nodes = {}
+        self._inputs = {}
+        self.recomputed = set()  # node ที่คำนวณใหม่ในรอบนี้
+
+    def node(self, *deps):
+        """decorator สำหรับประกาศ node ชื่อเดียวกับฟังก์ชัน โดย deps เป็นชื่อ input หรือ node อื่น"""
+        def decorator(func):
+            self._nodes[func.__name__] = (func, deps)
+            return func
+        return decorator
+
+    def set_inputs(self, **values):
+        """กำหนดค่า input ของรอบนี้"""
+        self._inputs.update(values)
+
+    def _memo(self):
+        if self._key not in self._store:
+            self._store[self._key] = {}
+        return self._store[self._key]
+
+    def _dependency_key(self, dep):
+        # input เทียบด้วยค่า, node เทียบด้วย version (เปลี่ยนเมื่อค่าเปลี่ยนจริง)
+        if dep in self._inputs:
+            return ('input', self._inputs[dep])
+        self.get(dep)
+        return ('node', self._memo()[dep]['version'])
+
+    def get(self, name):
+        """คืนค่าของ input หรือ node (คำนวณใหม่เฉพาะเมื่อ dependency เปลี่ยน)"""
+        if name in self._inputs:
+            return self._inputs[name]
+        if name not in self._nodes:
+            raise KeyError(f"ไม่พบ input หรือ node ชื่อ '{name}'")
+
+        func, deps = self._nodes[name]
+        key = tuple(self._dependency_key(dep) for dep in deps)
+        memo = self._memo()
+        entry = memo.get(name)
+        if entry is not None and _same_value(entry['key'], key):
+            return entry['value']
+
+        value = func(*[self.get(dep) for dep in deps])
+        self.recomputed.add(name)
+        if entry is not None and _same_value(entry['value'], value):
+            version = entry['version']
+        else:
+            version = entry['version'] + 1 if entry is not None else 0
+        memo[name] = {'key': key, 'value': value, 'version': version}
+        return value
@@ -0,0 +1,278 @@
+"""
+รหัสเหตุผลของการตัดสินใจรายวัน (reason code) และการแสดงผลเป็นข้อความไทย/อังกฤษ
+
+daily_decision คืน reason_code (จำนวนเต็มเล็ก ๆ) และ reason_params (ตัวเลขที่ใช้ในข้อความ)
+ผลแบบ batch/ประวัติเก็บเฉพาะรหัสเป็น uint8 (1 ไบต์ต่อวัน) - นับสถิติได้ทันที เช่น
+"จำนวนวันที่ขายทิ้งเพราะ stock เต็ม" = np.count_nonzero(disposed_stock_full(codes))
+ข้อความสร้างเมื่อต้องแสดงเท่านั้น จากตารางแม่แบบ (cache ไว้ต่อภาษา/รหัส)
+"""
+from functools import lru_cache
+
+from utils.lazy import lazy_import
+
+# numpy ใช้เฉพาะฟังก์ชันแบบ batch - engine ที่ import module นี้ไม่ต้องโหลด numpy
+np = lazy_import('numpy')
+
+REASON_PRODUCE_ALL = 0  # น้ำยางรวม <= กำลังการผลิต → ผลิตหมด
+REASON_STOCK_COVERS = 1  # stock เดิมพอผลิตเต็มกำลัง → น้ำยางใหม่เก็บเข้า stock ทั้งหมด
+REASON_HOLD_STOCK_FULL = 2  # ราคาคุ้มทุน → เก็บส่วนเกินจน stock เต็ม ที่เหลือขายทิ้ง
+REASON_HOLD_PROFITABLE = 3  # ราคาคุ้มทุน → เก็บส่วนเกินทั้งหมด
+REASON_SELL_UNPROFITABLE = 4  # ราคาไม่คุ้มทุน → ขายส่วนเกินทิ้ง
+REASON_HOLD_PRICE_UNKNOWN = 5  # ไม่ทราบราคาวันที่ +5 → เก็บส่วนเกิน (เต็มแล้วขาย)
+REASON_NO_EXCESS = 6  # ผลิตเต็มกำลังพอดี ไม่มีส่วนเกิน
+REASON_OVER_LIMIT = 7  # น้ำยางรวม >= 80,000 → ผลิตเต็มกำลัง เก็บส่วนเกินได้หมด
+REASON_PRICE_UNKNOWN_STOCK_FULL = 8  # ไม่ทราบราคาวันที่ +5 → เก็บจน stock เต็ม ที่เหลือขายทิ้ง
+REASON_OVER_LIMIT_STOCK_FULL = 9  # น้ำยางรวม >= 80,000 → เก็บจน stock เต็ม ที่เหลือขายทิ้ง
+
+REASON_DTYPE = 'u1'
+N_REASONS = 10
+
+# รหัสที่มีการขายทิ้งเพราะ stock เต็ม (ต่างจาก REASON_SELL_UNPROFITABLE ที่ขายเพราะราคา)
+STOCK_FULL_REASONS = (REASON_HOLD_STOCK_FULL, REASON_PRICE_UNKNOWN_STOCK_FULL, REASON_OVER_LIMIT_STOCK_FULL)
+
+# เกณฑ์น้ำยางรวมที่ต้องขายส่วนเกิน (ค่าเดียวกับใน daily_decision)
+OVER_LIMIT_TOTAL = 80000
+
+# รหัสของกรณีที่ stock เดิมไม่พอผลิต (มี used_fresh/remaining) และกรณีที่เทียบราคาวันที่ +5 กับจุดคุ้มทุน
+_EXCESS_REASONS = (REASON_HOLD_STOCK_FULL, REASON_HOLD_PROFITABLE, REASON_SELL_UNPROFITABLE,
+                   REASON_HOLD_PRICE_UNKNOWN, REASON_PRICE_UNKNOWN_STOCK_FULL, REASON_NO_EXCESS)
+_PRICED_REASONS = (REASON_HOLD_STOCK_FULL, REASON_HOLD_PROFITABLE, REASON_SELL_UNPROFITABLE)
+
+LANGUAGES = ('th', 'en')
+
+# ชื่อสั้นของแต่ละรหัส (ใช้ในตารางสถิติ)
+_LABELS = {
+    'th': {
+        REASON_PRODUCE_ALL: "ผลิตหมด",
+        REASON_STOCK_COVERS: "ผลิตจาก stock เดิม",
+        REASON_HOLD_STOCK_FULL: "เก็บจน stock เต็ม ขายส่วนที่เหลือ",
+        REASON_HOLD_PROFITABLE: "เก็บส่วนเกิน (ราคาคุ้มทุน)",
+        REASON_SELL_UNPROFITABLE: "ขายส่วนเกิน (ราคาไม่คุ้มทุน)",
+        REASON_HOLD_PRICE_UNKNOWN: "เก็บส่วนเกิน (ไม่ทราบราคา)",
+        REASON_NO_EXCESS: "ผลิตเต็มกำลังพอดี",
+        REASON_OVER_LIMIT: "เกิน 80,000 กก.",
+        REASON_PRICE_UNKNOWN_STOCK_FULL: "ไม่ทราบราคา stock เต็ม ขายส่วนที่เหลือ",
+        REASON_OVER_LIMIT_STOCK_FULL: "เกิน 80,000 กก. stock เต็ม ขายส่วนที่เหลือ",
+    },
+    'en': {
+        REASON_PRODUCE_ALL: "produce all",
+        REASON_STOCK_COVERS: "produce from old stock",
+        REASON_HOLD_STOCK_FULL: "hold until stock full, sell rest",
+        REASON_HOLD_PROFITABLE: "hold excess (price above breakeven)",
+        REASON_SELL_UNPROFITABLE: "sell excess (price below breakeven)",
+        REASON_HOLD_PRICE_UNKNOWN: "hold excess (price unknown)",
+        REASON_NO_EXCESS: "produce at capacity, no excess",
+        REASON_OVER_LIMIT: "over 80,000 kg",
+        REASON_PRICE_UNKNOWN_STOCK_FULL: "price unknown, stock full, sell rest",
+        REASON_OVER_LIMIT_STOCK_FULL: "over 80,000 kg, stock full, sell rest",
+    },
+}
+
+# แม่แบบข้อความ: (ข้อความหลัก, ((ชื่อ param, ข้อความต่อท้ายเมื่อ param > 0), ...))
+_TH_PRODUCED = "น้ำยางรวม {total:,.0f} กก. → ผลิต {capacity:,} กก. (Stock เดิม {current_stock:,.0f} + ใหม่ {used_fresh:,.0f}) | "
+_EN_PRODUCED = ("Total latex {total:,.0f} kg → produce {capacity:,} kg "
+                "(old stock {current_stock:,.0f} + new {used_fresh:,.0f}) | ")
+_TEMPLATES = {
+    'th': {
+        REASON_PRODUCE_ALL: (
+            "น้ำยางรวม {total:,.0f} กก. (Stock เดิม {current_stock:,.0f} + ใหม่ {R_today:,.0f}) "
+            "น้อยกว่าหรือเท่ากับกำลังการผลิต → ผลิตหมด", ()),
+        REASON_STOCK_COVERS: (
+            "น้ำยางรวม {total:,.0f} กก. (Stock เดิม {current_stock:,.0f} + ใหม่ {R_today:,.0f}) → "
+            "ผลิต {capacity:,} กก. จาก Stock เดิม | "
+            "Stock คงเหลือ: เดิม {stock_old:,.0f} + ใหม่ {stock_new:,.0f} = {end_stock:,.0f} กก.", ()),
+        REASON_HOLD_STOCK_FULL: (
+            _TH_PRODUCED + "ส่วนเกิน {remaining:,.0f} กก.: ราคาคุ้มทุน → เก็บใหม่ {stock_new:,.0f} กก., "
+            "Stock เต็ม ขายทิ้ง {dispose:,.0f} กก.", ()),
+        REASON_HOLD_PROFITABLE: (
+            _TH_PRODUCED + "ส่วนเกิน {remaining:,.0f} กก.: ราคาคุ้มทุน ({price_plus_5:.2f} >= {breakeven:.2f} บาท) "
+            "→ เก็บใหม่ {stock_new:,.0f} กก.", ()),
+        REASON_SELL_UNPROFITABLE: (
+            _TH_PRODUCED + "ส่วนเกิน {remaining:,.0f} กก.: ราคาไม่คุ้มทุน ({price_plus_5:.2f} < {breakeven:.2f} บาท) "
+            "→ ขายทิ้ง {dispose:,.0f} กก.", ()),
+        REASON_HOLD_PRICE_UNKNOWN: (
+            _TH_PRODUCED + "ส่วนเกิน {remaining:,.0f} กก.: ไม่ทราบราคา → เก็บใหม่ {stock_new:,.0f} กก.",
+            (('dispose', ", ขายส่วนเกิน {dispose:,.0f} กก."),)),
+        REASON_NO_EXCESS: (
+            "น้ำยางรวม {total:,.0f} กก. (Stock เดิม {current_stock:,.0f} + ใหม่ {R_today:,.0f}) → "
+            "ผลิต {capacity:,} กก. (ใช้หมด)", ()),
+        REASON_OVER_LIMIT: (
+            "น้ำยางรวม {total:,.0f} กก. เกิน 80,000 → ผลิต {capacity:,} กก.",
+            (('stock_new', ", เก็บใหม่ {stock_new:,.0f} กก."), ('dispose', ", ขายทิ้ง {dispose:,.0f} กก."))),
+    },
+    'en': {
+        REASON_PRODUCE_ALL: (
+            "Total latex {total:,.0f} kg (old stock {current_stock:,.0f} + new {R_today:,.0f}) "
+            "is within production capacity → produce all", ()),
+        REASON_STOCK_COVERS: (
+            "Total latex {total:,.0f} kg (old stock {current_stock:,.0f} + new {R_today:,.0f}) → "
+            "produce {capacity:,} kg from old stock | "
+            "Remaining stock: old {stock_old:,.0f} + new {stock_new:,.0f} = {end_stock:,.0f} kg", ()),
+        REASON_HOLD_STOCK_FULL: (
+            _EN_PRODUCED + "excess {remaining:,.0f} kg: price above breakeven → hold {stock_new:,.0f} kg, "
+            "stock full, sell {dispose:,.0f} kg", ()),
+        REASON_HOLD_PROFITABLE: (
+            _EN_PRODUCED + "excess {remaining:,.0f} kg: price above breakeven "
+            "({price_plus_5:.2f} >= {breakeven:.2f} THB) → hold {stock_new:,.0f} kg", ()),
+        REASON_SELL_UNPROFITABLE: (
+            _EN_PRODUCED + "excess {remaining:,.0f} kg: price below breakeven "
+            "({price_plus_5:.2f} < {breakeven:.2f} THB) → sell {dispose:,.0f} kg", ()),
+        REASON_HOLD_PRICE_UNKNOWN: (
+            _EN_PRODUCED + "excess {remaining:,.0f} kg: price unknown → hold {stock_new:,.0f} kg",
+            (('dispose', ", sell overflow {dispose:,.0f} kg"),)),
+        REASON_NO_EXCESS: (
+            "Total latex {total:,.0f} kg (old stock {current_stock:,.0f} + new {R_today:,.0f}) → "
+            "produce {capacity:,} kg (all used)", ()),
+        REASON_OVER_LIMIT: (
+            "Total latex {total:,.0f} kg exceeds 80,000 → produce {capacity:,} kg",
+            (('stock_new', ", hold {stock_new:,.0f} kg"), ('dispose', ", sell {dispose:,.0f} kg"))),
+    },
+}
+# กรณี stock เต็มใช้ข้อความเดียวกับกรณีหลัก (ส่วน "ขายทิ้ง" ต่อท้ายเมื่อ dispose > 0)
+for _templates in _TEMPLATES.values():
+    _templates[REASON_PRICE_UNKNOWN_STOCK_FULL] = _templates[REASON_HOLD_PRICE_UNKNOWN]
+    _templates[REASON_OVER_LIMIT_STOCK_FULL] = _templates[REASON_OVER_LIMIT]
+
+
+# ข้อความของ utils.holding.holding_daily_decision - ตัดสินจากแผนการเก็บหลายวัน ไม่ใช่ราคาวันที่ +5 วันเดียว
+_HOLDING_TEMPLATES = {
+    'th': {
+        REASON_HOLD_STOCK_FULL: (
+            _TH_PRODUCED + "ส่วนเกิน {remaining:,.0f} กก.: แผนการเก็บคุ้มกว่าขายสด (ผลิตในอีก {hold_days} วัน "
+            "กำไรส่วนเพิ่ม {hold_margin_per_kg:.2f} บาท/กก.) → เก็บใหม่ {stock_new:,.0f} กก., "
+            "Stock เต็ม ขายทิ้ง {dispose:,.0f} กก.", ()),
+        REASON_HOLD_PROFITABLE: (
+            _TH_PRODUCED + "ส่วนเกิน {remaining:,.0f} กก.: แผนการเก็บคุ้มกว่าขายสด (ผลิตในอีก {hold_days} วัน "
+            "กำไรส่วนเพิ่ม {hold_margin_per_kg:.2f} บาท/กก.) → เก็บใหม่ {stock_new:,.0f} กก.", ()),
+        REASON_SELL_UNPROFITABLE: (
+            _TH_PRODUCED + "ส่วนเกิน {remaining:,.0f} กก.: ไม่มีวันผลิตที่คุ้มกว่าขายสด "
+            "(กำไรส่วนเพิ่มสูงสุด {hold_margin_per_kg:.2f} บาท/กก.) → ขายทิ้ง {dispose:,.0f} กก.", ()),
+    },
+    'en': {
+        REASON_HOLD_STOCK_FULL: (
+            _EN_PRODUCED + "excess {remaining:,.0f} kg: holding plan beats selling fresh (produce in {hold_days} days, "
+            "margin {hold_margin_per_kg:.2f} THB/kg) → hold {stock_new:,.0f} kg, stock full, sell {dispose:,.0f} kg", ()),
+        REASON_HOLD_PROFITABLE: (
+            _EN_PRODUCED + "excess {remaining:,.0f} kg: holding plan beats selling fresh (produce in {hold_days} days, "
+            "margin {hold_margin_per_kg:.2f} THB/kg) → hold {stock_new:,.0f} kg", ()),
+        REASON_SELL_UNPROFITABLE: (
+            _EN_PRODUCED + "excess {remaining:,.0f} kg: no production day beats selling fresh "
+            "(best margin {hold_margin_per_kg:.2f} THB/kg) → sell {dispose:,.0f} kg", ()),
+    },
+}
+HOLDING_REASONS = tuple(_HOLDING_TEMPLATES['th'])
+
+
+def _format(template, params):
+    text, suffixes = template
+    text = text.format(**params)
+    for name, suffix in suffixes:
+        if params[name] > 0:
+            text += suffix.format(**params)
+    return text
+
+
+@lru_cache(maxsize=None)
+def _template(language, code):
+    try:
+        return _TEMPLATES[language][code]
+    except KeyError:
+        raise ValueError(f"ไม่รู้จักรหัสเหตุผล {code} หรือภาษา '{language}'") from None
+
+
+def render_reason(code, params, language='th'):
+    """ข้อความเหตุผลจากรหัสและตัวเลข (params = reason_params ของ daily_decision)"""
+    return _format(_template(language, int(code)), params)
+
+
+def render_holding_reason(code, params, language='th'):
+    """
+    ข้อความเหตุผลของ holding_daily_decision (params ต้องมี hold_days, hold_margin_per_kg)
+    รหัสที่ไม่ได้ตัดสินจากแผนการเก็บใช้ข้อความเดียวกับ render_reason
+    """
+    code = int(code)
+    if code in HOLDING_REASONS:
+        return _format(_HOLDING_TEMPLATES[language][code], params)
+    return render_reason(code, params, language)
+
+
+def build_reason_params(engine, code, R_today, current_stock, price_today_fresh, price_plus_5,
+                        stock_old, stock_new, dispose):
+    """
+    reason_params ของ daily_decision สร้างจากผลแบบ batch (รหัส + ปริมาณของวันนั้น)
+    ใช้แสดงข้อความเหตุผลของผล simulate/batch ทีละแถว - ได้ค่าเดียวกับที่ daily_decision คืน
+    """
+    code = int(code)
+    capacity = engine.PRODUCTION_CAPACITY
+    params = {'total': R_today + current_stock, 'current_stock': current_stock, 'R_today': R_today,
+              'capacity': capacity}
+    if code in _EXCESS_REASONS:
+        used_fresh = capacity - current_stock
+        params.update(used_fresh=used_fresh, remaining=R_today - used_fresh)
+    if code in _PRICED_REASONS:
+        params.update(price_plus_5=price_plus_5,
+                      breakeven=engine.calculate_breakeven_price(price_today_fresh, storage_days=1))
+    params.update(stock_old=stock_old, stock_new=stock_new, dispose=dispose, end_stock=stock_old + stock_new)
+    return params
+
+
+def reason_label(code, language='th'):
+    """ชื่อสั้นของรหัสเหตุผล"""
+    return _LABELS[language][int(code)]
+
+
+def reason_codes(engine, R_today, current_stock, price_today_fresh, price_plus_5=None):
+    """
+    รหัสเหตุผลแบบ vectorized (ตรรกะเดียวกับ daily_decision)
+
+    Parameters:
+    - R_today, current_stock, price_today_fresh: array (broadcast ได้)
+    - price_plus_5: array หรือ None (NaN = ไม่ทราบราคา)
+
+    Returns:
+    - array uint8 ของรหัสเหตุผล
+    """
+    R_today = np.asarray(R_today, dtype=float)
+    current_stock = np.asarray(current_stock, dtype=float)
+    price_today_fresh = np.asarray(price_today_fresh, dtype=float)
+    price_plus_5 = np.full_like(price_today_fresh, np.nan) if price_plus_5 is None else np.asarray(price_plus_5, dtype=float)
+    R_today, current_stock, price_today_fresh, price_plus_5 = np.broadcast_arrays(
+        R_today, current_stock, price_today_fresh, price_plus_5)
+
+    capacity = engine.PRODUCTION_CAPACITY
+    total = R_today + current_stock
+    remaining = R_today - (capacity - current_stock)
+    overflow = remaining > engine.MAX_STOCK
+    known = ~np.isnan(price_plus_5)
+    with np.errstate(invalid='ignore'):
+        profitable = price_plus_5 >= engine.calculate_breakeven_price(price_today_fresh, storage_days=1)
+
+    # stock เดิมไม่พอผลิต: เลือกตามราคาวันที่ +5
+    excess = np.where(
+        known & (remaining > 0),
+        np.where(profitable,
+                 np.where(overflow, REASON_HOLD_STOCK_FULL, REASON_HOLD_PROFITABLE),
+                 REASON_SELL_UNPROFITABLE),
+        np.where(remaining > 0,
+                 np.where(overflow, REASON_PRICE_UNKNOWN_STOCK_FULL, REASON_HOLD_PRICE_UNKNOWN),
+                 REASON_NO_EXCESS))
+    # เกิน 80,000: stock เดิมพอผลิต → น้ำยางใหม่ทั้งหมดต้องเก็บในที่ว่างที่เหลือจาก stock เดิม
+    over_limit_full = np.where(current_stock >= capacity,
+                               R_today > engine.MAX_STOCK - (current_stock - capacity), overflow)
+    codes = np.select(
+        [total <= capacity, total >= OVER_LIMIT_TOTAL, current_stock >= capacity],
+        [REASON_PRODUCE_ALL, np.where(over_limit_full, REASON_OVER_LIMIT_STOCK_FULL, REASON_OVER_LIMIT),
+         REASON_STOCK_COVERS],
+        excess)
+    return codes.astype(REASON_DTYPE)
+
+
+def disposed_stock_full(codes):
+    """bool mask ของวันที่ขายทิ้งเพราะ stock เต็ม (ทุกกรณี ไม่นับการขายเพราะราคาไม่คุ้มทุน)"""
+    return np.isin(codes, STOCK_FULL_REASONS)
+
+
+def reason_counts(codes, language='th'):
+    """จำนวนวันของแต่ละเหตุผล {ชื่อสั้น: จำนวน} (เฉพาะที่พบ)"""
+    counts = np.bincount(np.asarray(codes, dtype=np.intp).ravel(), minlength=N_REASONS)
+    return {reason_label(code, language): int(count) for code, count in enumerate(counts) if count}
@@ -0,0 +1,227 @@
+"""
+สร้างรายงานประจำวัน (PDF + Excel) ของแต่ละโรงงานแบบขนาน
+
+รายงานแต่ละวันมี: การตัดสินใจของวัน, stock, กำไร/ขาดทุน และกราฟย้อนหลัง history_days วัน
+- กราฟวาดด้วย backend Agg ผ่าน Figure โดยตรง (ไม่ใช้ pyplot)
+- แต่ละ process สร้างแม่แบบกราฟ (Figure + แกน + เส้น) ครั้งเดียวแล้ว cache ไว้
+  รายงานถัดไปแค่เปลี่ยนข้อมูลของเส้นและข้อความ ไม่ต้องสร้าง Figure ใหม่
+- งานกระจายไปยัง ProcessPoolExecutor ทีละกลุ่ม
+- ข้อความในกราฟเป็นภาษาอังกฤษ ชื่อโรงงานภาษาไทยใส่ในกราฟเฉพาะเมื่อเครื่องมีฟอนต์ไทย (THAI_FONTS)
+  ไม่เช่นนั้นใช้รหัสโปรไฟล์แทน (DejaVu Sans ที่เป็นค่าเริ่มต้นไม่มีตัวอักษรไทย) - Excel ใช้ชื่อภาษาไทยเสมอ
+
+วิธีใช้ (จากไฟล์ข้อมูลรายวันแบบเดียวกับ utils.pipeline):
+    python -m utils.reports data/daily_intake.csv reports/ [ชื่อโรงงาน] [จำนวน process]
+(ถ้ามีโปรไฟล์ในโฟลเดอร์ profiles/ ชื่อเดียวกับโรงงาน จะใช้ค่าคงที่จากโปรไฟล์นั้น)
+"""
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import matplotlib
+matplotlib.use('Agg')
+from matplotlib import font_manager
+from matplotlib.backends.backend_pdf import PdfPages
+from matplotlib.figure import Figure
+import numpy as np
+import pandas as pd
+
+# คอลัมน์ที่รายงานต้องใช้
+REPORT_COLUMNS = ('date', 'R_today', 'price_today_fresh', 'produce', 'stock_old', 'stock_new', 'dispose', 'profit')
+
+EXCEL_HEADERS = {
+    'date': 'วันที่',
+    'R_today': 'น้ำยางเข้า (กก.)',
+    'price_today_fresh': 'ราคาน้ำยางสด (บาท/กก.)',
+    'produce': 'ผลิต (กก.)',
+    'stock_old': 'Stock เดิม (กก.)',
+    'stock_new': 'Stock ใหม่ (กก.)',
+    'dispose': 'ขายทิ้ง (กก.)',
+    'profit': 'กำไร (บาท)',
+}
+
+
+# ฟอนต์ที่มีตัวอักษรไทย (ใช้ตัวแรกที่ติดตั้งไว้)
+THAI_FONTS = ('Noto Sans Thai', 'Noto Sans Thai UI', 'Sarabun', 'TH Sarabun New', 'Loma', 'Garuda',
+              'Waree', 'Tahoma', 'Leelawadee UI')
+
+
+@lru_cache(maxsize=1)
+def thai_font():
+    """ชื่อฟอนต์ไทยที่ติดตั้งอยู่ หรือ None ถ้าไม่มี"""
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    return next((name for name in THAI_FONTS if name in installed), None)
+
+
+def chart_title_name(plant, plant_name=None):
+    """ชื่อโรงงานบนกราฟ - ชื่อที่แสดง (เช่นภาษาไทย) เฉพาะเมื่อมีฟอนต์ไทย ไม่เช่นนั้นใช้รหัส plant"""
+    if plant_name and plant_name != plant and thai_font() is not None:
+        return f"{plant_name} ({plant})"
+    return plant
+
+
+@lru_cache(maxsize=1)
+def _chart_template():
+    """แม่แบบกราฟของ process นี้ (สร้างครั้งเดียว)"""
+    fig = Figure(figsize=(11.69, 8.27))  # A4 แนวนอน
+    fig.subplots_adjust(left=0.08, right=0.97, top=0.84, bottom=0.07, hspace=0.45)
+    title = fig.text(0.08, 0.94, '', fontsize=16, fontweight='bold')
+    if thai_font() is not None:
+        title.set_fontfamily([thai_font(), 'DejaVu Sans'])
+    summary = fig.text(0.08, 0.88, '', fontsize=10, family='monospace')
+
+    ax_volume, ax_stock, ax_profit = fig.subplots(3, 1, sharex=True)
+    lines = {
+        'R_today': ax_volume.plot([], [], color='#64748b', label='intake')[0],
+        'produce': ax_volume.plot([], [], color='#22c55e', label='produce')[0],
+        'dispose': ax_volume.plot([], [], color='#dc2626', label='dispose')[0],
+        'stock_old': ax_stock.plot([], [], color='#3b82f6', label='old stock')[0],
+        'stock_total': ax_stock.plot([], [], color='#1e3a8a', label='total stock')[0],
+        'cumulative_profit': ax_profit.plot([], [], color='#7c3aed', label='cumulative profit')[0],
+    }
+    for line in lines.values():
+        line.set_drawstyle('steps-mid')
+    marker = [ax.axvline(0, color='black', linewidth=0.8, linestyle='--') for ax in (ax_volume, ax_stock, ax_profit)]
+
+    ax_volume.set_ylabel('kg/day')
+    ax_stock.set_ylabel('kg')
+    ax_profit.set_ylabel('THB')
+    ax_profit.set_xlabel('days relative to report date')
+    for ax in (ax_volume, ax_stock, ax_profit):
+        ax.grid(alpha=0.3)
+        ax.legend(loc='upper left', fontsize=8)
+    return fig, title, summary, (ax_volume, ax_stock, ax_profit), lines, marker
+
+
+def render_report_pdf(path, plant, window, report_index):
+    """
+    วาดรายงาน 1 วันลงไฟล์ PDF
+
+    Parameters:
+    - plant: ชื่อโรงงานบนกราฟ (ผลของ chart_title_name)
+    - window: dict ของ array ตาม REPORT_COLUMNS (ข้อมูลย้อนหลังจนถึงวันที่รายงาน)
+    - report_index: ตำแหน่งของวันที่รายงานใน window
+    """
+    fig, title, summary, axes, lines, marker = _chart_template()
+    x = np.arange(len(window['date'])) - report_index
+    stock_total = window['stock_old'] + window['stock_new']
+
+    lines['R_today'].set_data(x, window['R_today'])
+    lines['produce'].set_data(x, window['produce'])
+    lines['dispose'].set_data(x, window['dispose'])
+    lines['stock_old'].set_data(x, window['stock_old'])
+    lines['stock_total'].set_data(x, stock_total)
+    lines['cumulative_profit'].set_data(x, np.nancumsum(window['profit']))
+    for line in marker:
+        line.set_xdata([0, 0])
+    for ax in axes:
+        ax.relim()
+        ax.autoscale_view()
+
+    i = report_index
+    title.set_text(f"{plant} - daily report {window['date'][i]}")
+    profit = window['profit'][i]
+    summary.set_text(
+        f"intake {window['R_today'][i]:>10,.0f} kg   fresh price {window['price_today_fresh'][i]:>7.2f} THB/kg\n"
+        f"produce {window['produce'][i]:>9,.0f} kg   dispose {window['dispose'][i]:>10,.0f} kg   "
+        f"stock {stock_total[i]:>8,.0f} kg (old {window['stock_old'][i]:,.0f} + new {window['stock_new'][i]:,.0f})\n"
+        f"profit {'n/a' if np.isnan(profit) else f'{profit:,.2f} THB'}"
+    )
+
+    with PdfPages(path) as pdf:
+        pdf.savefig(fig)
+
+
+def write_report_excel(path, plant, window, report_index):
+    """เขียนรายงาน 1 วันเป็น Excel: แผ่นสรุปของวัน + แผ่นข้อมูลย้อนหลัง"""
+    frame = pd.DataFrame({EXCEL_HEADERS[name]: window[name] for name in REPORT_COLUMNS})
+    frame["Stock รวม (กก.)"] = window['stock_old'] + window['stock_new']
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        frame.iloc[[report_index]].T.reset_index().set_axis(['รายการ', plant], axis=1).to_excel(
+            writer, sheet_name='สรุปประจำวัน', index=False)
+        frame.to_excel(writer, sheet_name='ย้อนหลัง', index=False)
+
+
+def _render_batch(tasks):
+    """worker: สร้างรายงานหลายวัน (ใช้แม่แบบกราฟร่วมกันภายใน process)"""
+    paths = []
+    for output_dir, plant, plant_name, window, report_index in tasks:
+        name = f"{plant}_{window['date'][report_index]}"
+        pdf_path = os.path.join(output_dir, f"{name}.pdf")
+        excel_path = os.path.join(output_dir, f"{name}.xlsx")
+        render_report_pdf(pdf_path, chart_title_name(plant, plant_name), window, report_index)
+        write_report_excel(excel_path, plant_name or plant, window, report_index)
+        paths.append((pdf_path, excel_path))
+    return paths
+
+
+def generate_reports(frame, output_dir, plant='plant', history_days=30, workers=None, batch_size=25,
+                     plant_name=None):
+    """
+    สร้างรายงานทุกวันใน frame แบบขนาน
+
+    Parameters:
+    - frame: DataFrame รายวันของโรงงานเดียว เรียงตามวันที่ (คอลัมน์ตาม REPORT_COLUMNS)
+    - output_dir: โฟลเดอร์ผลลัพธ์ (ไฟล์ <plant>_<date>.pdf / .xlsx)
+    - plant: รหัสโรงงาน/โปรไฟล์ (ใช้ในชื่อไฟล์)
+    - history_days: จำนวนวันย้อนหลังในกราฟและแผ่นข้อมูล
+    - workers: จำนวน process (None = จำนวน CPU)
+    - batch_size: จำนวนรายงานต่องานที่ส่งให้ worker
+    - plant_name: ชื่อที่แสดงของโรงงาน (เช่น ชื่อภาษาไทยในโปรไฟล์, None = ใช้ plant)
+
+    Returns:
+    - list ของ (path PDF, path Excel)
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    columns = {name: frame[name].to_numpy() for name in REPORT_COLUMNS}
+    columns['date'] = frame['date'].astype(str).to_numpy()
+
+    tasks = []
+    for day in range(len(frame)):
+        start = max(0, day - history_days + 1)
+        window = {name: values[start:day + 1] for name, values in columns.items()}
+        tasks.append((output_dir, plant, plant_name, window, day - start))
+    batches = [tasks[i:i + batch_size] for i in range(0, len(tasks), batch_size)]
+
+    paths = []
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1) as pool:
+        for batch_paths in pool.map(_render_batch, batches):
+            paths.extend(batch_paths)
+    return paths
+
+
+def main():
+    from utils.pipeline import read_records, validate_chunked
+    from utils.profiles import DEFAULT_PROFILE, engine_from_profile, list_profiles, load_profile
+    from utils.simulation import simulate
+
+    if len(sys.argv) < 3:
+        print("วิธีใช้: python -m utils.reports <ไฟล์ข้อมูลรายวัน.csv> <โฟลเดอร์ผลลัพธ์> [ชื่อโรงงาน/โปรไฟล์] [จำนวน process]")
+        sys.exit(1)
+    input_path, output_dir = sys.argv[1], sys.argv[2]
+    plant = sys.argv[3] if len(sys.argv) > 3 else 'plant'
+    workers = int(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    # ใช้โปรไฟล์ที่ชื่อตรงกับชื่อโรงงาน (ถ้ามี) ไม่เช่นนั้นใช้โปรไฟล์ default
+    has_profile = plant in list_profiles()
+    profile = load_profile(plant if has_profile else DEFAULT_PROFILE)
+    engine = engine_from_profile(profile)
+    frame = pd.DataFrame(list(validate_chunked(
+        read_records(input_path), engine,
+        on_invalid=lambda record, message: print(f"ข้ามบรรทัด {record['line']}: {message}"))))
+    if frame.empty:
+        print(f"ไม่มีข้อมูลที่ถูกต้องใน {input_path} - ไม่สร้างรายงาน")
+        sys.exit(1)
+    prices = {name: frame[name].astype(float).to_numpy() for name in ('price_today_plus_4', 'price_today_plus_5')}
+    result = simulate(engine, frame['R_today'].to_numpy(), frame['price_today_fresh'].to_numpy(),
+                      prices['price_today_plus_4'], prices['price_today_plus_5'])
+    for name in ('produce', 'stock_old', 'stock_new', 'dispose', 'profit'):
+        frame[name] = result[name]
+
+    paths = generate_reports(frame, output_dir, plant, workers=workers,
+                             plant_name=profile['name'] if has_profile else None)
+    print(f"สร้างรายงาน {len(paths)} วัน ที่ {output_dir}")
+
+
+if __name__ == '__main__':
+    main()
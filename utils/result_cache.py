@@ -0,0 +1,169 @@
+"""
+cache ผลลัพธ์บนดิสก์แบบ content-addressed (ใช้ร่วมกันได้หลาย process)
+
+key = sha256 ของ (ค่าพารามิเตอร์ engine, fingerprint ของข้อมูล input, version ของโค้ด)
+ผลลัพธ์เก็บเป็น .npz (NumPy แบบบีบอัด) หนึ่งไฟล์ต่อ key
+
+- เขียนลงไฟล์ชั่วคราวในโฟลเดอร์เดียวกันแล้ว os.replace - worker อื่นจะเห็นไฟล์ครบหรือไม่เห็นเลย
+- ขนาดรวมเกิน max_bytes จะลบไฟล์ที่ใช้ล่าสุดนานที่สุดออกก่อน (LRU ตาม mtime ซึ่งถูกแตะทุกครั้งที่อ่าน)
+
+ตัวอย่าง:
+    cache = ResultCache()
+    key = cache_key(engine.get_config(), data_fingerprint(prices, intake))
+    result = cache.get_or_compute(key, lambda: run_backtest(...))
+"""
+import glob
+import hashlib
+import inspect
+import json
+import os
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'results')
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+@lru_cache(maxsize=32)  # หน้า streamlit สร้างฟังก์ชันใหม่ทุกครั้งที่ rerun
+def code_version(*functions):
+    """
+    hash ของซอร์สโค้ดใน utils/ - แก้โค้ดแล้ว key เปลี่ยน ผลเก่าจะไม่ถูกใช้
+
+    Parameters:
+    - functions: ฟังก์ชันที่อยู่นอก utils/ (เช่นในหน้า pages/) ที่คำนวณผลที่ cache - รวมซอร์สของฟังก์ชันใน hash ด้วย
+    """
+    digest = hashlib.sha256()
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    for function in functions:
+        digest.update(inspect.getsource(function).encode())
+    return digest.hexdigest()[:16]
+
+
+def _update_fingerprint(digest, value):
+    if isinstance(value, np.ndarray):
+        value = np.ascontiguousarray(value)
+        digest.update(f"ndarray:{value.dtype.str}:{value.shape}".encode())
+        digest.update(value.tobytes())
+    elif hasattr(value, 'to_numpy') and hasattr(value, 'columns'):
+        # DataFrame - ชื่อคอลัมน์ + ข้อมูลทีละคอลัมน์
+        digest.update(f"frame:{list(value.columns)}".encode())
+        for column in value.columns:
+            _update_fingerprint(digest, value[column].to_numpy())
+    elif isinstance(value, (list, tuple)):
+        digest.update(f"seq:{len(value)}".encode())
+        for item in value:
+            _update_fingerprint(digest, item)
+    elif isinstance(value, dict):
+        digest.update(f"dict:{len(value)}".encode())
+        for name in sorted(value):
+            digest.update(str(name).encode())
+            _update_fingerprint(digest, value[name])
+    else:
+        digest.update(repr(value).encode())
+
+
+def data_fingerprint(*values):
+    """fingerprint ของข้อมูล input (array, DataFrame, list, dict หรือค่าเดี่ยว)"""
+    digest = hashlib.sha256()
+    for value in values:
+        _update_fingerprint(digest, value)
+    return digest.hexdigest()
+
+
+def cache_key(config, fingerprint='', version=None):
+    """
+    Parameters:
+    - config: dict ค่าพารามิเตอร์ (เช่น engine.get_config() พร้อมค่าอื่นของการรัน)
+    - fingerprint: ผลของ data_fingerprint
+    - version: version ของโค้ด (None = code_version())
+    """
+    payload = json.dumps({
+        'config': config,
+        'data': fingerprint,
+        'code': code_version() if version is None else version,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResultCache:
+    def __init__(self, directory=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npz")
+
+    def get(self, key):
+        """คืน dict ของ array หรือ None ถ้าไม่มีใน cache"""
+        path = self._path(key)
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                result = {name: data[name] for name in data.files}
+        except (FileNotFoundError, OSError, ValueError):
+            # ไม่มีไฟล์ หรือถูก process อื่นลบระหว่างอ่าน
+            return None
+        try:
+            os.utime(path)  # บันทึกว่าเพิ่งใช้ (สำหรับ LRU)
+        except OSError:
+            pass  # ถูกลบหลังอ่านเสร็จ / แตะไฟล์ไม่ได้ - ข้อมูลที่อ่านแล้วยังใช้ได้
+        return result
+
+    def put(self, key, arrays):
+        """เก็บ dict ของ array แบบ atomic แล้วลบรายการเก่าถ้าขนาดรวมเกิน"""
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez_compressed(f, **arrays)
+            os.replace(temp_path, self._path(key))
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        self.evict()
+
+    def get_or_compute(self, key, compute):
+        """คืนผลจาก cache หรือเรียก compute() (คืน dict ของ array) แล้วเก็บไว้"""
+        result = self.get(key)
+        if result is None:
+            result = {name: np.asarray(value) for name, value in compute().items()}
+            self.put(key, result)
+        return result
+
+    def _entries(self):
+        entries = []
+        for path in glob.glob(os.path.join(self.directory, '*.npz')):
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    @property
+    def size_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self):
+        """ลบไฟล์ที่ไม่ได้ใช้นานที่สุดจนขนาดรวมไม่เกิน max_bytes"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass  # process อื่นลบไปแล้ว
+            total -= size
+
+    def clear(self):
+        for _, _, path in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
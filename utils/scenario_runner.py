@@ -0,0 +1,178 @@
+"""
+รัน scenario จำนวนมากแบบขนาน โดยแชร์เส้นทางราคา/น้ำยางเข้าผ่าน shared memory
+
+เส้นทาง (array ขนาด จำนวน scenario × จำนวนวัน) ถูกวางใน multiprocessing.shared_memory ครั้งเดียว
+worker แต่ละตัว attach เป็น NumPy view (ไม่ copy ไม่ pickle array ใหญ่) แล้วส่งกลับเฉพาะผลสรุป
+(StreamingRiskStats + ผลรวมต่อ scenario) ซึ่งมีขนาดเล็ก
+
+shared memory ถูกปิดและลบใน finally เสมอ แม้ worker จะ error
+ส่ง ResultCache ให้ run_scenarios เพื่อใช้ผลเดิมเมื่อรันชุดเส้นทางและพารามิเตอร์เดิมซ้ำ
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from utils.daily_decision import LatexDecisionEngine
+from utils.result_cache import cache_key, data_fingerprint
+from utils.simulation import simulate
+from utils.streaming_stats import StreamingRiskStats
+
+PATH_NAMES = ('R_today', 'price_fresh', 'price_plus_4', 'price_plus_5')
+
+
+def generate_paths(n_scenarios, days, seed=None, intake_mean=65000, intake_std=12000,
+                   fresh_start=45.0, sheet_premium=8.0, volatility=0.02):
+    """
+    สร้างเส้นทางสุ่มของน้ำยางเข้าและราคา
+
+    - ราคาน้ำยางสด: random walk แบบ log (ความผันผวนรายวัน volatility)
+    - ราคาแผ่นยาง: ราคาน้ำยางสด + ส่วนต่าง sheet_premium + noise
+    - price_plus_4 / price_plus_5: ราคาแผ่นยางอีก 4 / 5 วันข้างหน้าของแต่ละวัน
+
+    Returns:
+    - dict ของ array ขนาด (n_scenarios, days) ตาม PATH_NAMES
+    """
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, volatility, (n_scenarios, days + 5))
+    fresh = fresh_start * np.exp(np.cumsum(steps, axis=1))
+    sheet = fresh + sheet_premium + rng.normal(0.0, 1.0, fresh.shape)
+    intake = np.clip(rng.normal(intake_mean, intake_std, (n_scenarios, days)), 0, None).round()
+    return {
+        'R_today': intake,
+        'price_fresh': fresh[:, :days].round(2),
+        'price_plus_4': sheet[:, 4:days + 4].round(2),
+        'price_plus_5': sheet[:, 5:days + 5].round(2),
+    }
+
+
+class SharedArrays:
+    """กลุ่มของ array ใน shared memory - ใช้กับ with เพื่อให้ลบแน่นอน"""
+
+    def __init__(self, arrays):
+        self._blocks = []
+        self.spec = {}  # ชื่อ -> (ชื่อ block, shape, dtype) สำหรับส่งให้ worker
+        self.arrays = {}
+        try:
+            for name, array in arrays.items():
+                array = np.asarray(array)
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                self._blocks.append(block)
+                view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)
+                view[...] = array
+                self.arrays[name] = view
+                self.spec[name] = (block.name, array.shape, array.dtype.str)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """ปิดและลบ block ทั้งหมด"""
+        self.arrays.clear()  # ต้องปล่อย view ก่อนปิด buffer
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _attach(spec):
+    """attach block ทั้งหมดใน spec เป็น NumPy view (ไม่ copy)"""
+    blocks = []
+    arrays = {}
+    try:
+        for name, (block_name, shape, dtype) in spec.items():
+            block = shared_memory.SharedMemory(name=block_name)
+            blocks.append(block)
+            arrays[name] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    except BaseException:
+        arrays.clear()
+        for block in blocks:
+            block.close()
+        raise
+    return blocks, arrays
+
+
+def _run_chunk(spec, start, stop, config, initial_stock):
+    """worker: จำลอง scenario start..stop-1 แล้วคืนเฉพาะผลสรุป"""
+    engine = LatexDecisionEngine()
+    for name, value in config.items():
+        setattr(engine, name, value)
+
+    blocks, paths = _attach(spec)
+    try:
+        stats = StreamingRiskStats(metrics=('profit', 'dispose'))
+        total_profit = np.zeros(stop - start)
+        total_dispose = np.zeros(stop - start)
+        for i in range(start, stop):
+            result = simulate(engine, paths['R_today'][i], paths['price_fresh'][i],
+                              paths['price_plus_4'][i], paths['price_plus_5'][i], initial_stock)
+            stats.update(profit=result['profit'], dispose=result['dispose'])
+            total_profit[i - start] = result['profit'].sum()
+            total_dispose[i - start] = result['dispose'].sum()
+        return start, total_profit, total_dispose, stats
+    finally:
+        paths.clear()
+        for block in blocks:
+            block.close()
+
+
+def run_scenarios(engine, paths, initial_stock=0, workers=None, chunk_size=None, cache=None):
+    """
+    จำลองทุก scenario แบบขนาน
+
+    Parameters:
+    - engine: LatexDecisionEngine (ส่งให้ worker เฉพาะค่าคงที่)
+    - paths: dict ของ array (n_scenarios, days) ตาม PATH_NAMES เช่นจาก generate_paths()
+    - workers: จำนวน process (None = จำนวน CPU)
+    - chunk_size: จำนวน scenario ต่องาน (None = แบ่งเท่า ๆ กันตาม workers × 4)
+    - cache: ResultCache (None = ไม่ใช้) - key มาจากค่าคงที่ของ engine, initial_stock และข้อมูลเส้นทาง
+
+    Returns:
+    - dict: stats (StreamingRiskStats ของค่ารายวัน), total_profit, total_dispose (ผลรวมต่อ scenario)
+    """
+    config = engine.get_config()
+    if cache is None:
+        return _run_scenarios(config, paths, initial_stock, workers, chunk_size)
+
+    key = cache_key({'function': 'run_scenarios', 'engine': config, 'initial_stock': initial_stock},
+                    data_fingerprint({name: paths[name] for name in PATH_NAMES}))
+
+    def compute():
+        result = _run_scenarios(config, paths, initial_stock, workers, chunk_size)
+        stats = {f'stats.{name}': values for name, values in result.pop('stats').to_arrays().items()}
+        return {**result, **stats}
+
+    arrays = cache.get_or_compute(key, compute)
+    stats = StreamingRiskStats.from_arrays({name[len('stats.'):]: values for name, values in arrays.items()
+                                            if name.startswith('stats.')})
+    return {'stats': stats, 'total_profit': arrays['total_profit'], 'total_dispose': arrays['total_dispose']}
+
+
+def _run_scenarios(config, paths, initial_stock, workers, chunk_size):
+    n_scenarios = len(paths['R_today'])
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(1, -(-n_scenarios // (workers * 4)))
+
+    stats = StreamingRiskStats(metrics=('profit', 'dispose'))
+    total_profit = np.zeros(n_scenarios)
+    total_dispose = np.zeros(n_scenarios)
+
+    with SharedArrays({name: paths[name] for name in PATH_NAMES}) as shared:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_run_chunk, shared.spec, start, min(start + chunk_size, n_scenarios),
+                                   config, initial_stock)
+                       for start in range(0, n_scenarios, chunk_size)]
+            for future in futures:
+                start, chunk_profit, chunk_dispose, chunk_stats = future.result()
+                total_profit[start:start + len(chunk_profit)] = chunk_profit
+                total_dispose[start:start + len(chunk_dispose)] = chunk_dispose
+                stats.merge(chunk_stats)
+
+    return {'stats': stats, 'total_profit': total_profit, 'total_dispose': total_dispose}
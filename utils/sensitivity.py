@@ -0,0 +1,187 @@
+"""
+ความไวของกำไร (อนุพันธ์ย่อยเชิงวิเคราะห์) ต่อราคาและพารามิเตอร์ของโรงงาน
+
+ภายในแต่ละกรณีการตัดสินใจ ปริมาณ produce / stock_old / stock_new / dispose เป็นฟังก์ชันเชิงเส้น
+ของ R_today, current_stock, PRODUCTION_CAPACITY และ MAX_STOCK และกำไรเป็นเชิงเส้นในราคาและต้นทุน
+อนุพันธ์จึงคำนวณได้ตรง ๆ ทั้ง array ในครั้งเดียว แทนการเปลี่ยนค่าทีละตัวแล้วรันใหม่ (finite difference)
+
+อนุพันธ์ใช้ได้ภายในกรณีเดิมเท่านั้น - ที่ขอบระหว่างกรณี (เช่น ราคาวันที่ +5 เท่ากับจุดคุ้มทุนพอดี)
+กำไรไม่ต่อเนื่องและอนุพันธ์ไม่นิยาม
+
+กำไรรายวัน = produce × (ราคาแผ่นยาง - ราคาน้ำยางสด - ค่าเก็บรักษา - PRODUCTION_COST)
+           + dispose × (ราคาน้ำยางสด - TRANSPORT_COST_PER_20K / 20000)
+           - ค่าเก็บ stock ของวัน (ถ้า storage_accrual: stock_new × DAY1 + stock_old × DAY2_10 แบบเดียวกับ simulate)
+"""
+import numpy as np
+
+from utils.batch_decision import batch_daily_decision
+from utils.decision_regions import OVER_LIMIT_TOTAL, compile_regions
+from utils.simulation import simulate
+
+PARAMETERS = (
+    'price_today_fresh',
+    'price_sale_sheet',
+    'PRODUCTION_COST',
+    'STORAGE_COST_DAY1',
+    'STORAGE_COST_DAY2_10',
+    'TRANSPORT_COST_PER_20K',
+    'PRODUCTION_CAPACITY',
+    'MAX_STOCK',
+)
+
+PARAMETER_LABELS = {
+    'price_today_fresh': 'ราคาน้ำยางสด (บาท/กก.)',
+    'price_sale_sheet': 'ราคาขายแผ่นยาง (บาท/กก.)',
+    'PRODUCTION_COST': 'ต้นทุนการผลิต (บาท/กก.)',
+    'STORAGE_COST_DAY1': 'ค่าเก็บวันแรก (บาท/กก.)',
+    'STORAGE_COST_DAY2_10': 'ค่าเก็บวันที่ 2-10 (บาท/กก./วัน)',
+    'TRANSPORT_COST_PER_20K': 'ค่าขนส่งต่อ 20,000 กก. (บาท)',
+    'PRODUCTION_CAPACITY': 'กำลังการผลิต (กก./วัน)',
+    'MAX_STOCK': 'Stock สูงสุด (กก.)',
+}
+
+# ปริมาณที่อนุพันธ์ของกำไรต้องใช้
+_QUANTITIES = ('produce', 'stock_old', 'stock_new', 'dispose')
+
+
+def _quantity_derivatives(engine, R_today, current_stock, price_today_fresh, price_today_plus_5):
+    """
+    อนุพันธ์ของปริมาณแต่ละตัวต่อ PRODUCTION_CAPACITY, MAX_STOCK และ current_stock (ภายในกรณีเดิม)
+
+    Returns:
+    - dict: ชื่อตัวแปร -> dict ของ array ต่อปริมาณใน _QUANTITIES
+    """
+    table = compile_regions(engine)
+    capacity = engine.PRODUCTION_CAPACITY
+    total = R_today + current_stock
+    produce_all = total <= capacity
+    over_limit = ~produce_all & (total >= OVER_LIMIT_TOTAL)
+    covers = ~produce_all & (current_stock >= capacity)
+    overflow = total > capacity + engine.MAX_STOCK
+    with np.errstate(invalid='ignore'):
+        hold_ok = np.isnan(price_today_plus_5) | (price_today_plus_5 >= table.breakeven_price(price_today_fresh))
+
+    # ส่วนเกินที่เก็บเข้า stock แบบ min(R + S - CAP, MAX_STOCK) (stock เดิมไม่พอผลิต)
+    capped_excess = ~produce_all & ~covers & (over_limit | hold_ok)
+    # stock เดิมพอผลิต และน้ำยางรวม >= 80,000: เก็บได้ min(R, MAX_STOCK - (S - CAP))
+    covered_over_limit = covers & over_limit
+
+    zeros = np.zeros(np.shape(total))
+    one = np.ones(np.shape(total))
+    produce = {
+        'PRODUCTION_CAPACITY': np.where(produce_all, 0.0, 1.0),
+        'MAX_STOCK': zeros,
+        'current_stock': np.where(produce_all, 1.0, 0.0),
+    }
+    stock_old = {
+        'PRODUCTION_CAPACITY': np.where(covers, -1.0, 0.0),
+        'MAX_STOCK': zeros,
+        'current_stock': np.where(covers, 1.0, 0.0),
+    }
+    stock_new = {
+        'PRODUCTION_CAPACITY': np.select([capped_excess & ~overflow, covered_over_limit & overflow], [-one, one], 0.0),
+        'MAX_STOCK': np.where((capped_excess | covered_over_limit) & overflow, 1.0, 0.0),
+        'current_stock': np.select([capped_excess & ~overflow, covered_over_limit & overflow], [one, -one], 0.0),
+    }
+    # dispose = R + S - produce - stock_old - stock_new (น้ำยางทุก กก. ต้องไปที่ใดที่หนึ่ง)
+    dispose = {
+        name: (1.0 if name == 'current_stock' else 0.0) - produce[name] - stock_old[name] - stock_new[name]
+        for name in produce
+    }
+    derivatives = {}
+    for name in produce:
+        derivatives[name] = {'produce': produce[name], 'stock_old': stock_old[name],
+                             'stock_new': stock_new[name], 'dispose': dispose[name]}
+    return derivatives
+
+
+def _profit_weights(engine, price_today_fresh, price_sale_sheet, storage_days, storage_accrual):
+    """กำไรต่อ กก. ของแต่ละปริมาณ (d กำไร / d ปริมาณ)"""
+    return {
+        'produce': price_sale_sheet - price_today_fresh - engine.calculate_storage_cost(storage_days)
+                   - engine.PRODUCTION_COST,
+        'dispose': price_today_fresh - engine.TRANSPORT_COST_PER_20K / 20000,
+        'stock_new': -engine.STORAGE_COST_DAY1 if storage_accrual else 0.0,
+        'stock_old': -engine.STORAGE_COST_DAY2_10 if storage_accrual else 0.0,
+    }
+
+
+def _direct_partials(engine, decision, price_today_fresh, storage_days, storage_accrual):
+    """อนุพันธ์ของกำไรต่อราคาและต้นทุน (ปริมาณคงที่)"""
+    produce = decision['produce']
+    dispose = decision['dispose']
+    accrual = 1.0 if storage_accrual else 0.0
+    return {
+        'price_today_fresh': dispose - produce,
+        'price_sale_sheet': produce,
+        'PRODUCTION_COST': -produce,
+        'STORAGE_COST_DAY1': -produce * (storage_days >= 1) - accrual * decision['stock_new'],
+        'STORAGE_COST_DAY2_10': -produce * max(storage_days - 1, 0) - accrual * decision['stock_old'],
+        'TRANSPORT_COST_PER_20K': -dispose / 20000,
+    }
+
+
+def daily_sensitivities(engine, R_today, current_stock, price_today_fresh, price_sale_sheet,
+                        price_today_plus_5=None, storage_days=0, storage_accrual=False):
+    """
+    อนุพันธ์ของกำไรรายวันต่อราคาและพารามิเตอร์ (current_stock คงที่)
+
+    Parameters:
+    - R_today, current_stock, price_today_fresh, price_sale_sheet: ค่าเดียวหรือ array (broadcast ได้)
+    - price_today_plus_5: ใช้ตัดสินใจเก็บ/ขาย (None/NaN = ไม่ทราบ)
+    - storage_days: เหมือน calculate_costs_and_revenue
+    - storage_accrual: รวมค่าเก็บ stock ของวัน (True = กำไรแบบ simulate)
+
+    Returns:
+    - dict: ชื่อพารามิเตอร์ (PARAMETERS) -> array ของ d กำไร / d พารามิเตอร์
+    """
+    R_today, current_stock, price_today_fresh, price_sale_sheet = np.broadcast_arrays(
+        *[np.asarray(value, dtype=float) for value in (R_today, current_stock, price_today_fresh, price_sale_sheet)])
+    price_today_plus_5 = np.broadcast_to(
+        np.asarray(np.nan if price_today_plus_5 is None else price_today_plus_5, dtype=float), R_today.shape)
+
+    decision = batch_daily_decision(engine, R_today, current_stock, price_today_fresh, price_today_plus_5)
+    result = _direct_partials(engine, decision, price_today_fresh, storage_days, storage_accrual)
+
+    weights = _profit_weights(engine, price_today_fresh, price_sale_sheet, storage_days, storage_accrual)
+    quantities = _quantity_derivatives(engine, R_today, current_stock, price_today_fresh, price_today_plus_5)
+    for name in ('PRODUCTION_CAPACITY', 'MAX_STOCK'):
+        result[name] = sum(weights[q] * quantities[name][q] for q in _QUANTITIES)
+    return result
+
+
+def cumulative_sensitivities(engine, R_today, price_today_fresh, price_plus_4, price_plus_5=None, initial_stock=0):
+    """
+    อนุพันธ์ของกำไรรวมทั้งช่วง (กำไรแบบ simulate) เมื่อเลื่อนราคา/พารามิเตอร์ทุกวันเท่ากัน
+
+    การเปลี่ยน PRODUCTION_CAPACITY / MAX_STOCK ทำให้ stock ของวันถัดไปเปลี่ยน -
+    ส่งผลต่อเนื่องด้วย forward-mode (d stock วันถัดไป / d พารามิเตอร์) วันละครั้ง
+
+    Returns:
+    - dict: ชื่อพารามิเตอร์ -> d กำไรรวม / d พารามิเตอร์
+    """
+    result = simulate(engine, R_today, price_today_fresh, price_plus_4, price_plus_5, initial_stock)
+    days = len(result['produce'])
+    price_fresh = np.broadcast_to(np.asarray(price_today_fresh, dtype=float), (days,))
+    price_sheet = np.broadcast_to(np.asarray(np.nan if price_plus_4 is None else price_plus_4, dtype=float), (days,))
+    price_p5 = np.broadcast_to(np.asarray(np.nan if price_plus_5 is None else price_plus_5, dtype=float), (days,))
+    R_today = np.asarray(R_today, dtype=float)
+
+    direct = _direct_partials(engine, result, price_fresh, 0, True)
+    totals = {name: float(np.sum(values)) for name, values in direct.items()}
+
+    weights = _profit_weights(engine, price_fresh, price_sheet, 0, True)
+    quantities = _quantity_derivatives(engine, R_today, result['current_stock'], price_fresh, price_p5)
+    # กำไรและ stock วันถัดไปต่อ current_stock / พารามิเตอร์ ของแต่ละวัน
+    profit_per_stock = sum(weights[q] * quantities['current_stock'][q] for q in _QUANTITIES)
+    carry_per_stock = quantities['current_stock']['stock_old'] + quantities['current_stock']['stock_new']
+    for name in ('PRODUCTION_CAPACITY', 'MAX_STOCK'):
+        profit_direct = sum(weights[q] * quantities[name][q] for q in _QUANTITIES)
+        carry_direct = quantities[name]['stock_old'] + quantities[name]['stock_new']
+        stock_gradient = 0.0  # d current_stock / d พารามิเตอร์
+        total = 0.0
+        for t in range(days):
+            total += profit_direct[t] + profit_per_stock[t] * stock_gradient
+            stock_gradient = carry_direct[t] + carry_per_stock[t] * stock_gradient
+        totals[name] = float(total)
+    return totals
@@ -0,0 +1,189 @@
+"""
+จำลองการตัดสินใจต่อเนื่องหลายวัน (multi-day replay)
+
+stock ของแต่ละวันขึ้นกับผลของวันก่อนหน้า (current_stock วันถัดไป = stock_old + stock_new)
+จึง vectorize ข้ามวันไม่ได้ - ต้องวน loop ทีละวัน
+
+- ถ้าติดตั้ง numba: ใช้ kernel ที่ compile แล้ว (สูตรเดียวกับ daily_decision) เร็วกว่าหลายสิบเท่า
+- ถ้าไม่มี: วน loop เรียก LatexDecisionEngine.daily_decision ตามปกติ
+
+ค่าเก็บรักษาคิดรายวัน: stock ใหม่ที่เก็บวันนี้ STORAGE_COST_DAY1 บาท/กก.
+และ stock เดิมที่ค้างข้ามวัน STORAGE_COST_DAY2_10 บาท/กก./วัน
+"""
+import numpy as np
+
+from utils.reason_codes import reason_codes
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# เกณฑ์น้ำยางรวมที่ต้องขายส่วนเกิน (ค่าเดียวกับใน daily_decision)
+OVER_LIMIT_TOTAL = 80000
+
+OUTPUTS = ('current_stock', 'produce', 'stock_old', 'stock_new', 'dispose', 'storage_cost', 'profit')
+
+
+def _replay_python(engine, R_today, price_fresh, price_plus_4, price_plus_5, initial_stock):
+    """วน loop ด้วย LatexDecisionEngine (ราคา NaN = ไม่ทราบ)"""
+    days = len(R_today)
+    result = {name: np.zeros(days) for name in OUTPUTS}
+    stock = initial_stock
+
+    for t in range(days):
+        p5 = None if np.isnan(price_plus_5[t]) else float(price_plus_5[t])
+        decision = engine.daily_decision(R_today[t], stock, price_fresh[t], None, p5)
+        finance = engine.calculate_costs_and_revenue(decision, price_fresh[t], price_plus_4[t])
+        storage_cost = decision['stock_new'] * engine.STORAGE_COST_DAY1 + decision['stock_old'] * engine.STORAGE_COST_DAY2_10
+
+        result['current_stock'][t] = stock
+        result['produce'][t] = decision['produce']
+        result['stock_old'][t] = decision['stock_old']
+        result['stock_new'][t] = decision['stock_new']
+        result['dispose'][t] = decision['dispose']
+        result['storage_cost'][t] = storage_cost
+        result['profit'][t] = finance['profit'] - storage_cost
+        stock = decision['stock_old'] + decision['stock_new']
+    return result
+
+
+def _replay_kernel(R_today, price_fresh, price_plus_4, price_plus_5, initial_stock, capacity, max_stock,
+                   production_cost, transport_per_kg, transport_per_20k, storage_day1, storage_day2_10, out):
+    """
+    kernel ของการวน loop (สูตรและลำดับการคำนวณเดียวกับ daily_decision / calculate_costs_and_revenue)
+
+    out: array ขนาด (len(OUTPUTS), จำนวนวัน) ตามลำดับ OUTPUTS
+    """
+    stock = initial_stock
+    hold_extra_cost = storage_day1 + production_cost  # ค่าเก็บ 1 วัน + ต้นทุนการผลิต
+    for t in range(R_today.shape[0]):
+        R = R_today[t]
+        fresh = price_fresh[t]
+        total = R + stock
+        produce = 0.0
+        stock_old = 0.0
+        stock_new = 0.0
+        dispose = 0.0
+
+        if total <= capacity:
+            produce = total
+        else:
+            produce = capacity
+            if stock >= capacity:
+                stock_old = stock - capacity
+                if total < OVER_LIMIT_TOTAL:
+                    stock_new = R
+                else:
+                    stock_new = min(R, max_stock - stock_old)
+                    dispose = R - stock_new
+            else:
+                remaining = R - (capacity - stock)
+                p5 = price_plus_5[t]
+                if total < OVER_LIMIT_TOTAL and not np.isnan(p5) and p5 < (fresh - transport_per_kg) + hold_extra_cost:
+                    # ราคาไม่คุ้มทุน ขายส่วนเกินทิ้ง
+                    dispose = remaining
+                else:
+                    stock_new = min(remaining, max_stock)
+                    if remaining > max_stock:
+                        dispose = remaining - max_stock
+
+        # กำไร (calculate_costs_and_revenue, storage_days=0) หักค่าเก็บรักษาของวันนี้
+        total_cost = 0.0
+        total_revenue = 0.0
+        if produce > 0:
+            total_cost += produce * (fresh + 0 + production_cost)
+            total_revenue += produce * price_plus_4[t]
+        if dispose > 0:
+            total_cost += dispose / 20000 * transport_per_20k
+            total_revenue += dispose * fresh
+        storage_cost = stock_new * storage_day1 + stock_old * storage_day2_10
+
+        out[0, t] = stock
+        out[1, t] = produce
+        out[2, t] = stock_old
+        out[3, t] = stock_new
+        out[4, t] = dispose
+        out[5, t] = storage_cost
+        out[6, t] = (total_revenue - total_cost) - storage_cost
+        stock = stock_old + stock_new
+
+
+if numba is not None:
+    _compiled_kernel = numba.njit(cache=True)(_replay_kernel)
+else:
+    _compiled_kernel = None
+
+
+def jit_available():
+    return _compiled_kernel is not None
+
+
+def _replay_jit(engine, R_today, price_fresh, price_plus_4, price_plus_5, initial_stock, kernel=None):
+    kernel = kernel or _compiled_kernel
+    out = np.zeros((len(OUTPUTS), len(R_today)))
+    kernel(R_today, price_fresh, price_plus_4, price_plus_5, float(initial_stock),
+           float(engine.PRODUCTION_CAPACITY), float(engine.MAX_STOCK), float(engine.PRODUCTION_COST),
+           engine.TRANSPORT_COST_PER_20K / 20000, float(engine.TRANSPORT_COST_PER_20K),
+           float(engine.STORAGE_COST_DAY1), float(engine.STORAGE_COST_DAY2_10), out)
+    return dict(zip(OUTPUTS, out))
+
+
+def _as_days(values, days):
+    """แปลงเป็น array float ยาวเท่าจำนวนวัน (None = ไม่ทราบราคา = NaN)"""
+    if values is None:
+        return np.full(days, np.nan)
+    return np.broadcast_to(np.asarray(values, dtype=float), (days,)).copy()
+
+
+def simulate(engine, R_today, price_today_fresh, price_plus_4=None, price_plus_5=None,
+             initial_stock=0, use_jit=None):
+    """
+    จำลองการตัดสินใจต่อเนื่องหลายวัน
+
+    Parameters:
+    - engine: LatexDecisionEngine
+    - R_today: น้ำยางเข้ารายวัน (array)
+    - price_today_fresh: ราคาน้ำยางสดรายวัน (array หรือค่าเดียว)
+    - price_plus_4: ราคาขายแผ่นยางของน้ำยางแต่ละวัน (ใช้คิดกำไร, None/NaN = ไม่ทราบ)
+    - price_plus_5: ราคาแผ่นยางวันที่ +5 ของแต่ละวัน (ใช้ตัดสินใจเก็บ/ขาย, None/NaN = ไม่ทราบ)
+    - initial_stock: stock ก่อนวันแรก (กก.)
+    - use_jit: None = ใช้ numba ถ้ามี, True = บังคับใช้, False = ใช้ engine ปกติ
+
+    Returns:
+    - dict ของ array รายวัน: current_stock, produce, stock_old, stock_new, dispose, storage_cost, profit
+      และ reason_code (uint8 ดู utils.reason_codes)
+    """
+    R_today = np.asarray(R_today, dtype=float)
+    days = len(R_today)
+    price_fresh = _as_days(price_today_fresh, days)
+    price_plus_4 = _as_days(price_plus_4, days)
+    price_plus_5 = _as_days(price_plus_5, days)
+
+    if use_jit is None:
+        use_jit = jit_available()
+    if use_jit:
+        if not jit_available():
+            raise RuntimeError("ไม่ได้ติดตั้ง numba - ใช้ use_jit=False หรือ None")
+        result = _replay_jit(engine, R_today, price_fresh, price_plus_4, price_plus_5, initial_stock)
+    else:
+        result = _replay_python(engine, R_today, price_fresh, price_plus_4, price_plus_5, initial_stock)
+    # รหัสเหตุผลคำนวณจาก stock ของแต่ละวันแบบ vectorized (ไม่ต้องเก็บข้อความรายวัน)
+    result['reason_code'] = reason_codes(engine, R_today, result['current_stock'], price_fresh, price_plus_5)
+    return result
+
+
+def verify_kernel(engine, R_today, price_today_fresh, price_plus_4=None, price_plus_5=None, initial_stock=0):
+    """
+    ตรวจว่า kernel ให้ผลเหมือน engine ปกติทุกค่า (ใช้ kernel แบบ Python ถ้าไม่มี numba)
+
+    Returns:
+    - True ถ้าเหมือนกันทุกค่า (NaN ตรงกับ NaN)
+    """
+    R_today = np.asarray(R_today, dtype=float)
+    days = len(R_today)
+    args = (R_today, _as_days(price_today_fresh, days), _as_days(price_plus_4, days),
+            _as_days(price_plus_5, days), initial_stock)
+    expected = _replay_python(engine, *args)
+    actual = _replay_jit(engine, *args, kernel=_compiled_kernel or _replay_kernel)
+    return all(np.array_equal(expected[name], actual[name], equal_nan=True) for name in OUTPUTS)
@@ -0,0 +1,161 @@
+"""
+บัญชี stock แบบ event-sourced พร้อม snapshot ทุก N วัน
+
+ทุกการเคลื่อนไหวของน้ำยางบันทึกเป็น event (รับเข้า / ผลิต / เก็บ / ขายทิ้ง) แบบต่อท้ายอย่างเดียว
+สถานะ stock ของวันใด ๆ สร้างใหม่จาก snapshot ที่ใกล้ที่สุดก่อนวันนั้น แล้ว replay event
+ไม่เกิน N วัน (ไม่ต้อง replay ตั้งแต่วันแรก)
+
+สถานะใช้ความหมายเดียวกับผลของ daily_decision:
+- stock_old: stock เดิมที่เหลือหลังผลิตวันนั้น
+- stock_new: stock ใหม่ที่เก็บจากน้ำยางวันนั้น
+- stock_old + stock_new = current_stock ของวันถัดไป
+"""
+from bisect import bisect_right
+
+# ชนิดของ event
+EVENT_INTAKE = 0  # น้ำยางสดเข้ามา
+EVENT_PRODUCE = 1  # นำน้ำยางไปผลิต
+EVENT_HOLD = 2  # เก็บน้ำยางวันนี้เข้า stock
+EVENT_DISPOSE = 3  # ขายน้ำยางสดทิ้ง
+
+EVENT_NAMES = {
+    EVENT_INTAKE: 'intake',
+    EVENT_PRODUCE: 'produce',
+    EVENT_HOLD: 'hold',
+    EVENT_DISPOSE: 'dispose',
+}
+
+
+def _empty_state(day):
+    return {
+        'day': day,
+        'stock_old': 0.0,
+        'stock_new': 0.0,
+        'total_intake': 0.0,
+        'total_produce': 0.0,
+        'total_dispose': 0.0,
+    }
+
+
+class StockLedger:
+    def __init__(self, snapshot_interval=30, initial_stock=0.0):
+        """
+        Parameters:
+        - snapshot_interval: เก็บ snapshot ทุกกี่วัน (N)
+        - initial_stock: stock ตั้งต้นก่อน event แรก (กก.)
+        """
+        self.snapshot_interval = snapshot_interval
+        self.initial_stock = initial_stock
+
+        # event (ต่อท้ายอย่างเดียว เรียงตามวัน)
+        self._days = []
+        self._kinds = []
+        self._amounts = []
+
+        # snapshot: สถานะ ณ สิ้นวัน และตำแหน่ง event ถัดไป
+        self._snapshot_days = []
+        self._snapshots = []
+        self._snapshot_offsets = []
+        self._snapshot_bucket = -1  # ช่วง N วันล่าสุดที่มี snapshot แล้ว
+
+        self._first_day = None
+        self._open_day = None  # วันที่กำลังบันทึก event (ยังไม่ปิดวัน)
+
+    def __len__(self):
+        return len(self._days)
+
+    def record(self, day, kind, amount):
+        """บันทึก event 1 รายการ (วันต้องไม่ย้อนหลัง)"""
+        if self._open_day is not None and day < self._open_day:
+            raise ValueError(f"ไม่สามารถบันทึกย้อนหลังได้: วัน {day} < วัน {self._open_day}")
+        if kind not in EVENT_NAMES:
+            raise ValueError(f"ชนิด event ไม่ถูกต้อง: {kind}")
+
+        if self._open_day is not None and day > self._open_day:
+            self._close_day(self._open_day)
+        if self._first_day is None:
+            self._first_day = day
+
+        self._open_day = day
+        self._days.append(day)
+        self._kinds.append(kind)
+        self._amounts.append(float(amount))
+
+    def record_decision(self, day, R_today, decision):
+        """บันทึกผลของ daily_decision ทั้งวันเป็น event รับเข้า / ผลิต / เก็บ / ขายทิ้ง"""
+        self.record(day, EVENT_INTAKE, R_today)
+        self.record(day, EVENT_PRODUCE, decision['produce'])
+        self.record(day, EVENT_HOLD, decision['stock_new'])
+        self.record(day, EVENT_DISPOSE, decision['dispose'])
+
+    def _close_day(self, day):
+        """
+        ปิดวัน - เก็บ snapshot เมื่อวันนี้อยู่ในช่วง N วันที่ยังไม่มี snapshot
+        (วันที่ไม่มี event ถูกข้ามได้ จึงเทียบช่วงแทนการหาวันที่ครบรอบพอดี)
+        """
+        bucket = (day - self._first_day) // self.snapshot_interval
+        if bucket <= self._snapshot_bucket:
+            return
+        self._snapshot_bucket = bucket
+        state = self.state_at(day)
+        self._snapshot_days.append(day)
+        self._snapshots.append(state)
+        self._snapshot_offsets.append(len(self._days))
+
+    def state_at(self, day):
+        """
+        สถานะ stock ณ สิ้นวัน day
+
+        Returns:
+        - dict: day, stock_old, stock_new, total_intake, total_produce, total_dispose
+        """
+        i = bisect_right(self._snapshot_days, day) - 1
+        if i >= 0:
+            state = dict(self._snapshots[i])
+            offset = self._snapshot_offsets[i]
+        else:
+            state = _empty_state(self._first_day)
+            state['stock_old'] = self.initial_stock
+            offset = 0
+
+        # replay event หลัง snapshot จนถึงสิ้นวัน day
+        current_day = state['day']
+        for j in range(offset, len(self._days)):
+            event_day = self._days[j]
+            if event_day > day:
+                break
+            if event_day != current_day:
+                # เริ่มวันใหม่: stock ทั้งหมดกลายเป็น stock เดิม
+                state['stock_old'] += state['stock_new']
+                state['stock_new'] = 0.0
+                current_day = event_day
+
+            kind = self._kinds[j]
+            amount = self._amounts[j]
+            if kind == EVENT_INTAKE:
+                state['stock_old'] += amount
+                state['total_intake'] += amount
+            elif kind == EVENT_PRODUCE:
+                state['stock_old'] -= amount
+                state['total_produce'] += amount
+            elif kind == EVENT_HOLD:
+                # น้ำยางวันนี้ที่เก็บ ย้ายจากยอดรวมมาเป็น stock ใหม่
+                state['stock_old'] -= amount
+                state['stock_new'] += amount
+            else:
+                state['stock_old'] -= amount
+                state['total_dispose'] += amount
+
+        if current_day is not None and day > current_day:
+            # วันที่ไม่มี event - stock ทั้งหมดเป็น stock เดิม
+            state['stock_old'] += state['stock_new']
+            state['stock_new'] = 0.0
+        state['day'] = day
+        return state
+
+    def current_stock_for(self, day):
+        """stock ตั้งต้นของวัน day (= stock_old + stock_new ณ สิ้นวันก่อนหน้า) สำหรับส่งให้ daily_decision"""
+        if self._first_day is None or day <= self._first_day:
+            return self.initial_stock
+        state = self.state_at(day - 1)
+        return state['stock_old'] + state['stock_new']
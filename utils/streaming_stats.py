@@ -0,0 +1,234 @@
+"""
+สถิติแบบ streaming สำหรับผลของ Monte Carlo / backtest
+
+ไม่ต้องเก็บค่ากำไรรายวันทั้งหมดเพื่อหา percentile - อัปเดตทีละ batch ด้วยหน่วยความจำคงที่
+และ merge ผลจากหลาย process ได้ (ทุก class pickle ได้)
+
+- RunningMoments: ค่าเฉลี่ยและความแปรปรวน (Welford / Chan)
+- QuantileSketch: sketch ของ quantile แบบ KLL (error ~ 1/k ของอันดับ)
+- StreamingRiskStats: รวมทั้งสองอย่างต่อ metric (profit, dispose, ...) พร้อม P5/P50/P95 และ expected shortfall
+"""
+import numpy as np
+
+
+def _as_values(values):
+    """แปลงเป็น array 1 มิติ ตัด NaN ออก"""
+    values = np.asarray(values, dtype=float).ravel()
+    return values[~np.isnan(values)]
+
+
+class RunningMoments:
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0  # ผลรวมกำลังสองของส่วนเบี่ยงเบน
+
+    def _combine(self, count, mean, m2):
+        # สูตรรวมของ Chan et al.
+        if count == 0:
+            return
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def update(self, values):
+        """เพิ่มค่าทีละ batch"""
+        values = _as_values(values)
+        if values.size == 0:
+            return
+        mean = values.mean()
+        self._combine(values.size, mean, float(((values - mean) ** 2).sum()))
+
+    def merge(self, other):
+        """รวมผลจาก RunningMoments อื่น (เช่น จาก worker process)"""
+        self._combine(other.count, other.mean, other._m2)
+
+    @property
+    def variance(self):
+        """ความแปรปรวนตัวอย่าง (ddof=1)"""
+        return self._m2 / (self.count - 1) if self.count > 1 else float('nan')
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.variance))
+
+
+class QuantileSketch:
+    def __init__(self, k=200, seed=None):
+        """
+        Parameters:
+        - k: ขนาดของ compactor ชั้นบนสุด (มาก = แม่นขึ้น ใช้หน่วยความจำมากขึ้น)
+        - seed: seed ของการสุ่มตอนบีบอัด
+        """
+        self.k = k
+        self.count = 0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self._levels = [np.empty(0)]  # ชั้นที่ i มีน้ำหนักต่อค่า 2**i
+        self._rng = np.random.default_rng(seed)
+
+    def _capacity(self, level):
+        depth = len(self._levels) - level - 1
+        return max(int(np.ceil(self.k * (2 / 3) ** depth)), 2)
+
+    def _compress(self):
+        # บีบอัดชั้นที่เกินความจุ: เรียงแล้วเลื่อนค่าเว้นค่าขึ้นชั้นถัดไป (น้ำหนักเพิ่มเป็นสองเท่า)
+        changed = True
+        while changed:
+            changed = False
+            level = 0
+            while level < len(self._levels):
+                items = self._levels[level]
+                if items.size > self._capacity(level):
+                    if level + 1 == len(self._levels):
+                        self._levels.append(np.empty(0))
+                    items = np.sort(items)
+                    # จำนวนคี่ - เก็บค่าสุดท้ายไว้ที่ชั้นเดิม
+                    leftover = items[-1:] if items.size % 2 else items[:0]
+                    pairs = items[:items.size - leftover.size]
+                    promoted = pairs[self._rng.integers(2)::2]
+                    self._levels[level + 1] = np.concatenate([self._levels[level + 1], promoted])
+                    self._levels[level] = leftover
+                    changed = True
+                level += 1
+
+    def update(self, values):
+        """เพิ่มค่าทีละ batch"""
+        values = _as_values(values)
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._levels[0] = np.concatenate([self._levels[0], values])
+        self._compress()
+
+    def merge(self, other):
+        """รวม sketch อื่น (ต้องเป็นข้อมูลคนละชุดกัน)"""
+        while len(self._levels) < len(other._levels):
+            self._levels.append(np.empty(0))
+        for level, items in enumerate(other._levels):
+            self._levels[level] = np.concatenate([self._levels[level], items])
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+
+    @property
+    def size(self):
+        """จำนวนค่าที่เก็บอยู่จริงใน sketch"""
+        return sum(items.size for items in self._levels)
+
+    def _weighted_items(self):
+        values = np.concatenate(self._levels)
+        weights = np.concatenate([np.full(items.size, 2.0 ** level) for level, items in enumerate(self._levels)])
+        order = np.argsort(values, kind='stable')
+        return values[order], weights[order]
+
+    def quantile(self, q):
+        """ประมาณค่า quantile (q อยู่ในช่วง 0..1 รับได้ทั้งค่าเดียวและ array)"""
+        if self.count == 0:
+            return np.full(np.shape(q), np.nan) if np.ndim(q) else float('nan')
+        values, weights = self._weighted_items()
+        cumulative = np.cumsum(weights)
+        ranks = np.asarray(q, dtype=float) * cumulative[-1]
+        index = np.minimum(np.searchsorted(cumulative, ranks, side='left'), values.size - 1)
+        result = values[index]
+        # ปลายทั้งสองข้างใช้ค่าจริง
+        result = np.where(np.asarray(q) <= 0, self.min, np.where(np.asarray(q) >= 1, self.max, result))
+        return result if np.ndim(q) else float(result)
+
+    def expected_shortfall(self, alpha=0.05):
+        """ค่าเฉลี่ยของ alpha ส่วนที่แย่ที่สุด (ค่าต่ำสุด) - ประมาณจาก sketch"""
+        if self.count == 0:
+            return float('nan')
+        values, weights = self._weighted_items()
+        tail = alpha * weights.sum()
+        before = np.cumsum(weights) - weights
+        # น้ำหนักของแต่ละค่าที่อยู่ในส่วนหาง (ค่าที่คร่อมขอบนับบางส่วน)
+        in_tail = np.clip(tail - before, 0.0, weights)
+        return float((values * in_tail).sum() / tail)
+
+
+class StreamingRiskStats:
+    PERCENTILES = (0.05, 0.50, 0.95)
+
+    def __init__(self, metrics=('profit', 'dispose'), k=200, seed=None):
+        """
+        Parameters:
+        - metrics: ชื่อ metric ที่ติดตาม
+        - k, seed: พารามิเตอร์ของ QuantileSketch
+        """
+        self.moments = {name: RunningMoments() for name in metrics}
+        self.sketches = {name: QuantileSketch(k, seed) for name in metrics}
+
+    def update(self, **values):
+        """เพิ่มค่าของแต่ละ metric เช่น update(profit=..., dispose=...)"""
+        for name, batch in values.items():
+            self.moments[name].update(batch)
+            self.sketches[name].update(batch)
+
+    def update_from_engine(self, decision, costs):
+        """เพิ่มผลจาก batch_daily_decision / batch_costs_and_revenue (หรือ dict ผลรายวันของ engine)"""
+        available = {'profit': costs['profit'], **decision}
+        self.update(**{name: available[name] for name in self.moments})
+
+    def merge(self, other):
+        """รวมผลจาก StreamingRiskStats ของ worker อื่น"""
+        for name in self.moments:
+            self.moments[name].merge(other.moments[name])
+            self.sketches[name].merge(other.sketches[name])
+
+    def summary(self, alpha=0.05):
+        """
+        สรุปสถิติของทุก metric
+
+        Returns:
+        - dict: ชื่อ metric -> count, mean, std, min, p5, p50, p95, max, expected_shortfall
+        """
+        result = {}
+        for name, moments in self.moments.items():
+            sketch = self.sketches[name]
+            p5, p50, p95 = sketch.quantile(np.array(self.PERCENTILES))
+            result[name] = {
+                'count': moments.count,
+                'mean': float(moments.mean),
+                'std': moments.std,
+                'min': sketch.min,
+                'p5': float(p5),
+                'p50': float(p50),
+                'p95': float(p95),
+                'max': sketch.max,
+                'expected_shortfall': sketch.expected_shortfall(alpha),
+            }
+        return result
+
+    def to_arrays(self):
+        """สถานะทั้งหมดเป็น dict ของ array (เก็บใน ResultCache ได้โดยไม่ต้อง pickle)"""
+        arrays = {}
+        for name, moments in self.moments.items():
+            sketch = self.sketches[name]
+            arrays[f'{name}.moments'] = np.array([moments.count, moments.mean, moments._m2])
+            arrays[f'{name}.sketch'] = np.array([sketch.k, sketch.count, sketch.min, sketch.max])
+            arrays[f'{name}.levels'] = np.concatenate(sketch._levels)
+            arrays[f'{name}.level_sizes'] = np.array([items.size for items in sketch._levels])
+        return arrays
+
+    @classmethod
+    def from_arrays(cls, arrays, seed=None):
+        """สร้างกลับจากผลของ to_arrays (seed ใช้กับการบีบอัดหลัง merge ครั้งต่อไป)"""
+        metrics = [key[:-len('.moments')] for key in arrays if key.endswith('.moments')]
+        stats = cls(metrics=metrics, seed=seed)
+        for name in metrics:
+            count, mean, m2 = arrays[f'{name}.moments']
+            moments = stats.moments[name]
+            moments.count, moments.mean, moments._m2 = int(count), float(mean), float(m2)
+
+            k, count, minimum, maximum = arrays[f'{name}.sketch']
+            sketch = stats.sketches[name]
+            sketch.k, sketch.count, sketch.min, sketch.max = int(k), int(count), float(minimum), float(maximum)
+            bounds = np.cumsum(arrays[f'{name}.level_sizes'])[:-1]
+            sketch._levels = np.split(np.asarray(arrays[f'{name}.levels'], dtype=float), bounds)
+        return stats
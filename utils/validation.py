@@ -0,0 +1,175 @@
+"""
+ตรวจสอบข้อมูลนำเข้าแบบ vectorized - ได้รหัสข้อผิดพลาดของทุกแถวในครั้งเดียว
+
+daily_decision ไม่ตรวจค่า (น้ำยางเข้าติดลบ, stock เกิน MAX_STOCK ฯลฯ ให้ผลที่ไม่มีความหมาย)
+และการหยุดที่แถวแรกที่ผิดจะทำให้การ replay ข้อมูลหลายล้านแถวล้มทั้งหมด
+จึงตรวจทั้ง array แล้วแยกแถวที่ถูกต้องไปทาง fast path ส่วนแถวที่ผิดเก็บเป็นรายงาน (quarantine)
+
+รหัสข้อผิดพลาดเป็น bit flag (uint16) - หนึ่งแถวผิดได้หลายข้อ, 0 = ถูกต้อง
+ราคาวันที่ +4/+5 เป็น NaN ได้ (= ไม่ทราบราคา) แต่ต้องไม่ติดลบหรือเป็น inf
+"""
+import numpy as np
+
+ERROR_NOT_A_NUMBER = 1 << 0
+ERROR_INTAKE_MISSING = 1 << 1
+ERROR_INTAKE_NEGATIVE = 1 << 2
+ERROR_STOCK_MISSING = 1 << 3
+ERROR_STOCK_NEGATIVE = 1 << 4
+ERROR_STOCK_OVER_MAX = 1 << 5
+ERROR_FRESH_PRICE_MISSING = 1 << 6
+ERROR_FRESH_PRICE_NEGATIVE = 1 << 7
+ERROR_SHEET_PRICE_INVALID = 1 << 8
+ERROR_PLUS_5_PRICE_INVALID = 1 << 9
+ERROR_INFINITE = 1 << 10
+
+ERROR_MESSAGES = {
+    ERROR_NOT_A_NUMBER: "ค่าไม่ใช่ตัวเลข",
+    ERROR_INTAKE_MISSING: "ไม่มีปริมาณน้ำยางเข้า",
+    ERROR_INTAKE_NEGATIVE: "น้ำยางเข้าติดลบ",
+    ERROR_STOCK_MISSING: "ไม่มี stock ปัจจุบัน",
+    ERROR_STOCK_NEGATIVE: "stock ติดลบ",
+    ERROR_STOCK_OVER_MAX: "stock เกิน MAX_STOCK",
+    ERROR_FRESH_PRICE_MISSING: "ไม่มีราคาน้ำยางสด",
+    ERROR_FRESH_PRICE_NEGATIVE: "ราคาน้ำยางสดติดลบ",
+    ERROR_SHEET_PRICE_INVALID: "ราคาแผ่นยางวันที่ +4 ติดลบ",
+    ERROR_PLUS_5_PRICE_INVALID: "ราคาแผ่นยางวันที่ +5 ติดลบ",
+    ERROR_INFINITE: "ค่าเป็นอนันต์",
+}
+
+
+def _as_float(values, size):
+    """แปลงเป็น array float (None/ค่าว่าง = NaN) และ mask ของค่าที่แปลงเป็นตัวเลขไม่ได้"""
+    if values is None:
+        return np.full(size, np.nan), np.zeros(size, dtype=bool)
+    try:
+        array = np.asarray(values, dtype=float)
+    except (TypeError, ValueError):
+        # มีค่าที่ไม่ใช่ตัวเลขปนอยู่ - แปลงทีละค่า (เฉพาะกรณีนี้)
+        values = np.broadcast_to(np.asarray(values, dtype=object), (size,))
+        array = np.empty(size)
+        bad = np.zeros(size, dtype=bool)
+        for i, value in enumerate(values):
+            if value is None or (isinstance(value, str) and value.strip() == ''):
+                array[i] = np.nan
+                continue
+            try:
+                array[i] = float(value)
+            except (TypeError, ValueError):
+                array[i] = np.nan
+                bad[i] = True
+        return array, bad
+    return np.broadcast_to(array, (size,)), np.zeros(size, dtype=bool)
+
+
+def validate_inputs(engine, R_today, price_today_fresh, price_plus_4=None, price_plus_5=None, current_stock=None):
+    """
+    ตรวจข้อมูลรายวันทั้ง array
+
+    Parameters:
+    - engine: LatexDecisionEngine (ใช้ MAX_STOCK)
+    - R_today, price_today_fresh: array รายแถว (ขนาดเดียวกัน หรือ scalar)
+    - price_plus_4, price_plus_5: array หรือ None (NaN/None = ไม่ทราบราคา)
+    - current_stock: array หรือ None (None = ไม่ตรวจ เช่นข้อมูลที่ stock มาจากการจำลอง)
+
+    Returns:
+    - dict:
+      - errors: uint16 รหัสข้อผิดพลาดรายแถว (0 = ถูกต้อง)
+      - valid: bool mask ของแถวที่ถูกต้อง
+      - R_today, price_today_fresh, price_plus_4, price_plus_5, current_stock: ค่าที่แปลงเป็น float แล้ว
+    """
+    size = max(np.size(value) for value in (R_today, price_today_fresh, price_plus_4, price_plus_5, current_stock)
+               if value is not None)
+
+    def flag(mask, code):
+        return np.where(mask, code, 0).astype(np.uint16)
+
+    columns = {}
+    missing = {}  # ค่าว่าง (ไม่นับค่าที่แปลงเป็นตัวเลขไม่ได้ ซึ่งมีรหัสของตัวเอง)
+    errors = np.zeros(size, dtype=np.uint16)
+    for name, values in (('R_today', R_today), ('price_today_fresh', price_today_fresh),
+                         ('price_plus_4', price_plus_4), ('price_plus_5', price_plus_5),
+                         ('current_stock', current_stock)):
+        array, bad = _as_float(values, size)
+        columns[name] = array
+        missing[name] = np.isnan(array) & ~bad
+        errors |= flag(bad, ERROR_NOT_A_NUMBER)
+        errors |= flag(np.isinf(array), ERROR_INFINITE)
+
+    R = columns['R_today']
+    fresh = columns['price_today_fresh']
+    with np.errstate(invalid='ignore'):
+        errors |= flag(missing['R_today'], ERROR_INTAKE_MISSING)
+        errors |= flag(R < 0, ERROR_INTAKE_NEGATIVE)
+        errors |= flag(missing['price_today_fresh'], ERROR_FRESH_PRICE_MISSING)
+        errors |= flag(fresh < 0, ERROR_FRESH_PRICE_NEGATIVE)
+        errors |= flag(columns['price_plus_4'] < 0, ERROR_SHEET_PRICE_INVALID)
+        errors |= flag(columns['price_plus_5'] < 0, ERROR_PLUS_5_PRICE_INVALID)
+        if current_stock is not None:
+            stock = columns['current_stock']
+            errors |= flag(missing['current_stock'], ERROR_STOCK_MISSING)
+            errors |= flag(stock < 0, ERROR_STOCK_NEGATIVE)
+            errors |= flag(stock > engine.MAX_STOCK, ERROR_STOCK_OVER_MAX)
+
+    return {'errors': errors, 'valid': errors == 0, **columns}
+
+
+def error_mask(errors, code):
+    """bool mask ของแถวที่มีข้อผิดพลาด code (รวมหลาย code ด้วย | ได้)"""
+    return (np.asarray(errors) & code) != 0
+
+
+def describe_errors(code):
+    """รายการข้อความของรหัสข้อผิดพลาดหนึ่งแถว"""
+    return [message for flag, message in ERROR_MESSAGES.items() if int(code) & flag]
+
+
+def error_counts(errors):
+    """จำนวนแถวของแต่ละข้อผิดพลาด {ข้อความ: จำนวน} (เฉพาะที่พบ)"""
+    counts = {}
+    for flag, message in ERROR_MESSAGES.items():
+        count = int(np.count_nonzero(error_mask(errors, flag)))
+        if count:
+            counts[message] = count
+    return counts
+
+
+def quarantine_report(result, rows=None):
+    """
+    รายงานแถวที่ไม่ถูกต้อง (เรียงตามลำดับแถว) - เขียนเป็น CSV ด้วย utils.pipeline.write_csv ได้
+
+    Parameters:
+    - result: ผลของ validate_inputs
+    - rows: ชื่อ/เลขแถวของข้อมูลต้นทาง (None = ลำดับใน array)
+
+    Returns:
+    - list ของ dict: row, ค่าของแต่ละคอลัมน์, error_code, reasons
+    """
+    invalid = np.flatnonzero(~result['valid'])
+    report = []
+    for i in invalid:
+        code = int(result['errors'][i])
+        report.append({
+            'row': int(i) if rows is None else rows[i],
+            'R_today': float(result['R_today'][i]),
+            'price_today_fresh': float(result['price_today_fresh'][i]),
+            'price_plus_4': float(result['price_plus_4'][i]),
+            'price_plus_5': float(result['price_plus_5'][i]),
+            'current_stock': float(result['current_stock'][i]),
+            'error_code': code,
+            'reasons': '; '.join(describe_errors(code)),
+        })
+    return report
+
+
+def split_valid(result, rows=None):
+    """
+    แยกเฉพาะแถวที่ถูกต้องสำหรับ fast path (batch_daily_decision / simulate)
+
+    Returns:
+    - (dict ของ array ที่ถูกต้อง พร้อม 'index' = ตำแหน่งเดิม, รายงานแถวที่ไม่ถูกต้อง)
+    """
+    valid = result['valid']
+    columns = {name: result[name][valid]
+               for name in ('R_today', 'price_today_fresh', 'price_plus_4', 'price_plus_5', 'current_stock')}
+    columns['index'] = np.flatnonzero(valid)
+    return columns, quarantine_report(result, rows)